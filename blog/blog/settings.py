@@ -40,22 +40,34 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'blog_app.apps.BlogAppConfig',
-    'debug_toolbar',
     'ajax_datatable',
     'rest_framework',
 ]
 
 MIDDLEWARE = [
+    # First, so that its timings cover the whole request
+    'blog_app.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog_app.middleware.PrimaryPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# The debug toolbar is for local development only
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+# Per-request query count, DB time, render time and size: Server-Timing headers and
+# the Prometheus endpoint at /metrics/ (blog_app.instrumentation)
+BLOG_INSTRUMENTATION = True
+# Addresses allowed to scrape /metrics/ without a staff login
+BLOG_METRICS_ALLOWED_IPS = ["127.0.0.1"]
+
 ROOT_URLCONF = 'blog.urls'
 
 TEMPLATES = [
@@ -76,6 +88,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blog.wsgi.application'
 
+# The change feed (api/v1/changes/, `manage.py blog_changes`) leaves out changes
+# younger than this, whose transactions may not have committed yet
+BLOG_CHANGE_FEED_SETTLE_SECONDS = 5
+
+# With BLOG_ASYNC_VIEWS=1 the listing, DataTable and detail views are served by
+# native async views (blog_app.async_views). Only useful under ASGI, e.g.
+# `uvicorn blog.asgi:application`: under WSGI they would run through async_to_sync.
+BLOG_ASYNC_VIEWS = os.environ.get("BLOG_ASYNC_VIEWS") == "1"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -84,9 +105,64 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests (and Celery tasks), checked before reuse
+        'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Seconds to wait for a lock before raising "database is locked"
+            'timeout': 20,
+            # Take the write lock when a transaction starts: a read transaction that
+            # later writes cannot wait for the lock and fails straight away
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Read replica: with BLOG_READ_REPLICA=1 the listing, detail and daily digest reads
+# go to the "replica" database (blog_app.routers.ReadReplicaRouter). Locally,
+# `python manage.py sync_replica` copies db.sqlite3 to the replica file.
+BLOG_READ_REPLICA = os.environ.get("BLOG_READ_REPLICA") == "1"
+# Seconds a user keeps reading from the primary after a write (read-your-writes)
+BLOG_REPLICA_PIN_SECONDS = 10
+
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'NAME': os.environ.get("BLOG_REPLICA_NAME", BASE_DIR / 'db.replica.sqlite3'),
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['blog_app.routers.ReadReplicaRouter']
+
+# Applied to every new SQLite connection (blog_app.signals.tune_sqlite_connection)
+BLOG_SQLITE_PRAGMAS = {
+    # Readers no longer block the writer (and vice versa)
+    'journal_mode': 'WAL',
+    # Durable at checkpoints; a crash can only lose the last commits, not corrupt the file
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory by default. Set REDIS_CACHE_URL (e.g. the Celery broker's Redis,
+# "redis://localhost:6379/1") so that every worker process shares one cache:
+# otherwise invalidations (e.g. of the author/editor/publisher choices) only reach
+# the process that made the change (`manage.py check --deploy` warns about it).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if os.environ.get("REDIS_CACHE_URL"):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ["REDIS_CACHE_URL"],
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -143,16 +219,61 @@ AJAX_DATATABLE_MAX_DISPLAY_LENGTH = 500
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Media files are named after their SHA-256, so identical uploads are stored once
+STORAGES = {
+    "default": {
+        "BACKEND": "blog_app.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# A file written or re-used (deduplicated) less than this many seconds ago is not
+# released with its last blog: a concurrent upload of the same bytes may not have
+# committed its blog yet. `manage.py gc_media` collects it later.
+BLOG_MEDIA_RELEASE_GRACE_SECONDS = 600
+
+# Uploads stream to a temporary file (never to memory), capped in size on the way
+FILE_UPLOAD_HANDLERS = [
+    "blog_app.uploads.BoundedUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+# Blog image limits, checked before the image is decoded
+BLOG_IMAGE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+BLOG_IMAGE_MAX_PIXELS = 50_000_000
+# Larger images are downscaled to fit (twice the widest rendition)
+BLOG_IMAGE_MAX_DIMENSION = 3200
+
+# Role groups larger than this are picked through the autocomplete endpoint
+# instead of rendering every member as an <option> in the blog form
+BLOG_ROLE_CHOICES_LIMIT = 500
+
 # For dev use only
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 # Email sender
 DEFAULT_FROM_EMAIL = "noreply@blogapp.com"
+# SMTP sends per second (and burst) allowed to each worker process; 0 disables the limit
+BLOG_SMTP_RATE_LIMIT = 5
+BLOG_SMTP_BURST = 10
+# Failed sends are retried with exponential backoff and full jitter, from
+# BLOG_EMAIL_BACKOFF_BASE seconds up to BLOG_EMAIL_BACKOFF_MAX; after
+# BLOG_EMAIL_MAX_ATTEMPTS attempts the email goes to the FailedEmail table
+# (resend with `python manage.py replay_failed_emails`)
+BLOG_EMAIL_MAX_ATTEMPTS = 6
+BLOG_EMAIL_BACKOFF_BASE = 30
+BLOG_EMAIL_BACKOFF_MAX = 3600
 
 # For celery,
 # for celery broker run:  `docker run -d -p 6379:6379 redis`
 CELERY_BROKER_URL = "redis://localhost:6379"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
+# Path of a file where each worker appends one JSON line per finished task (queue lag,
+# runtime, outcome); summarize with `python manage.py task_report`. Off when empty.
+# The file is never trimmed: turn it on while sizing workers, or rotate it (appends
+# reopen the file, so logrotate's copytruncate is not needed).
+BLOG_TASK_METRICS_FILE = os.environ.get("BLOG_TASK_METRICS_FILE", "")
 
 # For custom exception handling
 REST_FRAMEWORK = {
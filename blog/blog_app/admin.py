@@ -1,8 +1,28 @@
 from django.contrib import admin
-from .models import Blog
+from django.db import models
+from .models import Blog, FailedEmail
+from .tasks import schedule_publish, schedule_renditions
+from .uploads import BoundedImageField
 
 
 # Register your models here.
 @admin.register(Blog)
 class BlogModel(admin.ModelAdmin):
     list_display = ["id", "title", "content", "image", "category"]
+    formfield_overrides = {models.ImageField: {"form_class": BoundedImageField}}
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # (Re)schedule the per-blog publish task when the publish time is set or moved
+        if "publish_at" in form.changed_data:
+            schedule_publish(obj)
+        # Rebuild the resized copies of a new or replaced image
+        if "image" in form.changed_data:
+            schedule_renditions(obj)
+
+
+@admin.register(FailedEmail)
+class FailedEmailModel(admin.ModelAdmin):
+    list_display = ["id", "subject", "recipients", "attempts", "failed_at", "replayed_at"]
+    list_filter = ["replayed_at"]
+    search_fields = ["subject", "error"]
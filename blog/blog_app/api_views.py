@@ -0,0 +1,155 @@
+import hashlib
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+from rest_framework import generics, serializers
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
+from . import changes
+from .caching import detail_etag
+from .models import Blog
+from .routers import ReplicaReadMixin
+from .serializers import BlogSerializer, blog_columns, parse_fields
+
+
+# Read-only JSON API for published blogs (api/v1/). Integrations sync with it:
+# a full copy pages through `api/v1/blogs/` with the `next` cursor, and later
+# syncs only ask for `?updated_since=<updated_at of the last blog seen>`.
+
+
+class BlogCursorPagination(CursorPagination):
+    """
+    Pages blogs by (updated_at, id): pages stay stable while blogs are written,
+    and each page is an index range scan instead of an OFFSET.
+    """
+
+    ordering = ("updated_at", "id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class BlogApiMixin(ReplicaReadMixin):
+    serializer_class = BlogSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_fields(self):
+        if not hasattr(self, "_fields"):
+            self._fields = parse_fields(self.request.query_params.get("fields"))
+        return self._fields
+
+    def get_queryset(self):
+        columns, relations = blog_columns(self.get_fields())
+        return (
+            Blog.objects.filter(is_published=True)
+            .select_related(*relations)
+            .only(*columns)
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["fields"] = self.get_fields()
+        return super().get_serializer(*args, **kwargs)
+
+    def get_etag(self, *parts):
+        # The same rows differ by the fields and the format they are rendered in
+        key = [self.request.query_params.get("fields", ""), self.request.accepted_renderer.format]
+        digest = hashlib.sha256(repr(key + list(parts)).encode()).hexdigest()[:32]
+        return quote_etag(digest)
+
+    def get_not_modified(self, etag):
+        """Returns a 304 response when the client's If-None-Match matches `etag`, else None."""
+        response = get_conditional_response(self.request, etag=etag)
+        if response is not None:
+            response["ETag"] = etag
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # Authenticated data: clients revalidate with If-None-Match, shared caches keep out
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class BlogListApiView(BlogApiMixin, generics.ListAPIView):
+    """
+    Lists published blogs, oldest change first, with cursor pagination.
+
+    Query parameters: `fields` (sparse fieldset, e.g. `id,title`), `updated_since`
+    (ISO 8601, blogs changed at or after it) and `page_size`.
+    """
+
+    pagination_class = BlogCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        updated_since = self.request.query_params.get("updated_since")
+        if updated_since:
+            since = parse_datetime(updated_since)
+            if since is None:
+                raise serializers.ValidationError(
+                    {"updated_since": "Expected an ISO 8601 datetime."}
+                )
+            # Inclusive, so that blogs saved in the same instant are not missed
+            queryset = queryset.filter(updated_at__gte=since)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        # Keyed on the page's ids and updated_at: any change, removal or newly
+        # published blog in the page gives a new ETag
+        etag = self.get_etag(
+            [(blog.pk, blog.updated_at.isoformat()) for blog in page],
+            self.paginator.get_next_link(),
+        )
+        not_modified = self.get_not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response["ETag"] = etag
+        return response
+
+
+class BlogDetailApiView(BlogApiMixin, generics.RetrieveAPIView):
+    """Returns one published blog; `fields` selects a sparse fieldset."""
+
+    def retrieve(self, request, *args, **kwargs):
+        # Answer revalidations from the updated_at column alone
+        updated_at = (
+            self.get_queryset()
+            .filter(pk=kwargs["pk"])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            raise Http404
+        etag = self.get_etag(detail_etag(kwargs["pk"], updated_at))
+        not_modified = self.get_not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+
+
+class BlogChangesApiView(APIView):
+    """
+    Streams the blogs saved or deleted since `?since=<cursor>` as newline-delimited JSON
+    (see `blog_app.changes`); without `since`, every blog.
+
+    Staff only: the feed includes unpublished blogs. It reads the primary, since a
+    lagging replica could hide changes that are older than the next cursor.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            since = changes.parse_cursor(request.query_params.get("since"))
+        except ValueError as e:
+            raise serializers.ValidationError({"since": str(e)})
+        return StreamingHttpResponse(
+            changes.ndjson_lines(since, changes.feed_horizon()),
+            content_type="application/x-ndjson",
+        )
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class BlogAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog_app'
+
+    def ready(self):
+        # Register signal handlers (search index maintenance, Celery task metrics)
+        # and the deployment checks
+        from . import checks, signals, task_metrics  # noqa: F401
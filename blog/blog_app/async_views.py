@@ -0,0 +1,161 @@
+import json
+from contextlib import nullcontext
+from asgiref.sync import sync_to_async
+from ajax_datatable.views import AjaxDatatableView
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET
+from .caching import aget_detail_html, alisting_generation, aset_detail_html, detail_etag
+from .instrumentation import timed_render
+from .models import Blog
+from .routers import ause_replica, replica_reads
+from .views import BlogAjaxDatatableView
+
+
+# Native async versions of the read-only blog views, used instead of the sync
+# ones when BLOG_ASYNC_VIEWS is on and the site runs under ASGI (blog.asgi).
+# Under ASGI, sync views hold a thread each while they wait on the database or
+# the cache; these wait on the event loop instead.
+
+
+async def _authenticated_user(request):
+    """
+    Loads the user without blocking the event loop.
+
+    Args:
+        request (HttpRequest): The current request.
+
+    Returns:
+        User | None: The logged in user, or None for an anonymous request.
+    """
+    user = await request.auser()
+    # Templates and context processors read request.user
+    request.user = user
+    return user if user.is_authenticated else None
+
+
+async def _read_block(request):
+    return replica_reads() if await ause_replica(request) else nullcontext()
+
+
+@require_GET
+async def blog_table(request):
+    """
+    Async version of `BlogTableView`: the page holding the blog DataTable.
+    Requires user to be logged in.
+    """
+    if await _authenticated_user(request) is None:
+        return redirect_to_login(request.get_full_path(), reverse("blog:login"))
+    return render(request, "blog_app/blog_list.html")
+
+
+@require_GET
+async def blog_detail(request, pk):
+    """
+    Async version of `BlogDetailView`, with the same page cache, ETag and
+    Last-Modified handling. Requires user to be logged in.
+    """
+    if await _authenticated_user(request) is None:
+        return redirect_to_login(request.get_full_path(), reverse("blog:login"))
+
+    with await _read_block(request):
+        updated_at = (
+            await Blog.objects.filter(pk=pk).values_list("updated_at", flat=True).afirst()
+        )
+        if updated_at is None:
+            raise Http404("No blog found matching the query")
+        etag = quote_etag(detail_etag(pk, updated_at))
+        last_modified = int(updated_at.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            html = await aget_detail_html(pk, updated_at)
+            if html is None:
+                blog = await Blog.objects.aget(pk=pk)
+                with timed_render(request):
+                    html = render_to_string(
+                        "blog_app/detail_base.html",
+                        {"detail_data": blog, "object": blog},
+                        request=request,
+                    )
+                await aset_detail_html(blog.pk, blog.updated_at, html)
+            response = HttpResponse(html)
+
+    response.headers.setdefault("ETag", etag)
+    response.headers.setdefault("Last-Modified", http_date(last_modified))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class AsyncBlogAjaxDatatableView(BlogAjaxDatatableView):
+    """
+    Async version of `BlogAjaxDatatableView`.
+
+    Data draws read the page and the filtered count with the async ORM and cache.
+    The table setup (``action=initialize`` / ``details``) and the library's column
+    initialization, which may query the author choices, still run the sync code
+    in a worker thread.
+    """
+
+    http_method_names: list[str] = ["get"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        if await _authenticated_user(request) is None:
+            return self.handle_no_permission()
+        request.REQUEST = request.GET
+
+        with await _read_block(request):
+            if request.REQUEST.get("action") in ("initialize", "details"):
+                return await sync_to_async(AjaxDatatableView.dispatch)(
+                    self, request, *args, **kwargs
+                )
+            await sync_to_async(self.initialize)(request)
+            return await self.get(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        if not request.accepts("application/json"):
+            return HttpResponseBadRequest()
+        try:
+            params = self.read_parameters(request.REQUEST)
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        # Building the queryset runs no query
+        qs = self.prepare_queryset(
+            params, self.optimize_queryset(self.get_initial_queryset(request))
+        )
+        length = params["length"]
+        if length == -1:
+            length = max(1, await qs.acount())
+
+        page_qs, keyset = self.get_page_queryset(request, qs, length, params["start"])
+        page = [obj async for obj in page_qs]
+        count = await self.aget_cached_count(request, qs)
+
+        response_dict = self.build_response_dict(
+            request, params["draw"], params["start"], length, page, count, keyset
+        )
+        response_dict["footer_message"] = self.footer_message(qs, params)
+        response_dict["toolbar_message"] = self.toolbar_message(qs, params)
+        return HttpResponse(
+            json.dumps(response_dict, cls=DjangoJSONEncoder),
+            content_type="application/json",
+        )
+
+    async def aget_cached_count(self, request, qs):
+        """Async version of ``get_cached_count``."""
+        key = self.get_count_cache_key(request, await alisting_generation())
+        count = await cache.aget(key)
+        if count is None:
+            count = await qs.acount()
+            await cache.aset(key, count, self.count_cache_timeout)
+        return count
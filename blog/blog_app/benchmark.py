@@ -0,0 +1,364 @@
+import io
+import random
+import threading
+import time
+from datetime import timedelta
+from contextlib import ExitStack
+from django.contrib.auth.models import Group, User
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from .models import Blog
+from .roles import AUTHOR, EDITOR, PUBLISHER, ROLE_NAMES
+from .stats import percentile
+from . import search
+
+
+# Load generator behind `manage.py bench_endpoints`: seeds a database with users
+# and blogs, then drives the blog endpoints with concurrent test clients.
+
+CLIENT_USERNAME: str = "bench-client@example.com"
+
+# Words blogs are written with; searches look for two topic words
+TOPIC_WORDS: tuple[str, ...] = (
+    "python", "django", "celery", "queryset", "migration", "template", "cache",
+    "index", "database", "request", "response", "middleware", "signal", "model",
+    "form", "view", "scrapy", "spider", "pipeline", "crawler", "powerbi", "report",
+    "dashboard", "measure", "dataset", "async", "worker", "thread", "deploy",
+    "server", "latency", "throughput", "profile", "benchmark", "upload", "image",
+    "search", "session", "cookie", "router", "replica", "sqlite", "postgres",
+)
+FILLER_WORDS: tuple[str, ...] = (
+    "the", "a", "and", "of", "to", "in", "with", "for", "on", "is", "it", "this",
+)
+VOCABULARY: tuple[str, ...] = TOPIC_WORDS + FILLER_WORDS
+
+FIRST_NAMES: tuple[str, ...] = (
+    "Asha", "Ravi", "Meena", "Arjun", "Divya",
+    "Karthik", "Priya", "Vikram", "Lakshmi", "Suresh",
+)
+LAST_NAMES: tuple[str, ...] = (
+    "Kumar", "Iyer", "Nair", "Reddy", "Sharma",
+    "Menon", "Pillai", "Rao", "Das", "Singh",
+)
+
+# Median and spread of a blog's content length, in characters
+CONTENT_LENGTH_MEDIAN: int = 3000
+CONTENT_LENGTH_SIGMA: float = 0.8
+
+DATATABLE_COLUMNS: tuple[str, ...] = ("pk", "title", "excerpt", "category", "author")
+DATATABLE_PAGE_LENGTH: int = 10
+
+
+def _words(rng, count):
+    return " ".join(rng.choices(VOCABULARY, k=count))
+
+
+def _content(rng):
+    length = rng.lognormvariate(0, CONTENT_LENGTH_SIGMA) * CONTENT_LENGTH_MEDIAN
+    length = int(min(max(length, 200), 20000))
+    # Words average seven characters with their separator
+    return _words(rng, max(1, length // 7))
+
+
+def seed(users, blogs, seed=0):
+    """
+    Fills an empty database with users in the role groups and published blogs.
+
+    Rows are bulk inserted, so model signals do not run: the full-text index is
+    written here and the cache is cleared afterwards.
+
+    Args:
+        users (int): Number of users, spread round-robin over Author/Editor/Publisher.
+        blogs (int): Number of blogs (about 90% of them published).
+        seed (int): Random seed, so that two runs generate the same data.
+
+    Returns:
+        User: The user the benchmark clients log in as (member of every role group).
+    """
+    rng = random.Random(seed)
+    groups = [Group.objects.get_or_create(name=name)[0] for name in ROLE_NAMES]
+    password = make_password(None)
+
+    client_user = User.objects.create(
+        username=CLIENT_USERNAME,
+        email=CLIENT_USERNAME,
+        first_name="Bench",
+        last_name="Client",
+        password=password,
+    )
+    client_user.groups.set(groups)
+
+    members = User.objects.bulk_create(
+        [
+            User(
+                username=f"bench-user-{index}@example.com",
+                email=f"bench-user-{index}@example.com",
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                password=password,
+            )
+            for index in range(users)
+        ]
+    )
+    Membership = User.groups.through
+    Membership.objects.bulk_create(
+        [
+            Membership(user_id=user.pk, group_id=groups[index % len(groups)].pk)
+            for index, user in enumerate(members)
+        ]
+    )
+    by_role = {name: [client_user] for name in ROLE_NAMES}
+    for index, user in enumerate(members):
+        by_role[ROLE_NAMES[index % len(ROLE_NAMES)]].append(user)
+
+    now = timezone.now()
+    rows = Blog.objects.bulk_create(
+        [
+            Blog(
+                title=_words(rng, rng.randint(2, 8)).capitalize()[:100],
+                content=_content(rng),
+                image="uploads/bench.jpg",
+                category=rng.choice(Blog.CATEGORY_CHOICES)[0],
+                author=rng.choice(by_role[AUTHOR]),
+                editor=rng.choice(by_role[EDITOR]),
+                publisher=rng.choice(by_role[PUBLISHER]),
+                is_published=rng.random() < 0.9,
+                publish_at=now - timedelta(days=rng.randint(0, 365)),
+            )
+            for _ in range(blogs)
+        ],
+        batch_size=500,
+    )
+    search.index_blogs(rows)
+    cache.clear()
+    return client_user
+
+
+def datatable_params(
+    start=0,
+    order_column=0,
+    direction="asc",
+    search_value="",
+    length=DATATABLE_PAGE_LENGTH,
+    cursor=None,
+):
+    """
+    Returns the query parameters DataTables sends for one draw of the blog table.
+
+    Args:
+        start (int): Offset of the first row.
+        order_column (int | None): Index of the column to sort on, or None when no
+            column header was clicked.
+        direction (str): "asc" or "desc".
+        search_value (str): Text of the global search box.
+        length (int): Rows per page.
+        cursor (str | None): The `next_cursor` of the previous page, if any.
+
+    Returns:
+        dict: The GET parameters.
+    """
+    params = {
+        "draw": 1,
+        "start": start,
+        "length": length,
+        "search[value]": search_value,
+    }
+    if cursor:
+        params["cursor"] = cursor
+    if order_column is not None:
+        params["order[0][column]"] = order_column
+        params["order[0][dir]"] = direction
+    for index, name in enumerate(DATATABLE_COLUMNS):
+        params[f"columns[{index}][data]"] = name
+        params[f"columns[{index}][name]"] = ""
+        params[f"columns[{index}][searchable]"] = "true"
+        params[f"columns[{index}][orderable]"] = "true"
+        params[f"columns[{index}][search][value]"] = ""
+    return params
+
+
+def _image_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 360), (40, 90, 160)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class Workload:
+    """
+    The requests sent to each endpoint, drawn from the seeded data.
+
+    Every ``<endpoint>`` method takes a logged in test client and a random
+    generator, sends one request and tells whether it succeeded.
+    """
+
+    ENDPOINTS: tuple[str, ...] = (
+        "blog_list",
+        "blog_ajax",
+        "blog_ajax_search",
+        "blog_ajax_ordered",
+        "blog_ajax_deep",
+        "detail",
+        "blog_create",
+        "blog_update",
+    )
+
+    def __init__(self):
+        self.published = list(
+            Blog.objects.filter(is_published=True).values_list("pk", flat=True)
+        )
+        self.blogs = list(Blog.objects.values_list("pk", flat=True))
+        self.roles = {
+            name: list(
+                User.objects.filter(groups__name=name).values_list("pk", flat=True)[:50]
+            )
+            for name in ROLE_NAMES
+        }
+        self.image = _image_bytes()
+
+    def _json(self, client, url, params):
+        response = client.get(url, params, HTTP_ACCEPT="application/json")
+        return response.status_code == 200 and "data" in response.json()
+
+    def blog_list(self, client, rng):
+        return client.get(reverse("blog:blog_list")).status_code == 200
+
+    def blog_ajax(self, client, rng):
+        return self._json(client, reverse("blog:blog_ajax"), datatable_params())
+
+    def blog_ajax_search(self, client, rng):
+        terms = " ".join(rng.sample(TOPIC_WORDS, 2))
+        return self._json(
+            client, reverse("blog:blog_ajax"), datatable_params(search_value=terms)
+        )
+
+    def blog_ajax_ordered(self, client, rng):
+        params = datatable_params(
+            start=rng.randrange(10) * DATATABLE_PAGE_LENGTH,
+            order_column=rng.choice([1, 3]),
+            direction=rng.choice(["asc", "desc"]),
+        )
+        return self._json(client, reverse("blog:blog_ajax"), params)
+
+    def blog_ajax_deep(self, client, rng):
+        last_page = max(0, len(self.published) - DATATABLE_PAGE_LENGTH)
+        params = datatable_params(start=rng.randint(last_page * 3 // 4, last_page))
+        return self._json(client, reverse("blog:blog_ajax"), params)
+
+    def detail(self, client, rng):
+        url = reverse("blog:detail", args=[rng.choice(self.published)])
+        return client.get(url).status_code == 200
+
+    def _form_data(self, rng):
+        return {
+            "title": _words(rng, 5)[:100],
+            "content": _content(rng),
+            "category": rng.choice(Blog.CATEGORY_CHOICES)[0],
+            "author": rng.choice(self.roles[AUTHOR]),
+            "editor": rng.choice(self.roles[EDITOR]),
+            "publisher": rng.choice(self.roles[PUBLISHER]),
+            "publish_at": (timezone.now() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M"),
+        }
+
+    def blog_create(self, client, rng):
+        data = self._form_data(rng)
+        data["image"] = io.BytesIO(self.image)
+        data["image"].name = "bench.jpg"
+        response = client.post(
+            reverse("blog:blog_create"), data, HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        )
+        return response.status_code == 200 and response.json().get("success") is True
+
+    def blog_update(self, client, rng):
+        url = reverse("blog:blog_update", args=[rng.choice(self.blogs)])
+        response = client.post(
+            url, self._form_data(rng), HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        )
+        return response.status_code == 200 and response.json().get("success") is True
+
+
+def run_endpoint(workload, endpoint, user, requests, concurrency, seed=0, aliases=None):
+    """
+    Sends `requests` requests to one endpoint from `concurrency` threads.
+
+    Each thread has its own test client (logged in as `user`) and database
+    connection. With a concurrency of 1 the requests run in the calling thread.
+
+    Args:
+        workload (Workload): The request generator.
+        endpoint (str): One of `Workload.ENDPOINTS`.
+        user (User): The user the clients log in as.
+        requests (int): Total number of requests.
+        concurrency (int): Number of client threads.
+        seed (int): Random seed of the first thread.
+        aliases (list[str] | None): Databases whose queries are counted (default: all).
+
+    Returns:
+        dict: Request and error counts, throughput, p50/p95/p99 latency (ms) and
+        the mean and maximum number of queries per request.
+    """
+    send = getattr(workload, endpoint)
+    aliases = list(connections) if aliases is None else aliases
+    latencies = []
+    queries = []
+    errors = [0]
+    remaining = [requests]
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = Client()
+        client.force_login(user)
+        try:
+            while True:
+                with lock:
+                    if not remaining[0]:
+                        return
+                    remaining[0] -= 1
+                with ExitStack() as stack:
+                    captures = [
+                        stack.enter_context(CaptureQueriesContext(connections[alias]))
+                        for alias in aliases
+                    ]
+                    started = time.perf_counter()
+                    try:
+                        ok = send(client, rng)
+                    except Exception:
+                        ok = False
+                    elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    queries.append(sum(len(capture) for capture in captures))
+                    errors[0] += not ok
+        finally:
+            if concurrency > 1:
+                connections.close_all()
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        worker(0)
+    else:
+        threads = [
+            threading.Thread(target=worker, args=(index,)) for index in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "queries_mean": round(sum(queries) / len(queries), 2) if queries else None,
+        "queries_max": max(queries, default=None),
+    }
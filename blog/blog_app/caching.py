@@ -0,0 +1,164 @@
+import time
+from django.core.cache import cache
+
+
+LISTING_GENERATION_KEY: str = "blog:listing:generation"
+
+
+def listing_generation():
+    """
+    Returns the current generation number of the blog listing.
+
+    Cached listing data (such as DataTable row counts) is keyed on this number,
+    so bumping it invalidates all of it at once.
+
+    Returns:
+        int: The current generation number.
+    """
+    generation = cache.get(LISTING_GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so an evicted counter never reuses an old number
+        cache.add(LISTING_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(LISTING_GENERATION_KEY)
+    return generation
+
+
+async def alisting_generation():
+    """
+    Async version of `listing_generation`, for the ASGI read views.
+
+    Returns:
+        int: The current generation number.
+    """
+    generation = await cache.aget(LISTING_GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(LISTING_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = await cache.aget(LISTING_GENERATION_KEY)
+    return generation
+
+
+def bump_listing_generation():
+    """
+    Invalidates cached listing data after blogs were added, changed or removed.
+
+    Returns:
+        None
+    """
+    try:
+        cache.incr(LISTING_GENERATION_KEY)
+    except ValueError:
+        cache.set(LISTING_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+DETAIL_KEY_PREFIX: str = "blog:detail"
+
+# Seconds a rendered detail page is kept; saves and deletes evict it sooner
+DETAIL_CACHE_TIMEOUT: int = 60 * 60 * 24
+
+
+def detail_cache_key(pk):
+    """
+    Returns the cache key of a blog's rendered detail page.
+
+    Args:
+        pk (int): Primary key of the blog.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{DETAIL_KEY_PREFIX}:{pk}"
+
+
+def detail_etag(pk, updated_at):
+    """
+    Returns the ETag of a blog's detail page.
+
+    Args:
+        pk (int): Primary key of the blog.
+        updated_at (datetime): The blog's last modification time.
+
+    Returns:
+        str: An (unquoted) entity tag that changes whenever the blog is saved.
+    """
+    return f"blog-{pk}-{int(updated_at.timestamp() * 1_000_000)}"
+
+
+def get_detail_html(pk, updated_at):
+    """
+    Returns the cached detail page of a blog if it was rendered from this version.
+
+    Args:
+        pk (int): Primary key of the blog.
+        updated_at (datetime): The blog's current modification time.
+
+    Returns:
+        str | None: The rendered HTML, or None on a miss or a stale entry.
+    """
+    entry = cache.get(detail_cache_key(pk))
+    if entry is None or entry[0] != updated_at.isoformat():
+        return None
+    return entry[1]
+
+
+async def aget_detail_html(pk, updated_at):
+    """
+    Async version of `get_detail_html`, for the ASGI read views.
+
+    Args:
+        pk (int): Primary key of the blog.
+        updated_at (datetime): The blog's current modification time.
+
+    Returns:
+        str | None: The rendered HTML, or None on a miss or a stale entry.
+    """
+    entry = await cache.aget(detail_cache_key(pk))
+    if entry is None or entry[0] != updated_at.isoformat():
+        return None
+    return entry[1]
+
+
+def set_detail_html(pk, updated_at, html):
+    """
+    Caches the rendered detail page of a blog, tagged with the version it shows.
+
+    Args:
+        pk (int): Primary key of the blog.
+        updated_at (datetime): Modification time of the rendered blog.
+        html (str): The rendered page.
+
+    Returns:
+        None
+    """
+    cache.set(
+        detail_cache_key(pk), (updated_at.isoformat(), html), timeout=DETAIL_CACHE_TIMEOUT
+    )
+
+
+async def aset_detail_html(pk, updated_at, html):
+    """
+    Async version of `set_detail_html`, for the ASGI read views.
+
+    Args:
+        pk (int): Primary key of the blog.
+        updated_at (datetime): Modification time of the rendered blog.
+        html (str): The rendered page.
+
+    Returns:
+        None
+    """
+    await cache.aset(
+        detail_cache_key(pk), (updated_at.isoformat(), html), timeout=DETAIL_CACHE_TIMEOUT
+    )
+
+
+def invalidate_detail(pk):
+    """
+    Evicts the cached detail page of a blog.
+
+    Args:
+        pk (int): Primary key of the blog.
+
+    Returns:
+        None
+    """
+    cache.delete(detail_cache_key(pk))
@@ -0,0 +1,123 @@
+import heapq
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Blog, BlogTombstone
+
+
+# Change feed: every blog saved or deleted after a cursor, as newline-delimited JSON.
+# Each line is {"op": "upsert", <blog columns>} or {"op": "delete", "id", "deleted_at"},
+# in the order the changes happened; the last line is {"op": "cursor", "cursor": ...},
+# the `since` of the consumer's next call.
+
+# Blog columns sent with each upsert
+FEED_FIELDS: tuple[str, ...] = (
+    "id",
+    "title",
+    "content",
+    "image",
+    "category",
+    "created_at",
+    "updated_at",
+    "publish_at",
+    "is_published",
+    "author_id",
+    "editor_id",
+    "publisher_id",
+)
+
+# Rows fetched per round trip while streaming
+FEED_CHUNK_SIZE: int = 2000
+
+
+def parse_cursor(value):
+    """
+    Parses a feed cursor.
+
+    Args:
+        value (str | None): An ISO 8601 datetime, or empty for a full resync.
+
+    Returns:
+        datetime | None: The cursor, or None to start from the beginning.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 datetime.
+    """
+    if not value:
+        return None
+    cursor = parse_datetime(value)
+    if cursor is None:
+        raise ValueError(f"Invalid cursor {value!r}: expected an ISO 8601 datetime.")
+    if timezone.is_naive(cursor):
+        cursor = timezone.make_aware(cursor)
+    return cursor
+
+
+def feed_horizon():
+    """
+    Returns the end of the next feed read.
+
+    Changes from the last BLOG_CHANGE_FEED_SETTLE_SECONDS are left to the next read:
+    `updated_at` is set before the transaction commits, so a change stamped just
+    before a read may only become visible after it.
+
+    Returns:
+        datetime: The horizon.
+    """
+    return timezone.now() - timedelta(seconds=settings.BLOG_CHANGE_FEED_SETTLE_SECONDS)
+
+
+def iter_changes(since, until):
+    """
+    Yields the blogs saved and deleted in (since, until], oldest first.
+
+    Both tables are read with `.iterator()`, so memory stays flat however many
+    rows changed.
+
+    Args:
+        since (datetime | None): The consumer's cursor, or None for every blog.
+        until (datetime): The horizon of this read (see `feed_horizon`).
+
+    Returns:
+        Iterator[dict]: The change records.
+    """
+    blogs = Blog.objects.filter(updated_at__lte=until)
+    tombstones = BlogTombstone.objects.filter(deleted_at__lte=until)
+    if since is not None:
+        blogs = blogs.filter(updated_at__gt=since)
+        tombstones = tombstones.filter(deleted_at__gt=since)
+    upserts = (
+        {"op": "upsert", **row}
+        for row in blogs.order_by("updated_at", "id")
+        .values(*FEED_FIELDS)
+        .iterator(chunk_size=FEED_CHUNK_SIZE)
+    )
+    deletes = (
+        {"op": "delete", "id": blog_id, "deleted_at": deleted_at}
+        for blog_id, deleted_at in tombstones.order_by("deleted_at", "id")
+        .values_list("blog_id", "deleted_at")
+        .iterator(chunk_size=FEED_CHUNK_SIZE)
+    )
+    # A blog deleted and then saved again under the same id ends up saved
+    return heapq.merge(
+        upserts, deletes, key=lambda change: change.get("updated_at") or change["deleted_at"]
+    )
+
+
+def ndjson_lines(since, until):
+    """
+    Yields the change feed in (since, until] as newline-delimited JSON.
+
+    Args:
+        since (datetime | None): The consumer's cursor, or None for every blog.
+        until (datetime): The horizon of this read; it is the next cursor.
+
+    Returns:
+        Iterator[str]: One JSON document per line, ending with the next cursor.
+    """
+    for change in iter_changes(since, until):
+        yield json.dumps(change, cls=DjangoJSONEncoder) + "\n"
+    yield json.dumps({"op": "cursor", "cursor": until.isoformat()}) + "\n"
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+LOCAL_CACHE_BACKEND: str = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warns when the default cache is local to each process.
+
+    Invalidations (role choice lists, listing generations, blog details) only clear
+    the cache of the process that made the change: with several workers, the others
+    serve stale data until it expires.
+    """
+    if settings.CACHES["default"]["BACKEND"] != LOCAL_CACHE_BACKEND:
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process: changes such as a new "
+            "author, editor or publisher reach the other workers only when their "
+            "cached copy expires.",
+            hint="Set REDIS_CACHE_URL to share one cache between the worker processes.",
+            id="blog_app.W001",
+        )
+    ]
@@ -0,0 +1,89 @@
+import random
+import threading
+import time
+from django.conf import settings
+
+
+class TokenBucket:
+    """
+    Allows `rate` operations per second on average, in bursts of up to `capacity`.
+
+    Thread-safe; each process has its own bucket.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until one is available.
+
+        Returns:
+            float: The seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+_smtp_bucket = None
+_smtp_bucket_lock = threading.Lock()
+
+
+def throttle_smtp():
+    """
+    Waits for the SMTP rate limit of this worker process before one send.
+
+    The limit is BLOG_SMTP_RATE_LIMIT messages per second with bursts of
+    BLOG_SMTP_BURST; a rate of 0 disables it.
+
+    Returns:
+        None
+    """
+    global _smtp_bucket
+    rate = settings.BLOG_SMTP_RATE_LIMIT
+    if not rate:
+        return
+    config = (rate, settings.BLOG_SMTP_BURST)
+    with _smtp_bucket_lock:
+        # Rebuilt when the settings change
+        if _smtp_bucket is None or (_smtp_bucket.rate, _smtp_bucket.capacity) != config:
+            _smtp_bucket = TokenBucket(*config)
+    _smtp_bucket.acquire()
+
+
+def backoff_delay(attempts):
+    """
+    Returns the delay before retrying a send that failed `attempts` times.
+
+    Exponential backoff from BLOG_EMAIL_BACKOFF_BASE, capped at
+    BLOG_EMAIL_BACKOFF_MAX, with full jitter so that messages which failed
+    together during an outage are not all retried at the same moment.
+
+    Args:
+        attempts (int): Number of failed attempts so far (1 after the first failure).
+
+    Returns:
+        float: The delay in seconds.
+    """
+    ceiling = min(
+        settings.BLOG_EMAIL_BACKOFF_MAX,
+        settings.BLOG_EMAIL_BACKOFF_BASE * 2 ** max(attempts - 1, 0),
+    )
+    return random.uniform(0, ceiling)
+
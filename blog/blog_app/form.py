@@ -2,7 +2,80 @@ from django import forms
 from .models import Blog
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User, Group
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.urls import reverse
+from .roles import AUTHOR, EDITOR, PUBLISHER, role_choices
+from .uploads import BoundedImageField
+
+
+class RoleChoiceIterator(ModelChoiceIterator):
+    """Yields a role's members from the cached (id, label) list instead of the queryset."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from role_choices(self.field.role)
+
+    def __len__(self):
+        return len(role_choices(self.field.role)) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(role_choices(self.field.role))
+
+
+class RoleSelect(forms.Select):
+    """
+    A select for role members that hands large groups over to the autocomplete endpoint.
+
+    Once a group has more than BLOG_ROLE_CHOICES_LIMIT members, only the selected
+    option is rendered and the select gets a `data-autocomplete-url` for the
+    search box added by `blog_list.html`.
+    """
+
+    def __init__(self, role, attrs=None):
+        super().__init__(attrs)
+        self.role = role
+
+    def use_autocomplete(self):
+        return len(role_choices(self.role)) > settings.BLOG_ROLE_CHOICES_LIMIT
+
+    def get_context(self, name, value, attrs):
+        if self.use_autocomplete():
+            attrs = {
+                **(attrs or {}),
+                "data-autocomplete-url": reverse("blog:role_autocomplete", args=[self.role]),
+            }
+        return super().get_context(name, value, attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        if not self.use_autocomplete():
+            return super().optgroups(name, value, attrs)
+        choices = self.choices
+        self.choices = [
+            choice for choice in choices if choice[0] == "" or str(choice[0]) in value
+        ]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+
+class RoleChoiceField(forms.ModelChoiceField):
+    """
+    A ModelChoiceField over the members of a role group.
+
+    Options are rendered from `role_choices` (cached ids and usernames); the
+    queryset is only used to validate the submitted id.
+    """
+
+    iterator = RoleChoiceIterator
+
+    def __init__(self, role, **kwargs):
+        self.role = role
+        kwargs.setdefault("widget", RoleSelect(role, attrs={"class": "form-select"}))
+        super().__init__(queryset=User.objects.filter(groups__name=role), **kwargs)
 
 
 class BlogForm(forms.ModelForm):
@@ -18,7 +91,7 @@ class BlogForm(forms.ModelForm):
         label="Content",
         required=True
     )
-    image = forms.ImageField(
+    image = BoundedImageField(
         widget=forms.ClearableFileInput(
             attrs={'class': 'form-control'}
         ),
@@ -33,25 +106,13 @@ class BlogForm(forms.ModelForm):
     )
 
     # Get authors (users in Author group)
-    author = forms.ModelChoiceField(
-        queryset=User.objects.filter(groups__name="Author"),
-        widget=forms.Select(attrs={"class": "form-select"}),
-        required=True,
-    )
+    author = RoleChoiceField(AUTHOR, required=True)
 
     # Get editors (users in Editor group)
-    editor = forms.ModelChoiceField(
-        queryset=User.objects.filter(groups__name="Editor"),
-        widget=forms.Select(attrs={"class": "form-select"}),
-        required=True,
-    )
+    editor = RoleChoiceField(EDITOR, required=True)
 
     # Get publishers (users in Publisher group)
-    publisher = forms.ModelChoiceField(
-        queryset=User.objects.filter(groups__name="Publisher"),
-        widget=forms.Select(attrs={"class": "form-select"}),
-        required=True,
-    )
+    publisher = RoleChoiceField(PUBLISHER, required=True)
 
     publish_at = forms.DateTimeField(
         widget=forms.DateTimeInput(
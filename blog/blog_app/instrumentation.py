@@ -0,0 +1,300 @@
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+# A query repeated this many times in one request is reported as an N+1
+DUPLICATE_QUERY_THRESHOLD: int = 3
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+_recorder: ContextVar = ContextVar("query_recorder", default=None)
+
+
+def fingerprint(sql):
+    """
+    Returns the shape of a query, so that the same query with other parameters matches.
+
+    Args:
+        sql (str): SQL with parameter placeholders.
+
+    Returns:
+        str: The SQL with its whitespace and ``IN (%s, ...)`` lists normalized.
+    """
+    return _IN_LIST.sub("IN (...)", " ".join(sql.split()))
+
+
+class QueryRecorder:
+    """Counts and times the queries run while it is the current recorder."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def duplicates(self):
+        """
+        Returns the queries run at least DUPLICATE_QUERY_THRESHOLD times.
+
+        Returns:
+            dict[str, int]: Run count by query fingerprint.
+        """
+        return {
+            sql: count
+            for sql, count in self.fingerprints.items()
+            if count >= DUPLICATE_QUERY_THRESHOLD
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    `connection.execute_wrapper` hook feeding the current request's QueryRecorder.
+
+    Installed once on every connection (blog_app.signals.instrument_connection).
+    The recorder lives in a context variable, so queries run by async views through
+    `sync_to_async` are counted for the request that made them.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.duration += time.perf_counter() - started
+        recorder.count += 1
+        recorder.fingerprints[fingerprint(sql)] += 1
+
+
+@contextmanager
+def timed_render(request):
+    """
+    Counts a template render done inside a view (e.g. to cache the HTML) as the
+    request's render time, which the middleware only measures for template
+    responses rendered after the view returns.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request._render_duration = (
+            getattr(request, "_render_duration", 0.0) + time.perf_counter() - started
+        )
+
+
+class MetricsRegistry:
+    """
+    Per-view request metrics of this process, exported in the Prometheus text format.
+
+    Each server process keeps its own counters: scrape every worker (or run
+    a single one) to see the whole traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, duration, queries, db_duration, duplicates, render, size):
+        with self._lock:
+            metrics = self._views.setdefault(
+                view,
+                {
+                    "requests": 0,
+                    "duration": 0.0,
+                    "buckets": [0] * len(DURATION_BUCKETS),
+                    "queries": 0,
+                    "db_duration": 0.0,
+                    "duplicate_queries": 0,
+                    "render_duration": 0.0,
+                    "response_bytes": 0,
+                },
+            )
+            metrics["requests"] += 1
+            metrics["duration"] += duration
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    metrics["buckets"][index] += 1
+            metrics["queries"] += queries
+            metrics["db_duration"] += db_duration
+            metrics["duplicate_queries"] += duplicates
+            metrics["render_duration"] += render
+            metrics["response_bytes"] += size
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def snapshot(self):
+        """
+        Returns a copy of the metrics of every view.
+
+        Returns:
+            dict[str, dict]: Metrics by view name.
+        """
+        with self._lock:
+            return {
+                view: {**metrics, "buckets": list(metrics["buckets"])}
+                for view, metrics in self._views.items()
+            }
+
+    def render(self):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page.
+        """
+        views = sorted(self.snapshot().items())
+        counters = [
+            ("blog_http_requests_total", "requests", "Requests handled."),
+            ("blog_db_queries_total", "queries", "Database queries run."),
+            (
+                "blog_db_duration_seconds_total",
+                "db_duration",
+                "Time spent in database queries.",
+            ),
+            (
+                "blog_db_duplicate_queries_total",
+                "duplicate_queries",
+                "Repeated runs of queries run at least "
+                f"{DUPLICATE_QUERY_THRESHOLD} times in one request (N+1 queries).",
+            ),
+            (
+                "blog_template_render_seconds_total",
+                "render_duration",
+                "Time spent rendering template responses.",
+            ),
+            (
+                "blog_http_response_bytes_total",
+                "response_bytes",
+                "Response body bytes sent.",
+            ),
+        ]
+        lines = []
+        for name, key, help_text in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [
+                f'{name}{{view="{_label(view)}"}} {_number(metrics[key])}'
+                for view, metrics in views
+            ]
+
+        name = "blog_http_request_duration_seconds"
+        lines += [f"# HELP {name} Request duration.", f"# TYPE {name} histogram"]
+        for view, metrics in views:
+            label = _label(view)
+            for bound, count in zip(DURATION_BUCKETS, metrics["buckets"]):
+                lines.append(f'{name}_bucket{{view="{label}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{view="{label}",le="+Inf"}} {metrics["requests"]}')
+            lines.append(f'{name}_sum{{view="{label}"}} {_number(metrics["duration"])}')
+            lines.append(f'{name}_count{{view="{label}"}} {metrics["requests"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    """
+    Measures every request: query count, database time, duplicated queries,
+    template render time, response size and total time.
+
+    The numbers are sent back in a ``Server-Timing`` header (shown by the browser's
+    network panel, JSON endpoints included) and added to `registry`, which the
+    ``metrics/`` view exports. Disabled with BLOG_INSTRUMENTATION = False.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BLOG_INSTRUMENTATION", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.finish(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.finish(request, response, recorder, time.perf_counter() - started)
+
+    def process_template_response(self, request, response):
+        if response.is_rendered:
+            # Rendered by the view itself, which times it with `timed_render`
+            return response
+        # Template responses are rendered after the view returns: time the rendering
+        request._render_started = time.perf_counter()
+        response.add_post_render_callback(partial(self.rendered, request))
+        return response
+
+    def rendered(self, request, response):
+        request._render_duration = time.perf_counter() - request._render_started
+
+    def finish(self, request, response, recorder, duration):
+        render = getattr(request, "_render_duration", 0.0)
+        duplicates = recorder.duplicates()
+        duplicate_runs = sum(count - 1 for count in duplicates.values())
+        view = request.resolver_match.view_name if request.resolver_match else "unresolved"
+
+        timings = [
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+            f"render;dur={render * 1000:.1f}",
+            f"total;dur={duration * 1000:.1f}",
+        ]
+        if duplicates:
+            timings.insert(1, f'dup;desc="{duplicate_runs} duplicated queries"')
+        if response.has_header("Server-Timing"):
+            timings.insert(0, response["Server-Timing"])
+        response["Server-Timing"] = ", ".join(timings)
+
+        if duplicates and settings.DEBUG:
+            sql, count = max(duplicates.items(), key=lambda item: item[1])
+            print(f"{view}: query run {count} times in one request: {sql[:300]}")
+
+        registry.observe(
+            view,
+            duration,
+            recorder.count,
+            recorder.duration,
+            duplicate_runs,
+            render,
+            0 if response.streaming else len(response.content),
+        )
+        return response
@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from celery import current_app
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from blog_app.benchmark import Workload, run_endpoint, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database with users and blogs, drive the blog endpoints with "
+        "concurrent test clients and report latency percentiles, throughput and query "
+        "counts as JSON, so that runs on two commits can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=300)
+        parser.add_argument("--blogs", type=int, default=5000)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests sent to each endpoint."
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--endpoints",
+            default=",".join(Workload.ENDPOINTS),
+            help="Comma separated subset of: " + ", ".join(Workload.ENDPOINTS),
+        )
+        parser.add_argument(
+            "--broker",
+            default="memory://",
+            help="Celery broker for the tasks the views enqueue (default: in memory, "
+            "so no worker or Redis is needed).",
+        )
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        endpoints = [name for name in options["endpoints"].split(",") if name]
+        unknown = set(endpoints) - set(Workload.ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        if options["broker"]:
+            # Keys carry the "CELERY_" namespace of the Django settings
+            current_app.conf.CELERY_BROKER_URL = options["broker"]
+
+        directory = tempfile.mkdtemp()
+        # A database file (not SQLite's shared in-memory test database), so that
+        # client threads write concurrently the way server workers do
+        connections["default"].settings_dict["TEST"]["NAME"] = os.path.join(
+            directory, "bench.sqlite3"
+        )
+        setup_test_environment(debug=False)
+        old_config = setup_databases(
+            verbosity=0, interactive=False, serialized_aliases=set()
+        )
+        try:
+            with override_settings(MEDIA_ROOT=os.path.join(directory, "media")):
+                user = seed(options["users"], options["blogs"], options["seed"])
+                workload = Workload()
+                results = {
+                    endpoint: run_endpoint(
+                        workload,
+                        endpoint,
+                        user,
+                        options["requests"],
+                        options["concurrency"],
+                        options["seed"],
+                    )
+                    for endpoint in endpoints
+                }
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            shutil.rmtree(directory, ignore_errors=True)
+
+        report = {
+            "commit": self.git_commit(),
+            "config": {
+                key: options[key]
+                for key in ("users", "blogs", "requests", "concurrency", "seed")
+            },
+            "endpoints": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        self.stdout.write(output)
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
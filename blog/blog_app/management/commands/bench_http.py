@@ -0,0 +1,107 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from blog_app.stats import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server with many concurrent, slow clients and report throughput "
+        "and latency percentiles. Run it once against the WSGI server and once against "
+        "`uvicorn blog.asgi:application` with BLOG_ASYNC_VIEWS=1 to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="e.g. http://127.0.0.1:8000/blog/1")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--seconds", type=float, default=10.0)
+        parser.add_argument(
+            "--slow-ms",
+            type=float,
+            default=0.0,
+            help="Delay before each client reads its response, like a slow network.",
+        )
+        parser.add_argument(
+            "--user", help="Username to log in as (the read views require a login)."
+        )
+        parser.add_argument(
+            "--accept",
+            default="text/html",
+            help="Accept header (application/json for blogs_ajax/).",
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("Only http:// URLs are supported.")
+        cookie = self.session_cookie(options["user"]) if options["user"] else None
+        results = asyncio.run(self.run(url, cookie, options))
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def session_cookie(self, username):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {username!r}.")
+        client = Client()
+        client.force_login(user)
+        name = settings.SESSION_COOKIE_NAME
+        return f"{name}={client.cookies[name].value}"
+
+    def build_request(self, url, cookie, accept):
+        path = url.path or "/"
+        if url.query:
+            path += "?" + url.query
+        lines = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {url.netloc}",
+            f"Accept: {accept}",
+            "Connection: close",
+        ]
+        if cookie:
+            lines.append(f"Cookie: {cookie}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+    async def run(self, url, cookie, options):
+        request = self.build_request(url, cookie, options["accept"])
+        deadline = time.perf_counter() + options["seconds"]
+        latencies = []
+        statuses = {}
+        errors = 0
+
+        async def client():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    reader, writer = await asyncio.open_connection(
+                        url.hostname, url.port or 80
+                    )
+                    writer.write(request)
+                    await writer.drain()
+                    if options["slow_ms"]:
+                        await asyncio.sleep(options["slow_ms"] / 1000)
+                    response = await reader.read()
+                    writer.close()
+                except OSError:
+                    errors += 1
+                    continue
+                status = response.split(b" ", 2)[1].decode() if response else "none"
+                statuses[status] = statuses.get(status, 0) + 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client() for _ in range(options["concurrency"])))
+        return {
+            "requests": len(latencies),
+            "requests_per_second": round(len(latencies) / options["seconds"], 1),
+            "statuses": statuses,
+            "connection_errors": errors,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        }
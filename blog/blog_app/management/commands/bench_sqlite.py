@@ -0,0 +1,125 @@
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from blog_app.stats import percentile
+
+
+# Journal settings of a fresh SQLite file, and a new connection per request
+BASELINE_PRAGMAS: dict = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark mixed read/write throughput of SQLite with the default journal "
+        "and per-request connections, then with BLOG_SQLITE_PRAGMAS and reused connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument(
+            "--write-ratio", type=float, default=0.2, help="Share of operations that write."
+        )
+        parser.add_argument("--rows", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        profiles = {
+            "baseline": {"pragmas": BASELINE_PRAGMAS, "reuse": False},
+            "tuned": {"pragmas": settings.BLOG_SQLITE_PRAGMAS, "reuse": True},
+        }
+        results = {}
+        for name, profile in profiles.items():
+            directory = tempfile.mkdtemp()
+            try:
+                path = os.path.join(directory, "bench.sqlite3")
+                self.seed(path, profile["pragmas"], options["rows"])
+                results[name] = self.run(path, profile, options)
+            finally:
+                shutil.rmtree(directory)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def connect(self, path, pragmas):
+        connection = sqlite3.connect(path, timeout=5)
+        for pragma, value in pragmas.items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        return connection
+
+    def seed(self, path, pragmas, rows):
+        connection = self.connect(path, pragmas)
+        connection.execute(
+            "CREATE TABLE bench_blog (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+            "is_published INTEGER, updated_at REAL)"
+        )
+        connection.executemany(
+            "INSERT INTO bench_blog (title, content, is_published, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(f"Blog {i}", "x" * 2000, i % 4 != 0, time.time()) for i in range(rows)],
+        )
+        connection.commit()
+        connection.close()
+
+    def run(self, path, profile, options):
+        deadline = time.perf_counter() + options["seconds"]
+        latencies = {"read": [], "write": []}
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            rng = random.Random()
+            connection = self.connect(path, profile["pragmas"]) if profile["reuse"] else None
+            local = {"read": [], "write": []}
+            local_errors = 0
+            while time.perf_counter() < deadline:
+                kind = "write" if rng.random() < options["write_ratio"] else "read"
+                started = time.perf_counter()
+                conn = connection or self.connect(path, profile["pragmas"])
+                try:
+                    if kind == "read":
+                        conn.execute(
+                            "SELECT id, title FROM bench_blog WHERE is_published = 1 "
+                            "ORDER BY id DESC LIMIT 20 OFFSET ?",
+                            (rng.randrange(options["rows"] // 2),),
+                        ).fetchall()
+                    else:
+                        conn.execute(
+                            "UPDATE bench_blog SET content = ?, updated_at = ? WHERE id = ?",
+                            ("y" * 2000, time.time(), rng.randrange(1, options["rows"])),
+                        )
+                        conn.commit()
+                    local[kind].append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    # "database is locked"
+                    conn.rollback()
+                    local_errors += 1
+                finally:
+                    if connection is None:
+                        conn.close()
+            if connection is not None:
+                connection.close()
+            with lock:
+                for key in latencies:
+                    latencies[key].extend(local[key])
+                errors.append(local_errors)
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        operations = len(latencies["read"]) + len(latencies["write"])
+        return {
+            "operations_per_second": round(operations / options["seconds"], 1),
+            "reads": len(latencies["read"]),
+            "writes": len(latencies["write"]),
+            "locked_errors": sum(errors),
+            "read_p95_ms": percentile(latencies["read"], 95),
+            "write_p95_ms": percentile(latencies["write"], 95),
+        }
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from blog_app import changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the blogs saved or deleted since a cursor as newline-delimited JSON; "
+        "the last line holds the cursor of the next run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since", help="Cursor (ISO 8601 datetime) of the previous run; omit for every blog."
+        )
+        parser.add_argument("--output", help="Write to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            since = changes.parse_cursor(options["since"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        lines = changes.ndjson_lines(since, changes.feed_horizon())
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
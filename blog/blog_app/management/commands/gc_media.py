@@ -0,0 +1,58 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from blog_app.models import Blog
+from blog_app.renditions import RENDITIONS_DIR, rendition_names
+
+
+class Command(BaseCommand):
+    help = "Delete media files that no blog references (images and their renditions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=60,
+            help="Keep files younger than this, which may belong to an upload in progress.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the files that would be deleted without deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        field = Blog._meta.get_field("image")
+        storage = field.storage
+        referenced = set()
+        for image, renditions in Blog.objects.values_list("image", "image_renditions").iterator():
+            referenced.add(image)
+            referenced.update(rendition_names(renditions))
+
+        cutoff = timezone.now() - timedelta(minutes=options["grace_minutes"])
+        deleted = 0
+        freed = 0
+        for directory in (field.upload_to.rstrip("/"), RENDITIONS_DIR):
+            for name in self.walk(storage, directory):
+                if name in referenced or storage.get_modified_time(name) > cutoff:
+                    continue
+                freed += storage.size(name)
+                deleted += 1
+                if options["dry_run"]:
+                    self.stdout.write(name)
+                else:
+                    storage.delete(name)
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {deleted} unreferenced files ({freed} bytes)")
+        )
+
+    def walk(self, storage, directory):
+        if not storage.exists(directory):
+            return
+        subdirectories, files = storage.listdir(directory)
+        for name in files:
+            yield f"{directory}/{name}"
+        for subdirectory in subdirectories:
+            yield from self.walk(storage, f"{directory}/{subdirectory}")
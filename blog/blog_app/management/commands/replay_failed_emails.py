@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from blog_app import outbox
+from blog_app.models import FailedEmail
+
+
+class Command(BaseCommand):
+    help = (
+        "Send dead-lettered notification emails (FailedEmail) again by writing them "
+        "back to the outbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--id", type=int, action="append", dest="ids", help="FailedEmail id (repeatable)."
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Replay every email not replayed yet."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="List the emails without replaying them."
+        )
+
+    def handle(self, *args, **options):
+        if options["ids"]:
+            failed = FailedEmail.objects.filter(id__in=options["ids"])
+        elif options["all"]:
+            failed = FailedEmail.objects.filter(replayed_at__isnull=True)
+        else:
+            raise CommandError("Pass --id or --all.")
+
+        replayed = 0
+        for email in failed.order_by("id"):
+            self.stdout.write(f"{email.id}: {email} ({email.attempts} attempts: {email.error})")
+            if options["dry_run"]:
+                continue
+            # The drain is scheduled when the transaction commits
+            with transaction.atomic():
+                outbox.enqueue(
+                    email.subject, email.message, email.from_email, email.recipients
+                )
+                email.replayed_at = timezone.now()
+                email.save(update_fields=["replayed_at"])
+            replayed += 1
+        self.stdout.write(self.style.SUCCESS(f"Replayed {replayed} emails"))
@@ -0,0 +1,26 @@
+import sqlite3
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from blog_app.routers import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the default SQLite database to the replica file with SQLite's online "
+        "backup, to try the read replica locally."
+    )
+
+    def handle(self, *args, **options):
+        primary = connections["default"].settings_dict
+        replica = connections[REPLICA_ALIAS].settings_dict
+        if not primary["ENGINE"].endswith("sqlite3") or not replica["ENGINE"].endswith("sqlite3"):
+            raise CommandError("sync_replica only copies SQLite databases.")
+
+        source = sqlite3.connect(primary["NAME"])
+        target = sqlite3.connect(replica["NAME"])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Copied {primary['NAME']} to {replica['NAME']}"))
@@ -0,0 +1,103 @@
+import json
+import math
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from blog_app.stats import percentile
+from blog_app.task_metrics import read_records
+
+
+# Upper bounds (seconds) of the runtime histogram buckets
+RUNTIME_BUCKETS: tuple[float, ...] = (0.1, 0.5, 1, 5, 10, 30, 60, 300)
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the Celery task metrics written by the workers "
+        "(BLOG_TASK_METRICS_FILE): throughput, queue lag, runtime, retries, failures "
+        "and the number of busy workers, per task."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file", help="Metrics file (default: BLOG_TASK_METRICS_FILE)."
+        )
+        parser.add_argument(
+            "--hours", type=float, help="Only report tasks finished in the last N hours."
+        )
+
+    def handle(self, *args, **options):
+        path = options["file"] or settings.BLOG_TASK_METRICS_FILE
+        if not path:
+            raise CommandError(
+                "Task metrics are off: set BLOG_TASK_METRICS_FILE on the workers, "
+                "or pass --file."
+            )
+        since = time.time() - options["hours"] * 3600 if options["hours"] else None
+        try:
+            records = read_records(path, since)
+        except FileNotFoundError:
+            raise CommandError(f"No task metrics at {path}: is a worker running?")
+        if not records:
+            self.stdout.write(json.dumps({"tasks": {}}, indent=2))
+            return
+
+        start = since or min(record["finished_at"] - record["runtime"] for record in records)
+        window = max(time.time() - start, 1.0)
+        by_task = defaultdict(list)
+        for record in records:
+            by_task[record["task"]].append(record)
+
+        report = {
+            "window_seconds": round(window, 1),
+            "tasks": {
+                name: self.summarize(rows, window) for name, rows in sorted(by_task.items())
+            },
+            # Workers busy on average and in the busiest minute, over all tasks:
+            # size worker concurrency above the peak
+            "busy_workers": self.busy_workers(records, window),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def summarize(self, rows, window):
+        states = Counter(row["state"] for row in rows)
+        runtimes = [row["runtime"] for row in rows]
+        lags = [row["queue_lag"] for row in rows if row["queue_lag"] is not None]
+        histogram = Counter()
+        for runtime in runtimes:
+            bound = next((b for b in RUNTIME_BUCKETS if runtime <= b), math.inf)
+            histogram["+Inf" if bound == math.inf else str(bound)] += 1
+        return {
+            "runs": len(rows),
+            "per_minute": round(len(rows) / window * 60, 2),
+            "succeeded": states["SUCCESS"],
+            "failed": states["FAILURE"],
+            "retried": states["RETRY"],
+            "failure_rate": round(states["FAILURE"] / len(rows), 4),
+            "exceptions": dict(
+                Counter(row["exception"] for row in rows if row["exception"])
+            ),
+            "queue_lag_p50_ms": percentile(lags, 50),
+            "queue_lag_p95_ms": percentile(lags, 95),
+            "queue_lag_p99_ms": percentile(lags, 99),
+            "runtime_p50_ms": percentile(runtimes, 50),
+            "runtime_p95_ms": percentile(runtimes, 95),
+            "runtime_p99_ms": percentile(runtimes, 99),
+            "runtime_max_ms": percentile(runtimes, 100),
+            "runtime_histogram": {
+                bucket: histogram[bucket]
+                for bucket in [str(b) for b in RUNTIME_BUCKETS] + ["+Inf"]
+                if histogram[bucket]
+            },
+        }
+
+    def busy_workers(self, records, window):
+        # Task seconds per minute of finishing time, i.e. workers kept busy that minute
+        per_minute = Counter()
+        for record in records:
+            per_minute[int(record["finished_at"] // 60)] += record["runtime"]
+        return {
+            "average": round(sum(record["runtime"] for record in records) / window, 3),
+            "peak_minute": round(max(per_minute.values()) / 60, 3),
+        }
@@ -0,0 +1,45 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from .routers import apin_to_primary, pin_to_primary
+
+
+class PrimaryPinMiddleware:
+    """
+    Pins a user to the primary database for a few seconds after any successful write
+    request, so that pages served from the read replica never hide their own change.
+
+    Runs natively under both WSGI and ASGI, so that it never forces the async read
+    views through a thread.
+    """
+
+    UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.is_write(request, response) and request.user.is_authenticated:
+            pin_to_primary(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.is_write(request, response):
+            user = await request.auser()
+            if user.is_authenticated:
+                await apin_to_primary(request)
+        return response
+
+    def is_write(self, request, response):
+        return (
+            request.method in self.UNSAFE_METHODS
+            and response.status_code < 400
+            and getattr(request, "user", None) is not None
+        )
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_app_blog_fts "
+    "USING fts5(title, content, category, author, tokenize='porter unicode61')",
+    "INSERT INTO blog_app_blog_fts (rowid, title, content, category, author) "
+    "SELECT b.id, b.title, b.content, b.category, TRIM(u.first_name || ' ' || u.last_name) "
+    "FROM blog_app_blog b JOIN auth_user u ON u.id = b.author_id "
+    "WHERE b.is_published",
+]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS blog_app_blog_fts ("
+    "blog_id integer PRIMARY KEY REFERENCES blog_app_blog (id) "
+    "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS blog_app_blog_fts_document_idx "
+    "ON blog_app_blog_fts USING GIN (document)",
+    "INSERT INTO blog_app_blog_fts (blog_id, document) "
+    "SELECT b.id, "
+    "setweight(to_tsvector('english', b.title), 'A') || "
+    "setweight(to_tsvector('english', b.category), 'B') || "
+    "setweight(to_tsvector('english', u.first_name || ' ' || u.last_name), 'B') || "
+    "setweight(to_tsvector('english', b.content), 'C') "
+    "FROM blog_app_blog b JOIN auth_user u ON u.id = b.author_id "
+    "WHERE b.is_published",
+]
+
+
+def create_fts_table(apps, schema_editor):
+    """Create and backfill the full-text table for the current database vendor."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = SQLITE_CREATE
+    elif vendor == "postgresql":
+        statements = POSTGRES_CREATE
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS blog_app_blog_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0002_blog_is_published_blog_publish_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0003_blog_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_published', False)), fields=['publish_at'], name='blog_due_publish_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at'], name='blog_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['title', 'id'], name='blog_published_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', 'id'], name='blog_published_category_idx'),
+        ),
+    ]
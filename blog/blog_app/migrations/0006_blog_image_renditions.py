@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0005_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0007_outbox_retries_failedemail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['updated_at', 'id'], name='blog_published_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0009_blog_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoleVersion',
+            fields=[
+                ('scope', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+            ],
+        ),
+    ]
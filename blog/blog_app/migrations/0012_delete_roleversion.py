@@ -0,0 +1,16 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0011_outbox_claim_lease'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='RoleVersion',
+        ),
+    ]
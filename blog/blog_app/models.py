@@ -15,6 +15,8 @@ class Blog(models.Model):
     title = models.CharField(max_length=100)
     content = models.TextField()
     image = models.ImageField(upload_to="uploads/")
+    # Resized copies of `image`, filled in by the `generate_image_renditions` task
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     category = models.CharField(choices=CATEGORY_CHOICES, max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -32,5 +34,124 @@ class Blog(models.Model):
         User, related_name="published_blogs", on_delete=models.CASCADE
     )
 
+    class Meta:
+        indexes = [
+            # publish_scheduled_blogs: is_published=False AND publish_at <= now
+            models.Index(
+                fields=["publish_at"],
+                condition=models.Q(is_published=False),
+                name="blog_due_publish_idx",
+            ),
+            # daily_mail_users: latest published blogs by created_at
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_published_created_idx",
+            ),
+            # Blog listing: published blogs sorted by a DataTable column, then id
+            models.Index(
+                fields=["title", "id"],
+                condition=models.Q(is_published=True),
+                name="blog_published_title_idx",
+            ),
+            models.Index(
+                fields=["category", "id"],
+                condition=models.Q(is_published=True),
+                name="blog_published_category_idx",
+            ),
+            # Change feed: every blog changed after a cursor
+            models.Index(fields=["updated_at", "id"], name="blog_updated_idx"),
+            # API: published blogs paged by (updated_at, id)
+            models.Index(
+                fields=["updated_at", "id"],
+                condition=models.Q(is_published=True),
+                name="blog_published_updated_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored image, so that a replaced file can be released on save
+        if "image" in field_names:
+            instance._loaded_image = values[field_names.index("image")]
+        return instance
+
+
+class OutboxEmail(models.Model):
+    """
+    A notification email written in the same transaction as the blog change
+    that caused it, and sent later by the `drain_outbox` task.
+    """
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipient = models.EmailField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set by the drain that took the row; the claim expires if that drain dies
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # Failed sends so far, and when the drain may try again (backoff)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # drain_outbox: pending messages grouped by recipient
+            models.Index(
+                fields=["recipient", "id"],
+                condition=models.Q(sent_at__isnull=True),
+                name="outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient}"
+
+
+class OutboxDrain(models.Model):
+    """
+    Single row telling when the next `drain_outbox` run is due, so that every
+    process enqueuing notifications shares one pending drain.
+    """
+
+    scheduled_for = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Outbox drain due at {self.scheduled_for}"
+
+
+class FailedEmail(models.Model):
+    """
+    Dead letter: a notification email that still failed after every retry.
+
+    Kept for inspection and sent again with `manage.py replay_failed_emails`.
+    """
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    failed_at = models.DateTimeField(auto_now_add=True)
+    replayed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)}"
+
+
+class BlogTombstone(models.Model):
+    """
+    Records a deleted blog, so that the change feed can report the deletion.
+    """
+
+    blog_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Blog {self.blog_id} deleted at {self.deleted_at}"
@@ -0,0 +1,298 @@
+from sqlite3 import sqlite_version_info
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+from .delivery import backoff_delay
+from .models import FailedEmail, OutboxDrain, OutboxEmail
+
+
+# Seconds to wait before draining, so that notifications written close together
+# (e.g. a bulk edit) are sent by one drain over one SMTP connection
+DRAIN_DELAY: int = 5
+
+# Seconds a drain owns the rows it claimed; rows of a drain that died are claimed again
+CLAIM_LEASE: int = 300
+
+# Primary key of the OutboxDrain row
+DRAIN_ROW_ID: int = 1
+
+
+def enqueue(subject, message, from_email, recipients):
+    """
+    Writes a notification email to the outbox, one row per recipient.
+
+    Call it inside the transaction that changes the blog: the rows commit or roll
+    back with the change, and the drain is only scheduled once the transaction commits.
+
+    Args:
+        subject (str): Subject line of the email.
+        message (str): Body content of the email.
+        from_email (str): Sender's email address.
+        recipients (list[str]): Recipient email addresses.
+
+    Returns:
+        None
+    """
+    enqueue_many(
+        [
+            {
+                "subject": subject,
+                "message": message,
+                "from_email": from_email,
+                "recipients": recipients,
+            }
+        ]
+    )
+
+
+def enqueue_many(notifications):
+    """
+    Writes several notification emails to the outbox with a single INSERT.
+
+    Args:
+        notifications (list[dict]): `enqueue` keyword arguments, one dict per email.
+
+    Returns:
+        None
+    """
+    rows = [
+        OutboxEmail(
+            subject=notification["subject"],
+            message=notification["message"],
+            from_email=notification["from_email"],
+            recipient=recipient,
+        )
+        for notification in notifications
+        # the same person can hold two roles on a blog: notify them once
+        for recipient in dict.fromkeys(notification["recipients"])
+        if recipient
+    ]
+    if rows:
+        OutboxEmail.objects.bulk_create(rows)
+        transaction.on_commit(schedule_drain)
+
+
+def schedule_drain(countdown=DRAIN_DELAY):
+    """
+    Enqueues one `drain_outbox` run after `countdown` seconds, unless one is already due by then.
+
+    The pending drain is recorded in the OutboxDrain row, which every process sees:
+    a conditional UPDATE lets only one of several concurrent callers enqueue it.
+    A drain that should have started by now but has not (e.g. a lost task) no
+    longer counts, so the next notification schedules another.
+
+    Args:
+        countdown (float): Seconds before the drain runs.
+
+    Returns:
+        None
+    """
+    from .tasks import drain_outbox
+
+    now = timezone.now()
+    due = now + timedelta(seconds=countdown)
+    scheduled = (
+        OutboxDrain.objects.filter(pk=DRAIN_ROW_ID)
+        .filter(
+            Q(scheduled_for__isnull=True)
+            | Q(scheduled_for__lt=now - timedelta(seconds=DRAIN_DELAY * 12))
+            | Q(scheduled_for__gt=due)
+        )
+        .update(scheduled_for=due)
+    )
+    if not scheduled:
+        _, scheduled = OutboxDrain.objects.get_or_create(
+            pk=DRAIN_ROW_ID, defaults={"scheduled_for": due}
+        )
+    if not scheduled:
+        return
+    try:
+        drain_outbox.apply_async(countdown=countdown)
+    except Exception as e:
+        # Pending rows stay in the outbox and are sent by the next drain
+        OutboxDrain.objects.filter(pk=DRAIN_ROW_ID, scheduled_for=due).update(scheduled_for=None)
+        print(f"Could not schedule the outbox drain: {e}")
+
+
+def start_drain():
+    """
+    Clears the pending drain when a drain starts, so that notifications written
+    from now on schedule a new one.
+
+    Returns:
+        None
+    """
+    OutboxDrain.objects.filter(pk=DRAIN_ROW_ID).update(scheduled_for=None)
+
+
+def claim_pending(limit):
+    """
+    Claims up to `limit` pending outbox rows for `CLAIM_LEASE` seconds and returns them.
+
+    Works like `claim_due_blogs`: rows are locked with `SKIP LOCKED` where the backend
+    supports it, and otherwise claimed with a conditional `UPDATE ... RETURNING`, so
+    concurrent drains never send the same row twice. Sent rows must be marked with
+    `mark_sent` and rows that fail to send handed back with `release`; rows of a
+    drain that died in between are claimed again once the lease expires.
+
+    Args:
+        limit (int): Maximum number of rows to claim.
+
+    Returns:
+        list[OutboxEmail]: The claimed rows, ordered by recipient.
+    """
+    now = timezone.now()
+    # Rows that failed before wait for their backoff to expire
+    pending = (
+        OutboxEmail.objects.filter(sent_at__isnull=True)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+        .filter(_unclaimed(now))
+        .order_by("recipient", "id")
+    )
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                pending.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit]
+            )
+            OutboxEmail.objects.filter(id__in=ids).update(claimed_at=now)
+        else:
+            ids = []
+            candidates = list(pending.values_list("id", flat=True)[:limit])
+            while candidates and not ids:
+                ids = _claim_candidates(candidates, now)
+                if not ids:
+                    # Every candidate was claimed by another drain: look again
+                    candidates = list(pending.values_list("id", flat=True)[:limit])
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by("recipient", "id"))
+
+
+def _unclaimed(now):
+    return Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - timedelta(seconds=CLAIM_LEASE))
+
+
+def _claim_candidates(candidates, now):
+    if connection.vendor == "sqlite" and sqlite_version_info < (3, 35):
+        # No RETURNING support: one conditional UPDATE per row
+        return [
+            row_id
+            for row_id in candidates
+            if OutboxEmail.objects.filter(_unclaimed(now), id=row_id, sent_at__isnull=True)
+            .update(claimed_at=now)
+        ]
+    placeholders = ", ".join(["%s"] * len(candidates))
+    now_value = connection.ops.adapt_datetimefield_value(now)
+    expired = connection.ops.adapt_datetimefield_value(now - timedelta(seconds=CLAIM_LEASE))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {OutboxEmail._meta.db_table} SET claimed_at = %s "
+            f"WHERE id IN ({placeholders}) AND sent_at IS NULL "
+            f"AND (claimed_at IS NULL OR claimed_at < %s) RETURNING id",
+            [now_value, *candidates, expired],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def mark_sent(rows):
+    """
+    Marks claimed rows as sent, once their email went out.
+
+    Args:
+        rows (list[OutboxEmail]): Rows returned by `claim_pending`.
+
+    Returns:
+        None
+    """
+    if rows:
+        OutboxEmail.objects.filter(id__in=[row.id for row in rows]).update(
+            sent_at=timezone.now()
+        )
+
+
+def release(rows, error=""):
+    """
+    Returns claimed rows to the outbox after a failed send, so a later drain retries them.
+
+    Each row waits `delivery.backoff_delay` before its next attempt. Rows that have
+    failed BLOG_EMAIL_MAX_ATTEMPTS times leave the outbox for the FailedEmail table.
+
+    Args:
+        rows (list[OutboxEmail]): Rows returned by `claim_pending`.
+        error (str): The send error, kept on dead-lettered rows.
+
+    Returns:
+        datetime | None: When the earliest released row is due again, or None if
+        every row was dead-lettered.
+    """
+    now = timezone.now()
+    retry_at = None
+    dead = []
+    with transaction.atomic():
+        for row in rows:
+            row.attempts += 1
+            if row.attempts >= settings.BLOG_EMAIL_MAX_ATTEMPTS:
+                dead.append(row)
+                continue
+            row.claimed_at = None
+            row.next_attempt_at = now + timedelta(seconds=backoff_delay(row.attempts))
+            retry_at = min(retry_at or row.next_attempt_at, row.next_attempt_at)
+        OutboxEmail.objects.bulk_update(
+            [row for row in rows if row not in dead],
+            ["claimed_at", "attempts", "next_attempt_at"],
+        )
+        if dead:
+            FailedEmail.objects.bulk_create(
+                [
+                    FailedEmail(
+                        subject=row.subject,
+                        message=row.message,
+                        from_email=row.from_email,
+                        recipients=[row.recipient],
+                        error=error,
+                        attempts=row.attempts,
+                    )
+                    for row in dead
+                ]
+            )
+            OutboxEmail.objects.filter(id__in=[row.id for row in dead]).delete()
+    return retry_at
+
+
+def next_due():
+    """
+    Returns when the next pending row can be claimed: the end of its backoff, or of
+    the lease of a drain that may have died.
+
+    Returns:
+        datetime | None: The earliest time, or None when no row is waiting.
+    """
+    waiting = OutboxEmail.objects.filter(sent_at__isnull=True).aggregate(
+        retry_at=Min("next_attempt_at", filter=Q(next_attempt_at__gt=timezone.now())),
+        claimed_at=Min("claimed_at"),
+    )
+    times = [waiting["retry_at"]]
+    if waiting["claimed_at"] is not None:
+        times.append(waiting["claimed_at"] + timedelta(seconds=CLAIM_LEASE))
+    return min((time for time in times if time is not None), default=None)
+
+
+def build_email(recipient, rows):
+    """
+    Coalesces the pending rows of one recipient into a single email.
+
+    Args:
+        recipient (str): The recipient's email address.
+        rows (list[OutboxEmail]): The recipient's claimed rows.
+
+    Returns:
+        EmailMessage: The row itself when there is one, otherwise a digest of all of them.
+    """
+    if len(rows) == 1:
+        subject = rows[0].subject
+        body = rows[0].message
+    else:
+        subject = f"{len(rows)} blog notifications"
+        body = "\n\n".join(f"{row.subject}\n{row.message}" for row in rows)
+    return EmailMessage(subject, body, rows[0].from_email, [recipient])
@@ -0,0 +1,130 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+# Widths (px) of the resized copies made of every blog image
+RENDITION_WIDTHS: tuple[int, ...] = (480, 960, 1600)
+
+# Output formats: file extension -> (Pillow format, MIME type, save options)
+RENDITION_FORMATS: dict[str, tuple[str, str, dict]] = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+RENDITIONS_DIR: str = "renditions"
+
+# EXIF orientations 5-8 are rotated by 90 degrees
+EXIF_ORIENTATION_TAG: int = 0x0112
+
+
+def rendition_widths(width):
+    """
+    Returns the rendition widths to produce for an image of the given width.
+
+    Images are never upscaled: widths larger than the original are replaced by
+    the original width.
+
+    Args:
+        width (int): Width of the original image.
+
+    Returns:
+        list[int]: The widths, ascending.
+    """
+    widths = [w for w in RENDITION_WIDTHS if w < width]
+    return widths + [min(width, RENDITION_WIDTHS[-1])]
+
+
+def _open_for_resizing(file):
+    image = Image.open(file)
+    # Let the JPEG decoder downscale while decoding: the largest rendition never
+    # needs more pixels than this
+    if image.getexif().get(EXIF_ORIENTATION_TAG, 1) >= 5:
+        image.draft("RGB", (1, RENDITION_WIDTHS[-1]))
+    else:
+        image.draft("RGB", (RENDITION_WIDTHS[-1], 1))
+    return ImageOps.exif_transpose(image).convert("RGB")
+
+
+def build_renditions(image_field):
+    """
+    Writes resized WebP and JPEG copies of a blog image next to the uploads.
+
+    Args:
+        image_field (ImageFieldFile): The blog's `image`.
+
+    Returns:
+        dict: ``{"source": <image name>, "webp": {<width>: <name>}, "jpg": {...}}``,
+        the value stored in `Blog.image_renditions`.
+    """
+    storage = image_field.storage
+    stem = PurePosixPath(image_field.name).stem
+    renditions = {"source": image_field.name}
+    renditions.update({extension: {} for extension in RENDITION_FORMATS})
+
+    with image_field.open("rb") as file:
+        image = _open_for_resizing(file)
+    for width in rendition_widths(image.width):
+        if width == image.width:
+            resized = image
+        else:
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for extension, (image_format, _, options) in RENDITION_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            renditions[extension][str(width)] = storage.save(
+                f"{RENDITIONS_DIR}/{stem}-{width}w.{extension}",
+                ContentFile(buffer.getvalue()),
+            )
+    return renditions
+
+
+def current_renditions(blog):
+    """
+    Returns the renditions of a blog's current image.
+
+    Renditions left over from a replaced image are ignored until the task has
+    rebuilt them.
+
+    Args:
+        blog (Blog): The blog.
+
+    Returns:
+        list[tuple[int, dict[str, str]]]: ``(width, {extension: url})`` pairs,
+        ascending by width; empty if there are no usable renditions.
+    """
+    renditions = blog.image_renditions or {}
+    if not blog.image or renditions.get("source") != blog.image.name:
+        return []
+    storage = blog.image.storage
+    widths = sorted({int(width) for width in renditions.get("jpg", {})})
+    return [
+        (
+            width,
+            {
+                extension: storage.url(renditions[extension][str(width)])
+                for extension in RENDITION_FORMATS
+                if str(width) in renditions.get(extension, {})
+            },
+        )
+        for width in widths
+    ]
+
+
+def rendition_names(renditions):
+    """
+    Lists the storage names held in a `Blog.image_renditions` value.
+
+    Args:
+        renditions (dict): The stored renditions.
+
+    Returns:
+        list[str]: Every rendition file name.
+    """
+    return [
+        name
+        for extension in RENDITION_FORMATS
+        for name in (renditions or {}).get(extension, {}).values()
+    ]
@@ -0,0 +1,100 @@
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+
+# Group names that grant access to the blog views
+AUTHOR: str = "Author"
+EDITOR: str = "Editor"
+PUBLISHER: str = "Publisher"
+ROLE_NAMES: tuple[str, ...] = (AUTHOR, EDITOR, PUBLISHER)
+
+CHOICES_KEY_PREFIX: str = "blog:roles:choices"
+# Seconds a role choice list is cached: without a shared cache, `invalidate_role_choices`
+# only clears the cache of the process that made the change, so other workers catch
+# up after this (the submitted user is always validated against the database)
+CHOICES_TIMEOUT: int = 60
+
+
+def user_roles(request):
+    """
+    Returns the names of the groups the current user belongs to.
+
+    The names are resolved with one query, then kept on the user for the rest of
+    the request, so the permission check and the view share it. Every request
+    reads them again, so a membership change applies from the next request on.
+
+    Args:
+        request (HttpRequest): The current request.
+
+    Returns:
+        frozenset[str]: The user's group names (empty for anonymous users).
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, "_blog_roles", None)
+    if roles is None:
+        roles = frozenset(user.groups.values_list("name", flat=True))
+        user._blog_roles = roles
+    return roles
+
+
+def has_role(request, *roles):
+    """
+    Tells whether the current user belongs to at least one of the given groups.
+
+    Args:
+        request (HttpRequest): The current request.
+        *roles (str): Group names.
+
+    Returns:
+        bool: True if the user has any of the roles.
+    """
+    return not user_roles(request).isdisjoint(roles)
+
+
+def role_choices(role):
+    """
+    Returns the members of a role group as (id, label) pairs, from the cache.
+
+    Only ids and usernames are loaded (no `User` instances). The list is cached
+    until a user or a group membership changes, and for `CHOICES_TIMEOUT` seconds at most.
+
+    Args:
+        role (str): Group name.
+
+    Returns:
+        list[tuple[int, str]]: The members, in id order.
+    """
+    key = f"{CHOICES_KEY_PREFIX}:{role}"
+    choices = cache.get(key)
+    if choices is None:
+        choices = list(
+            User.objects.filter(groups__name=role)
+            .order_by("id")
+            .values_list("id", "username")
+        )
+        cache.set(key, choices, timeout=CHOICES_TIMEOUT)
+    return choices
+
+
+def invalidate_role_choices():
+    """
+    Drops the cached role choice lists after a user or group change.
+
+    Returns:
+        None
+    """
+    cache.delete_many([f"{CHOICES_KEY_PREFIX}:{role}" for role in ROLE_NAMES])
+
+
+class RoleRequiredMixin(UserPassesTestMixin):
+    """
+    Restricts a view to users in one of `allowed_roles`, read from the role cache.
+    """
+
+    allowed_roles: tuple[str, ...] = ()
+
+    def test_func(self):
+        return has_role(self.request, *self.allowed_roles)
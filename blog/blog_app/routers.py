@@ -0,0 +1,140 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+
+REPLICA_ALIAS: str = "replica"
+
+# Apps whose reads may be served by the replica (sessions, admin log... stay on default)
+REPLICA_APP_LABELS: frozenset[str] = frozenset({"blog_app", "auth"})
+
+PIN_SESSION_KEY: str = "_primary_pin_until"
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Sends the reads made inside the block to the replica (when BLOG_READ_REPLICA is on).
+
+    Only wrap read-only code: writes always go to the primary, and a read that
+    must see a write made in the same block would miss it.
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_to_primary(request):
+    """
+    Makes the user read from the primary for BLOG_REPLICA_PIN_SECONDS after a write.
+
+    Args:
+        request (HttpRequest): The request that wrote to the database.
+
+    Returns:
+        None
+    """
+    request.session[PIN_SESSION_KEY] = time.time() + settings.BLOG_REPLICA_PIN_SECONDS
+
+
+async def apin_to_primary(request):
+    """
+    Async version of `pin_to_primary`, for requests served under ASGI.
+
+    Args:
+        request (HttpRequest): The request that wrote to the database.
+
+    Returns:
+        None
+    """
+    await request.session.aset(PIN_SESSION_KEY, time.time() + settings.BLOG_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(request):
+    """
+    Tells whether the user wrote recently enough that the replica may not have their change.
+
+    Args:
+        request (HttpRequest): The current request.
+
+    Returns:
+        bool: True while the pin set by `pin_to_primary` lasts.
+    """
+    return request.session.get(PIN_SESSION_KEY, 0) > time.time()
+
+
+async def ais_pinned_to_primary(request):
+    """
+    Async version of `is_pinned_to_primary`, for the ASGI read views.
+
+    Args:
+        request (HttpRequest): The current request.
+
+    Returns:
+        bool: True while the pin set by `pin_to_primary` lasts.
+    """
+    return await request.session.aget(PIN_SESSION_KEY, 0) > time.time()
+
+
+async def ause_replica(request):
+    """
+    Tells whether an async read-only view should read from the replica.
+
+    Args:
+        request (HttpRequest): The current request.
+
+    Returns:
+        bool: True when BLOG_READ_REPLICA is on and the user is not pinned to the primary.
+    """
+    return settings.BLOG_READ_REPLICA and not await ais_pinned_to_primary(request)
+
+
+class ReadReplicaRouter:
+    """
+    Routes reads to the "replica" database inside `replica_reads()` blocks.
+
+    Enabled by BLOG_READ_REPLICA. Writes, migrations and every read outside a
+    `replica_reads()` block use the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            settings.BLOG_READ_REPLICA
+            and _replica_reads.get()
+            and model._meta.app_label in REPLICA_APP_LABELS
+        ):
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, never migrated on its own
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    Serves a read-only view from the replica, unless the user wrote a moment ago.
+
+    The user is loaded from the primary first, so that a session created just
+    now (e.g. a fresh registration) is never rejected by a lagging replica.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Resolve the lazy request.user now, outside the replica block
+        request.user.is_authenticated
+        if not settings.BLOG_READ_REPLICA or is_pinned_to_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,157 @@
+import re
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.db.models.expressions import RawSQL
+from .models import Blog
+
+
+# Name of the full-text table created by migration 0003
+FTS_TABLE: str = "blog_app_blog_fts"
+
+SUPPORTED_VENDORS: tuple[str, ...] = ("sqlite", "postgresql")
+
+# Weighted document used by the PostgreSQL index (title > category/author > content)
+POSTGRES_DOCUMENT_SQL: str = (
+    "setweight(to_tsvector('english', %s), 'A') || "
+    "setweight(to_tsvector('english', %s), 'B') || "
+    "setweight(to_tsvector('english', %s), 'B') || "
+    "setweight(to_tsvector('english', %s), 'C')"
+)
+
+
+def is_supported(using=DEFAULT_DB_ALIAS):
+    """
+    Tells whether a database backend has a full-text index.
+
+    Args:
+        using (str): Database alias (e.g. the one a queryset reads from).
+
+    Returns:
+        bool: True for SQLite (FTS5) and PostgreSQL (tsvector/GIN).
+    """
+    return connections[using].vendor in SUPPORTED_VENDORS
+
+
+def build_match_query(search_value, using=DEFAULT_DB_ALIAS):
+    """
+    Converts the raw DataTables search box value into a backend full-text query.
+
+    Every word is matched as a prefix (the box searches on each keystroke) and
+    all words must be present. Punctuation is dropped so user input can never
+    break the FTS5 / tsquery syntax.
+
+    Args:
+        search_value (str): Text typed in the search box.
+        using (str): Database alias the query runs on.
+
+    Returns:
+        str | None: The query string, or None if the value has no searchable words.
+    """
+    terms = re.findall(r"\w+", search_value.lower())
+    if not terms:
+        return None
+    if connections[using].vendor == "postgresql":
+        return " & ".join(f"{term}:*" for term in terms)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _author_name(blog):
+    return f"{blog.author.first_name} {blog.author.last_name}".strip()
+
+
+def index_blogs(blogs):
+    """
+    Writes the given blogs to the full-text index.
+
+    Published blogs are inserted or replaced; unpublished blogs are removed so
+    that only live posts can be found from the listing.
+
+    Args:
+        blogs (Iterable[Blog]): Blog instances (``author`` should be loaded).
+
+    Returns:
+        None
+    """
+    using = router.db_for_write(Blog)
+    if not is_supported(using):
+        return
+    connection = connections[using]
+    published = [blog for blog in blogs if blog.is_published]
+    unpublished = [blog.pk for blog in blogs if not blog.is_published]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for blog in published:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (blog_id, document) "
+                    f"VALUES (%s, {POSTGRES_DOCUMENT_SQL}) "
+                    "ON CONFLICT (blog_id) DO UPDATE SET document = EXCLUDED.document",
+                    [blog.pk, blog.title, blog.category, _author_name(blog), blog.content],
+                )
+        else:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, content, category, author) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [
+                    (blog.pk, blog.title, blog.content, blog.category, _author_name(blog))
+                    for blog in published
+                ],
+            )
+    remove_blogs(unpublished)
+
+
+def remove_blogs(blog_ids):
+    """
+    Deletes the given blog ids from the full-text index.
+
+    Args:
+        blog_ids (Iterable[int]): Primary keys of the blogs to remove.
+
+    Returns:
+        None
+    """
+    blog_ids = list(blog_ids)
+    using = router.db_for_write(Blog)
+    if not blog_ids or not is_supported(using):
+        return
+    connection = connections[using]
+    key = "blog_id" if connection.vendor == "postgresql" else "rowid"
+    placeholders = ", ".join(["%s"] * len(blog_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE {key} IN ({placeholders})", blog_ids
+        )
+
+
+def search(queryset, search_value):
+    """
+    Restricts a Blog queryset to full-text matches and annotates their relevance.
+
+    The queryset gains a ``search_rank`` annotation where a higher value means a
+    better match (negated BM25 on SQLite, ``ts_rank`` on PostgreSQL). The index
+    table is joined to the blogs, so the full-text query runs once per search
+    (a correlated rank subquery would run it again for every match).
+
+    Args:
+        queryset (QuerySet): Blog queryset to filter.
+        search_value (str): Text typed in the search box.
+
+    Returns:
+        QuerySet: The filtered, annotated queryset (empty if nothing is searchable).
+    """
+    query = build_match_query(search_value, queryset.db)
+    if query is None:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    if connections[queryset.db].vendor == "postgresql":
+        join_sql = f"{FTS_TABLE}.blog_id = {table}.id"
+        match_sql = f"{FTS_TABLE}.document @@ to_tsquery('english', %s)"
+        rank_sql = f"ts_rank({FTS_TABLE}.document, to_tsquery('english', %s))"
+        rank_params = (query,)
+    else:
+        join_sql = f"{FTS_TABLE}.rowid = {table}.id"
+        match_sql = f"{FTS_TABLE} MATCH %s"
+        # bm25() reads the match of the joined row: no second MATCH
+        rank_sql = f"-bm25({FTS_TABLE}, 10.0, 1.0, 5.0, 5.0)"
+        rank_params = ()
+    return queryset.extra(
+        tables=[FTS_TABLE], where=[join_sql, match_sql], params=[query]
+    ).annotate(search_rank=RawSQL(rank_sql, rank_params))
@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from rest_framework import serializers
+from .models import Blog
+
+
+# Blog relations to users, serialized as nested objects
+ROLE_FIELDS: tuple[str, ...] = ("author", "editor", "publisher")
+USER_FIELDS: tuple[str, ...] = ("id", "username", "first_name", "last_name")
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = USER_FIELDS
+
+
+class BlogSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of a blog for the API.
+
+    Pass `fields` to serialize only some of the fields (sparse fieldsets).
+    """
+
+    author = UserSummarySerializer(read_only=True)
+    editor = UserSummarySerializer(read_only=True)
+    publisher = UserSummarySerializer(read_only=True)
+
+    class Meta:
+        model = Blog
+        fields = [
+            "id",
+            "title",
+            "content",
+            "image",
+            "category",
+            "created_at",
+            "updated_at",
+            "publish_at",
+            "author",
+            "editor",
+            "publisher",
+        ]
+        read_only_fields = fields
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def parse_fields(value):
+    """
+    Parses a `?fields=` query parameter.
+
+    Args:
+        value (str | None): Comma separated field names.
+
+    Returns:
+        list[str] | None: The requested fields in serializer order, or None for all of them.
+
+    Raises:
+        ValidationError: If a field is not part of `BlogSerializer`.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(BlogSerializer.Meta.fields)
+    if unknown:
+        raise serializers.ValidationError(
+            {"fields": f"Unknown fields: {', '.join(sorted(unknown))}"}
+        )
+    return [name for name in BlogSerializer.Meta.fields if name in requested]
+
+
+def blog_columns(fields):
+    """
+    Returns the `only()` columns and `select_related()` relations needed for `fields`.
+
+    Args:
+        fields (list[str] | None): The requested fields, or None for all of them.
+
+    Returns:
+        tuple[list[str], list[str]]: The columns to load and the relations to join.
+    """
+    fields = fields or BlogSerializer.Meta.fields
+    # The cursor and the ETag always need the id and updated_at
+    columns = {"id", "updated_at"}
+    relations = []
+    for name in fields:
+        if name in ROLE_FIELDS:
+            relations.append(name)
+            columns.update(f"{name}__{column}" for column in USER_FIELDS)
+        else:
+            columns.add(name)
+    return sorted(columns), relations
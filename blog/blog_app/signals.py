@@ -0,0 +1,105 @@
+from django.contrib.auth.models import Group, User
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .models import Blog, BlogTombstone
+from . import search
+from .renditions import rendition_names
+from .storage import release_on_commit
+from .roles import invalidate_role_choices
+from .caching import bump_listing_generation, invalidate_detail
+from .instrumentation import record_query
+
+
+@receiver(post_save, sender=Blog)
+def update_search_index(sender, instance, **kwargs):
+    """Keep the full-text index and cached listing data in step with the saved blog."""
+    search.index_blogs([instance])
+    bump_listing_generation()
+    invalidate_detail(instance.pk)
+
+
+def _renditions_of(blog, image_name):
+    renditions = blog.image_renditions or {}
+    if renditions.get("source") != image_name:
+        return []
+    return rendition_names(renditions)
+
+
+@receiver(post_save, sender=Blog)
+def release_replaced_image(sender, instance, **kwargs):
+    """Drop the previous image file (and its renditions) once nothing uses it."""
+    previous = getattr(instance, "_loaded_image", None)
+    if previous and previous != instance.image.name:
+        release_on_commit(previous, _renditions_of(instance, previous))
+    instance._loaded_image = instance.image.name
+
+
+@receiver(post_delete, sender=Blog)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop a deleted blog from the full-text index and cached listing data."""
+    search.remove_blogs([instance.pk])
+    bump_listing_generation()
+    invalidate_detail(instance.pk)
+    release_on_commit(instance.image.name, _renditions_of(instance, instance.image.name))
+
+
+@receiver(post_delete, sender=Blog)
+def record_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone for the change feed; it commits or rolls back with the delete."""
+    BlogTombstone.objects.create(blog_id=instance.pk)
+
+
+@receiver(post_save, sender=User)
+def reindex_author_blogs(sender, instance, created, update_fields=None, **kwargs):
+    """Re-index an author's published blogs when their name changes."""
+    if created:
+        return
+    if update_fields is not None and not {"first_name", "last_name"} & set(update_fields):
+        return
+    search.index_blogs(
+        list(instance.authored_blogs.filter(is_published=True).select_related("author"))
+    )
+    bump_listing_generation()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_changed_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Expire the cached role choices when a group membership changes."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_role_choices()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_roles(sender, **kwargs):
+    """Expire the cached role choices when a group is renamed or deleted."""
+    invalidate_role_choices()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_choices(sender, instance, update_fields=None, **kwargs):
+    """Refresh the role choice lists when a username changes or a user is deleted."""
+    # Logins save last_login only: the labels are unchanged
+    if update_fields is not None and "username" not in update_fields:
+        return
+    invalidate_role_choices()
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    """Apply BLOG_SQLITE_PRAGMAS (WAL, busy timeout, mmap) to each new SQLite connection."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, "BLOG_SQLITE_PRAGMAS", {}).items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Count the queries of each connection for InstrumentationMiddleware."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
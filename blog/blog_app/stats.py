@@ -0,0 +1,20 @@
+# Latency statistics shared by the benchmarks and the task report. Kept free of
+# Django and of the load generator, so that any command can import it cheaply.
+
+
+def percentile(values, percent):
+    """
+    Returns a percentile of latencies, in milliseconds.
+
+    Args:
+        values (list[float]): Latencies in seconds.
+        percent (float): The percentile, e.g. 95.
+
+    Returns:
+        float | None: The value rounded to 0.01 ms, or None when there are no values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return round(values[index] * 1000, 2)
@@ -0,0 +1,109 @@
+import hashlib
+import os
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils import timezone
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its content.
+
+    Saving content that is already stored returns the existing name without
+    writing anything (it only touches the file's modification time), so an image
+    re-uploaded across posts is kept once. Files may be shared between blogs:
+    delete them through `release`, which checks that nothing references them, or
+    the `gc_media` management command. Both leave recently saved files alone.
+    """
+
+    def __init__(self, **kwargs):
+        # Two writers of the same name always write the same bytes
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def content_name(self, name, content):
+        """
+        Returns the storage name for `content`: its digest, in the directory of `name`.
+
+        Args:
+            name (str): The name requested by the caller (e.g. "uploads/photo.JPG").
+            content (File): The content to store.
+
+        Returns:
+            str: e.g. "uploads/<sha256>.jpg".
+        """
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1].lower()
+        return os.path.join(directory, f"{digest.hexdigest()}{extension}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        try:
+            # A re-used file counts as just saved, so that `release` and `gc_media`
+            # keep it until the blog referencing it has committed
+            os.utime(self.path(name))
+            return name
+        except FileNotFoundError:
+            return super().save(name, content, max_length=max_length)
+
+
+def release(image_name, rendition_names=()):
+    """
+    Deletes a blog image and its renditions once no blog references the image.
+
+    Images saved or re-used in the last BLOG_MEDIA_RELEASE_GRACE_SECONDS are kept:
+    an upload of the same bytes may still be about to commit a blog using them.
+    `gc_media` deletes them later if they stay unreferenced.
+
+    Args:
+        image_name (str): Storage name of the image that lost a reference.
+        rendition_names (Iterable[str]): Storage names of the image's renditions.
+
+    Returns:
+        list[str]: The names that were deleted.
+    """
+    from .models import Blog
+
+    if not image_name or Blog.objects.filter(image=image_name).exists():
+        return []
+    storage = Blog._meta.get_field("image").storage
+    grace = timedelta(seconds=settings.BLOG_MEDIA_RELEASE_GRACE_SECONDS)
+    try:
+        if storage.get_modified_time(image_name) > timezone.now() - grace:
+            return []
+    except FileNotFoundError:
+        pass
+    deleted = []
+    for name in [image_name, *rendition_names]:
+        if storage.exists(name):
+            storage.delete(name)
+            deleted.append(name)
+    return deleted
+
+
+def release_on_commit(image_name, rendition_names=()):
+    """
+    Runs `release` once the current transaction commits.
+
+    A rolled back delete or image change still points at its files, so they
+    must only be removed after the commit.
+
+    Args:
+        image_name (str): Storage name of the image that lost a reference.
+        rendition_names (Iterable[str]): Storage names of the image's renditions.
+
+    Returns:
+        None
+    """
+    rendition_names = list(rendition_names)
+    transaction.on_commit(lambda: release(image_name, rendition_names))
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+)
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+
+# Message header stamped by the publisher, read back by the worker to measure queue lag
+ENQUEUED_AT_HEADER: str = "enqueued_at"
+
+_lock = threading.Lock()
+# Task id -> (wall clock start, perf counter start), for tasks running in this worker
+_running: dict = {}
+# Task id -> name of the exception that failed or retried the task
+_errors: dict = {}
+
+
+def queue_lag(request, started_at):
+    """
+    Returns how long a task waited between being due and starting.
+
+    A task is due when it is enqueued, or at its ETA/countdown when it has one,
+    so scheduled tasks only count the time they were late.
+
+    Args:
+        request (celery.app.task.Context): The task's request.
+        started_at (float): Start time (epoch seconds).
+
+    Returns:
+        float | None: The lag in seconds, or None when the task was not enqueued
+        by a publisher that stamps ``enqueued_at`` (e.g. an eager call).
+    """
+    enqueued_at = getattr(request, ENQUEUED_AT_HEADER, None)
+    if enqueued_at is None:
+        return None
+    due = float(enqueued_at)
+    eta = parse_datetime(request.eta) if isinstance(request.eta, str) else request.eta
+    if eta is not None:
+        due = max(due, eta.timestamp())
+    return round(max(started_at - due, 0.0), 6)
+
+
+def write_record(record):
+    """
+    Appends one task execution record to BLOG_TASK_METRICS_FILE (JSON lines).
+
+    Args:
+        record (dict): The record written by `task_finished`.
+
+    Returns:
+        None
+    """
+    path = getattr(settings, "BLOG_TASK_METRICS_FILE", None)
+    if not path:
+        return
+    line = json.dumps(record) + "\n"
+    try:
+        # One short append per record: lines from several worker processes do not mix
+        with _lock, open(path, "a") as file:
+            file.write(line)
+    except OSError as e:
+        print(f"Could not write task metrics to {path}: {e}")
+
+
+def read_records(path, since=None):
+    """
+    Reads the task execution records written by the workers.
+
+    Args:
+        path (str): The metrics file.
+        since (float | None): Only keep tasks finished after this time (epoch seconds).
+
+    Returns:
+        list[dict]: The records, oldest first. Unreadable lines are skipped.
+    """
+    records = []
+    with open(path) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if since is None or record.get("finished_at", 0) >= since:
+                records.append(record)
+    return records
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    """Stamp each published task with the time it was enqueued."""
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def task_started(task_id=None, **kwargs):
+    with _lock:
+        _running[task_id] = (time.time(), time.perf_counter())
+
+
+@task_failure.connect
+def task_failed(task_id=None, exception=None, **kwargs):
+    with _lock:
+        _errors[task_id] = type(exception).__name__
+
+
+@task_retry.connect
+def task_retried(request=None, reason=None, **kwargs):
+    # `reason` is the Retry raised by the task, wrapping the exception that caused it
+    exception = getattr(reason, "exc", None) or reason
+    with _lock:
+        _errors[request.id] = type(exception).__name__
+
+
+@task_postrun.connect
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    """Record the queue lag, runtime, outcome and retry count of a finished task."""
+    finished = time.perf_counter()
+    with _lock:
+        started = _running.pop(task_id, None)
+        error = _errors.pop(task_id, None)
+    if started is None:
+        return
+    started_at, started_perf = started
+    write_record(
+        {
+            "task": task.name,
+            "id": task_id,
+            "state": state,
+            "queue_lag": queue_lag(task.request, started_at),
+            "runtime": round(finished - started_perf, 6),
+            "retries": task.request.retries or 0,
+            "exception": error,
+            "finished_at": round(time.time(), 3),
+        }
+    )
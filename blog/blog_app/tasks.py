@@ -1,59 +1,147 @@
 from celery import shared_task
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
+from django.db import connection, transaction
+from sqlite3 import sqlite_version_info
 from django.contrib.auth.models import User
-from .models import Blog
+from .models import Blog, FailedEmail
 from django.utils import timezone
-from .custom_exceptions import EmailSendingError
+from datetime import timedelta
+from .delivery import backoff_delay, throttle_smtp
+from .caching import bump_listing_generation, invalidate_detail
+from . import outbox, renditions, search
+from .routers import replica_reads
+from itertools import groupby
+from operator import attrgetter
+
+
+# Users per daily digest subtask; each subtask sends its batch over one SMTP connection
+DIGEST_BATCH_SIZE: int = 500
 
 
 @shared_task
-def send_email(subject,message,from_email,publisher_email):
+def daily_mail_users(batch_size=DIGEST_BATCH_SIZE):
     """
-    Sends an email notification to the specified publisher using Django's send_mail function.
+    Sends a daily email to all registered users containing the three most recent blog titles.
+
+    This task retrieves the latest three published blog posts and streams user ids with
+    `.iterator()`, fanning them out in batches of `batch_size` to `send_daily_digest_batch`
+    subtasks. Every user gets their own message, and a failed batch is retried on its own.
+    Intended to be triggered by a daily cron job.
 
     Args:
-        subject (str): Subject line of the email.
-        message (str): Body content of the email.
-        from_email (str): Sender's email address.
-        publisher_email (str): Recipient publisher's email address.
+        batch_size (int): Number of users per subtask.
 
     Returns:
-        int: The number of successfully delivered messages (1 if successful, 0 otherwise).
+        int: The number of batches enqueued.
     """
-    print(f"Sending notification to {publisher_email}")
+    print("email starting...")
+    # The digest only reads: scan the replica (when enabled) instead of the primary
+    with replica_reads():
+        recent_blogs = Blog.objects.filter(is_published=True).order_by("-created_at")[:3]
+        blog_titles = "\n".join([f"👉 {blog.title}" for blog in recent_blogs])
+
+        users = User.objects.exclude(email="").order_by("id").values_list("id", flat=True)
+        batches = 0
+        user_ids = []
+        for user_id in users.iterator(chunk_size=batch_size):
+            user_ids.append(user_id)
+            if len(user_ids) == batch_size:
+                send_daily_digest_batch.delay(user_ids, blog_titles)
+                batches += 1
+                user_ids = []
+        if user_ids:
+            send_daily_digest_batch.delay(user_ids, blog_titles)
+            batches += 1
+    print(f"Enqueued {batches} daily digest batches")
+    return batches
+
+
+@shared_task(bind=True, max_retries=settings.BLOG_EMAIL_MAX_ATTEMPTS - 1)
+def send_daily_digest_batch(self, user_ids, blog_titles):
+    """
+    Sends the daily digest to one batch of users over a single SMTP connection.
+
+    Messages are sent one at a time, within the SMTP rate limit (see
+    `delivery.throttle_smtp`): if the connection fails part way, the retry only gets
+    the users who have not been sent their digest yet, after a backoff (see
+    `delivery.backoff_delay`). After BLOG_EMAIL_MAX_ATTEMPTS attempts the digests
+    still unsent are stored in FailedEmail.
+
+    Args:
+        user_ids (list[int]): Ids of the users in this batch.
+        blog_titles (str): Formatted list of the latest blog titles.
+
+    Returns:
+        int: The number of messages delivered by this attempt.
+    """
+    users = (
+        User.objects.filter(id__in=user_ids)
+        .exclude(email="")
+        .order_by("id")
+        .only("email", "first_name")
+    )
+    with replica_reads():
+        messages = [
+            (
+                user.id,
+                EmailMessage(
+                    "Exciting new blogs",
+                    daily_digest_message(user.first_name or "there", blog_titles),
+                    settings.DEFAULT_FROM_EMAIL,
+                    [user.email],
+                ),
+            )
+            for user in users
+        ]
+    sent = 0
+    done = 0
     try:
-        return send_mail(
-            subject,
-            message,
-            from_email,
-            publisher_email,  # should be a list
-            fail_silently=False,
-        )
+        # sending email to users using cronjob daily
+        with get_connection(fail_silently=False) as connection:
+            for _, message in messages:
+                throttle_smtp()
+                sent += connection.send_messages([message])
+                done += 1
     except Exception as e:
-        print(f"Error sending email to {publisher_email}: {e}")
-        raise EmailSendingError(str(e), publisher_email)
+        remaining = messages[done:]
+        print(f"Error sending daily digest to {len(remaining)} users: {e}")
+        if self.request.retries >= self.max_retries:
+            FailedEmail.objects.bulk_create(
+                [
+                    FailedEmail(
+                        subject=message.subject,
+                        message=message.body,
+                        from_email=message.from_email,
+                        recipients=message.to,
+                        error=str(e),
+                        attempts=self.request.retries + 1,
+                    )
+                    for _, message in remaining
+                ]
+            )
+            raise
+        raise self.retry(
+            exc=e,
+            args=[[user_id for user_id, _ in remaining], blog_titles],
+            countdown=backoff_delay(self.request.retries + 1),
+        )
+    return sent
 
 
-@shared_task 
-def daily_mail_users():
+def daily_digest_message(name, blog_titles):
     """
-    Sends a daily email to all registered users containing the three most recent blog titles.
+    Formats the body of the daily digest email for one user.
 
-    This task retrieves all user email addresses and the latest three blog posts,
-    formats them into an email message, and sends it using Django's send_mail function.
-    Intended to be triggered by a daily cron job.
+    Args:
+        name (str): Name used in the greeting.
+        blog_titles (str): Formatted list of the latest blog titles.
 
     Returns:
-        int: The number of successfully delivered messages.
+        str: The message body.
     """
-    print("email starting...")
-    users = User.objects.all().values_list('email',flat=True)
-    recent_blogs = Blog.objects.order_by("-created_at")[:3]
-    blog_titles = "\n".join([f"👉 {blog.title}" for blog in recent_blogs])
-    subject = f"Exciting new blogs"
-    message = f"""
-                Hi Users,
+    return f"""
+                Hi {name},
 
                 We’re thrilled to share that some exciting new blog posts are now live on our website! Whether you're looking for insights, tips, or a dose of inspiration, there's something for everyone.
 
@@ -65,52 +153,202 @@ def daily_mail_users():
                 Happy reading!
                 Blog App
                 """
-    from_email = (settings.DEFAULT_FROM_EMAIL,)
-    recipient_list = list(users)
-
-    # sending email to users using cronjob daily
-    return send_mail(
-        subject,
-        message,
-        from_email,
-        recipient_list,
-        fail_silently=False,
-    )
+
+
+# Number of due blogs claimed and published by one UPDATE
+PUBLISH_BATCH_SIZE: int = 500
+
+# Blogs due further out than this are not given an ETA task yet; the reconciliation
+# sweep schedules them once they come within range. This keeps ETAs shorter than the
+# Redis visibility timeout (1 hour), after which unacknowledged tasks are redelivered.
+# The sweep must run at least this often.
+PUBLISH_ETA_HORIZON: timedelta = timedelta(hours=1)
 
 
 @shared_task
-def publish_scheduled_blogs():
+def publish_scheduled_blogs(batch_size=PUBLISH_BATCH_SIZE):
     """
-    Publishes blogs that are scheduled to go live.
+    Reconciliation sweep for scheduled blogs, intended to run hourly.
+
+    Blogs normally go live through their own `publish_blog` ETA task. This sweep publishes
+    any blog whose `publish_at` has passed but is still unpublished (e.g. its task was lost),
+    and schedules `publish_blog` for blogs due before the next sweep.
+
+    Due blogs are claimed and published in batches of `batch_size` with one UPDATE per
+    batch (see `claim_due_blogs`), their authors and editors are loaded with a single joined
+    query, and the notification emails of a batch are enqueued as one Celery group. Several
+    workers can run this task at the same time: each due blog is claimed, and therefore
+    notified, exactly once.
 
-    This task checks for blogs that are not yet published but have a `publish_at` timestamp
-    less than or equal to the current time. It marks them as published and sends a
-    notification email for each published blog.
+    Args:
+        batch_size (int): Maximum number of blogs published per UPDATE.
 
     Returns:
-        None
+        int: The number of blogs published.
     """
     now = timezone.now()
-    blogs = Blog.objects.filter(is_published=False, publish_at__lte=now)
-    for blog in blogs:
-        blog.is_published = True
-        blog.save()
-        publish_mail(blog)
+    published = 0
+    while True:
+        count = _publish_due_blogs(now, batch_size)
+        if not count:
+            break
+        published += count
+        print(f"Published {count} scheduled blogs")
 
+    upcoming = Blog.objects.filter(
+        is_published=False, publish_at__gt=now, publish_at__lte=now + PUBLISH_ETA_HORIZON
+    ).values_list("id", "publish_at")
+    for blog_id, publish_at in upcoming.iterator():
+        _enqueue_publish(blog_id, publish_at)
+    return published
 
-def publish_mail(object):
+
+@shared_task
+def publish_blog(blog_id, publish_at):
     """
-    Sends a publication notification email to the blog's author and editor.
+    Publishes a single blog at its scheduled time.
 
-    Constructs an email message with blog details such as title, category, author, and editor,
-    and sends it asynchronously using the `send_email` task.
+    Enqueued by `schedule_publish` with an ETA of the blog's `publish_at`. Rescheduling a
+    blog simply enqueues another task: a run whose `publish_at` no longer matches the blog
+    is stale and does nothing, as does a run for a blog that is already published.
 
     Args:
-        object (Blog): The blog instance that has been published.
+        blog_id (int): Id of the blog to publish.
+        publish_at (str): ISO timestamp the task was scheduled for.
+
+    Returns:
+        int: 1 if the blog was published by this run, 0 otherwise.
+    """
+    queryset = Blog.objects.filter(pk=blog_id, publish_at=publish_at)
+    return _publish_due_blogs(timezone.now(), 1, queryset)
+
+
+def schedule_publish(blog):
+    """
+    Schedules the `publish_blog` task for a blog once the current transaction commits.
+
+    Call it after creating a blog or changing its `publish_at`. Blogs due beyond
+    `PUBLISH_ETA_HORIZON` are left to the reconciliation sweep.
+
+    Args:
+        blog (Blog): The saved blog instance.
 
     Returns:
         None
     """
+    if blog.is_published or blog.publish_at is None:
+        return
+    if blog.publish_at > timezone.now() + PUBLISH_ETA_HORIZON:
+        return
+    transaction.on_commit(lambda: _enqueue_publish(blog.pk, blog.publish_at))
+
+
+def _enqueue_publish(blog_id, publish_at):
+    try:
+        publish_blog.apply_async((blog_id, publish_at.isoformat()), eta=publish_at)
+    except Exception as e:
+        # The reconciliation sweep publishes the blog if this task never runs
+        print(f"Could not schedule publishing of blog {blog_id}: {e}")
+
+
+def _publish_due_blogs(now, limit, queryset=None):
+    """Claims, indexes and notifies one batch of due blogs, returning its size."""
+    with transaction.atomic():
+        blog_ids = claim_due_blogs(now, limit, queryset)
+        if not blog_ids:
+            return 0
+        blogs = list(
+            Blog.objects.filter(id__in=blog_ids).select_related("author", "editor")
+        )
+        # The claim UPDATE skips the post_save signal, so refresh the search index here
+        search.index_blogs(blogs)
+        # One outbox INSERT for the whole batch, committed with the claim
+        outbox.enqueue_many([publish_mail_kwargs(blog) for blog in blogs])
+    bump_listing_generation()
+    return len(blogs)
+
+
+def claim_due_blogs(now, limit, queryset=None):
+    """
+    Marks up to `limit` due blogs as published and returns the ids claimed by this caller.
+
+    The claim also sets `updated_at` to the time of the claim (not `now`, which may be
+    long past in a sweep over a backlog), so that the change feed and the API's
+    `updated_since` and ETags pick up the publication.
+
+    On backends with `SELECT ... FOR UPDATE SKIP LOCKED` (PostgreSQL) the due rows are locked
+    and concurrent workers skip them and take the next ones. SQLite has no row locks but
+    serializes writers, so a conditional `UPDATE ... WHERE NOT is_published RETURNING id`
+    reports only the rows this caller flipped; rows lost to another worker are skipped.
+
+    Must be called inside `transaction.atomic()` so the claim commits together with the
+    work done for the claimed blogs.
+
+    Args:
+        now (datetime): Blogs with `publish_at` up to this time are due.
+        limit (int): Maximum number of blogs to claim.
+        queryset (QuerySet, optional): Restricts the claim to these blogs.
+
+    Returns:
+        list[int]: Ids of the blogs claimed (empty when nothing is left to claim).
+    """
+    if queryset is None:
+        queryset = Blog.objects.all()
+    due = queryset.filter(is_published=False, publish_at__lte=now).order_by("publish_at")
+    if connection.features.has_select_for_update_skip_locked:
+        blog_ids = list(
+            due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit]
+        )
+        Blog.objects.filter(id__in=blog_ids).update(
+            is_published=True, updated_at=timezone.now()
+        )
+        return blog_ids
+
+    while True:
+        candidates = list(due.values_list("id", flat=True)[:limit])
+        if not candidates:
+            return []
+        claimed = _claim_candidates(candidates, timezone.now())
+        if claimed:
+            return claimed
+        # Every candidate was claimed by another worker: look again
+
+
+def _claim_candidates(candidates, now):
+    """Conditionally publishes `candidates` at `now`, returning the ids this caller flipped."""
+    if connection.vendor == "sqlite" and sqlite_version_info < (3, 35):
+        # No RETURNING support: one conditional UPDATE per row
+        return [
+            blog_id
+            for blog_id in candidates
+            if Blog.objects.filter(id=blog_id, is_published=False).update(
+                is_published=True, updated_at=now
+            )
+        ]
+    placeholders = ", ".join(["%s"] * len(candidates))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {Blog._meta.db_table} SET is_published = %s, updated_at = %s "
+            f"WHERE id IN ({placeholders}) AND NOT is_published RETURNING id",
+            [True, connection.ops.adapt_datetimefield_value(now), *candidates],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def publish_mail_kwargs(object):
+    """
+    Builds the publication notification email of a blog for `outbox.enqueue`.
+
+    The email contains blog details such as title, category, author, and editor and
+    is addressed to the blog's author and editor. Load the blog with
+    `select_related("author", "editor")` to avoid extra queries.
+
+    Args:
+        object (Blog): The blog instance that has been published.
+
+    Returns:
+        dict: The `subject`, `message`, `from_email` and `recipients` of the email.
+    """
     author = object.author
     editor = object.editor
     subject = f"Blog Post Published: {object.title}"
@@ -123,10 +361,163 @@ def publish_mail(object):
                 Editor: {object.editor.get_full_name() or object.editor.username}
                 
                 """
-    # sending email from celery to editor and author
-    send_email.delay(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        publisher_email=[author.email, editor.email],
+    return {
+        "subject": subject,
+        "message": message,
+        "from_email": settings.DEFAULT_FROM_EMAIL,
+        "recipients": [author.email, editor.email],
+    }
+
+
+def publish_mail(object):
+    """
+    Queues a publication notification email to the blog's author and editor.
+
+    Constructs an email message with blog details such as title, category, author, and editor,
+    and writes it to the outbox, which sends it once the current transaction commits.
+
+    Args:
+        object (Blog): The blog instance that has been published.
+
+    Returns:
+        None
+    """
+    # queue email to editor and author
+    outbox.enqueue(**publish_mail_kwargs(object))
+
+
+# Outbox rows claimed and sent per drain round
+OUTBOX_BATCH_SIZE: int = 500
+
+
+@shared_task
+def drain_outbox(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Sends the pending notification emails of the outbox.
+
+    Pending rows are claimed in batches (see `outbox.claim_pending`) and grouped per
+    recipient, so several notifications for the same person become one email. Each batch
+    is sent over one shared SMTP connection, and its rows are marked sent once their email
+    went out (at least once: a drain that dies mid-batch leaves its rows to be claimed
+    again when their lease expires). Rows that fail to send go back to the outbox
+    with a backoff (see `outbox.release`) and the drain stops. Before returning, a drain
+    is scheduled for the earliest row still waiting, so no row is left behind.
+
+    Args:
+        batch_size (int): Maximum number of outbox rows claimed per round.
+
+    Returns:
+        int: The number of emails sent.
+    """
+    # Notifications written from now on schedule a new drain
+    outbox.start_drain()
+    sent = 0
+    while True:
+        rows = outbox.claim_pending(batch_size)
+        if not rows:
+            break
+        delivered, failed, error = _send_outbox_rows(rows)
+        sent += delivered
+        failed_ids = {row.id for row in failed}
+        outbox.mark_sent([row for row in rows if row.id not in failed_ids])
+        if failed:
+            outbox.release(failed, error)
+            break
+    # Rows waiting on a backoff or a lease are skipped by this drain: always leave
+    # a drain scheduled for them, even if one was already pending for new rows
+    retry_at = outbox.next_due()
+    if retry_at is not None:
+        outbox.schedule_drain(
+            countdown=max((retry_at - timezone.now()).total_seconds(), outbox.DRAIN_DELAY)
+        )
+    print(f"Sent {sent} outbox emails")
+    return sent
+
+
+def _send_outbox_rows(rows):
+    """Sends claimed rows over one connection, returning (emails sent, failed rows, last error)."""
+    emails = [
+        (list(recipient_rows), recipient)
+        for recipient, recipient_rows in groupby(rows, key=attrgetter("recipient"))
+    ]
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as e:
+        print(f"Error opening mail connection: {e}")
+        return 0, rows, str(e)
+
+    sent = 0
+    failed = []
+    error = ""
+    try:
+        for recipient_rows, recipient in emails:
+            throttle_smtp()
+            try:
+                sent += mail_connection.send_messages(
+                    [outbox.build_email(recipient, recipient_rows)]
+                )
+            except Exception as e:
+                print(f"Error sending email to {recipient}: {e}")
+                failed.extend(recipient_rows)
+                error = str(e)
+    finally:
+        try:
+            mail_connection.close()
+        except Exception as e:
+            print(f"Error closing mail connection: {e}")
+    return sent, failed, error
+
+
+@shared_task
+def generate_image_renditions(blog_id, image_name):
+    """
+    Builds the resized WebP/JPEG copies of a blog image used by the detail page.
+
+    The task is a no-op when the blog was deleted or its image replaced after it
+    was queued; the replacement schedules its own run.
+
+    Args:
+        blog_id (int): Primary key of the blog.
+        image_name (str): Storage name of the image the task was queued for.
+
+    Returns:
+        dict | None: The stored renditions, or None if the task was stale.
+    """
+    blog = Blog.objects.filter(pk=blog_id, image=image_name).first()
+    if blog is None:
+        return None
+    built = renditions.build_renditions(blog.image)
+    # updated_at moves so that the detail page's ETag and cached copy change too
+    updated = Blog.objects.filter(pk=blog_id, image=image_name).update(
+        image_renditions=built, updated_at=timezone.now()
     )
+    if not updated:
+        return None
+    invalidate_detail(blog_id)
+    return built
+
+
+def schedule_renditions(blog):
+    """
+    Schedules `generate_image_renditions` for a blog once the current transaction commits.
+
+    Call it after a blog is created or its image is replaced.
+
+    Args:
+        blog (Blog): The saved blog instance.
+
+    Returns:
+        None
+    """
+    if not blog.image:
+        return
+    transaction.on_commit(lambda: _enqueue_renditions(blog.pk, blog.image.name))
+
+
+def _enqueue_renditions(blog_id, image_name):
+    try:
+        generate_image_renditions.delay(blog_id, image_name)
+    except Exception as e:
+        # The detail page keeps serving the original image
+        print(f"Could not schedule image renditions of blog {blog_id}: {e}")
@@ -0,0 +1,50 @@
+from django import template
+from django.utils.safestring import mark_safe
+from ..renditions import RENDITION_FORMATS, current_renditions
+
+
+register = template.Library()
+
+
+def _background(urls):
+    # URLs come from storage.url(), which percent-encodes quotes and angle brackets
+    fallback = urls.get("jpg") or next(iter(urls.values()))
+    candidates = ", ".join(
+        f'url("{urls[extension]}") type("{RENDITION_FORMATS[extension][1]}")'
+        for extension in RENDITION_FORMATS
+        if extension in urls
+    )
+    return (
+        f'background-image: url("{fallback}"); '
+        f"background-image: image-set({candidates});"
+    )
+
+
+@register.simple_tag
+def masthead_style(blog, selector="header.masthead"):
+    """
+    Renders a <style> block that sets the masthead background from the blog's renditions.
+
+    Each viewport width gets the smallest rendition that covers it, as WebP where the
+    browser supports it and JPEG otherwise. Until the renditions exist the original
+    image is used.
+
+    Usage: ``{% load blog_images %}{% masthead_style detail_data %}``
+    """
+    renditions = current_renditions(blog)
+    if not renditions:
+        if not blog.image:
+            return ""
+        return mark_safe(
+            f'<style>{selector} {{ background-image: url("{blog.image.url}"); }}</style>'
+        )
+
+    rules = []
+    previous_width = None
+    for width, urls in renditions:
+        rule = f"{selector} {{ {_background(urls)} }}"
+        if previous_width is not None:
+            rule = f"@media (min-width: {previous_width + 1}px) {{ {rule} }}"
+        rules.append(rule)
+        previous_width = width
+    return mark_safe("<style>\n" + "\n".join(rules) + "\n</style>")
@@ -0,0 +1,109 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+from ..models import Blog
+from ..tasks import publish_scheduled_blogs
+
+
+class BlogApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader@test.com",
+            email="reader@test.com",
+            password="testpassword",
+        )
+        self.blogs = [
+            Blog.objects.create(
+                title=f"Blog {i}",
+                content=f"Content {i}",
+                image="uploads/test_image.jpg",
+                category="python",
+                author=self.user,
+                editor=self.user,
+                publisher=self.user,
+                is_published=i != 4,
+            )
+            for i in range(5)
+        ]
+        self.client = Client()
+        self.client.login(username="reader@test.com", password="testpassword")
+        self.url = reverse("blog:api_blog_list")
+
+    def test_requires_authentication(self):
+        """Test that anonymous requests are rejected"""
+        self.assertEqual(Client().get(self.url).status_code, 403)
+
+    def test_cursor_pagination_lists_published_blogs(self):
+        """Test that the cursor pages through every published blog once"""
+        titles = []
+        url = f"{self.url}?page_size=3"
+        while url:
+            data = self.client.get(url).json()
+            titles += [blog["title"] for blog in data["results"]]
+            url = data["next"]
+        self.assertEqual(titles, [f"Blog {i}" for i in range(4)])
+
+    def test_sparse_fieldsets(self):
+        """Test that `fields` limits the serialized fields and the joined relations"""
+        with self.assertNumQueries(3):  # session, user and the page
+            data = self.client.get(self.url, {"fields": "id,title"}).json()
+        self.assertEqual(set(data["results"][0]), {"id", "title"})
+
+        data = self.client.get(self.url, {"fields": "title,author"}).json()
+        self.assertEqual(data["results"][0]["author"]["username"], "reader@test.com")
+        self.assertEqual(self.client.get(self.url, {"fields": "password"}).status_code, 400)
+
+    def test_updated_since(self):
+        """Test that `updated_since` only returns blogs changed since then"""
+        since = timezone.now() - timedelta(hours=1)
+        Blog.objects.filter(pk__in=[blog.pk for blog in self.blogs[:3]]).update(
+            updated_at=since - timedelta(days=1)
+        )
+        data = self.client.get(self.url, {"updated_since": since.isoformat()}).json()
+        self.assertEqual([blog["title"] for blog in data["results"]], ["Blog 3"])
+        self.assertEqual(
+            self.client.get(self.url, {"updated_since": "yesterday"}).status_code, 400
+        )
+
+    def test_scheduled_publication_is_synced(self):
+        """Test that a blog published by the scheduler shows up under `updated_since`"""
+        scheduled = self.blogs[4]
+        Blog.objects.filter(pk=scheduled.pk).update(
+            publish_at=timezone.now() - timedelta(minutes=5),
+            updated_at=timezone.now() - timedelta(days=1),
+        )
+        since = timezone.now()
+        publish_scheduled_blogs()
+
+        data = self.client.get(self.url, {"updated_since": since.isoformat()}).json()
+        self.assertEqual([blog["id"] for blog in data["results"]], [scheduled.pk])
+
+    def test_list_etag(self):
+        """Test that an unchanged page is answered with 304 until a blog in it changes"""
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.blogs[1].title = "Renamed"
+        self.blogs[1].save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_etag(self):
+        """Test that the detail answers revalidations without loading the blog"""
+        url = reverse("blog:api_blog_detail", args=[self.blogs[0].pk])
+        response = self.client.get(url, {"fields": "id,title"})
+        self.assertEqual(response.json(), {"id": self.blogs[0].pk, "title": "Blog 0"})
+
+        with self.assertNumQueries(3):  # session, user and updated_at
+            response = self.client.get(
+                url, {"fields": "id,title"}, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+        # Another fieldset is another representation
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200
+        )
+        unpublished = reverse("blog:api_blog_detail", args=[self.blogs[4].pk])
+        self.assertEqual(self.client.get(unpublished).status_code, 404)
@@ -0,0 +1,118 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from asgiref.sync import iscoroutinefunction
+from django.urls import include, path, resolve, reverse
+from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from ..benchmark import DATATABLE_COLUMNS, datatable_params
+from ..models import Blog
+
+
+class AsyncUrls:
+    @cached_property
+    def urlpatterns(self):
+        # Imported on first use: importing blog_app.urls creates the role groups
+        from .. import urls as blog_urls
+
+        patterns = blog_urls.use_async_read_views(blog_urls.urlpatterns)
+        return [path("", include((patterns, "blog")))]
+
+
+@override_settings(ROOT_URLCONF=AsyncUrls())
+class AsyncReadViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="author@test.com",
+            email="author@test.com",
+            password="testpassword",
+            first_name="Author",
+            last_name="User",
+        )
+        for index in range(5):
+            Blog.objects.create(
+                title=f"Blog {index}",
+                content=f"Content {index}",
+                image="uploads/test_image.jpg",
+                category="python",
+                author=self.user,
+                editor=self.user,
+                publisher=self.user,
+                is_published=True,
+            )
+        self.blog = Blog.objects.first()
+
+    async def test_views_require_login(self):
+        """Test that the async views redirect anonymous users to the login page"""
+        for url in [
+            reverse("blog:blog_list"),
+            reverse("blog:blog_ajax"),
+            reverse("blog:detail", args=[self.blog.pk]),
+        ]:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(response["Location"].startswith(reverse("blog:login")))
+
+    async def test_pages_are_served_by_coroutines(self):
+        """Test that the listing and detail pages are awaited as async views, not the sync ones"""
+        await self.async_client.aforce_login(self.user)
+        urls = [reverse("blog:blog_list"), reverse("blog:detail", args=[self.blog.pk])]
+        with mock.patch(
+            "blog_app.views.BlogTableView.get", side_effect=AssertionError
+        ), mock.patch("blog_app.views.BlogDetailView.get", side_effect=AssertionError):
+            for url in urls:
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    async def test_detail_is_cached_and_conditional(self):
+        """Test that the async detail view caches the page and answers 304"""
+        await self.async_client.aforce_login(self.user)
+        url = reverse("blog:detail", args=[self.blog.pk])
+        first = await self.async_client.get(url)
+        self.assertContains(first, "Content 0")
+        self.assertIn("private", first["Cache-Control"])
+        with mock.patch("blog_app.async_views.render_to_string") as render:
+            second = await self.async_client.get(url)
+        render.assert_not_called()
+        self.assertEqual(first.content, second.content)
+
+        not_modified = await self.async_client.get(
+            url, headers={"If-None-Match": first["ETag"]}
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        missing = await self.async_client.get(reverse("blog:detail", args=[0]))
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_datatable_pages_with_cursor(self):
+        """Test that the async DataTable returns the rows, count and next cursor"""
+        await self.async_client.aforce_login(self.user)
+        url = reverse("blog:blog_ajax")
+        first = (
+            await self.async_client.get(
+                url, datatable_params(0, length=2), headers={"Accept": "application/json"}
+            )
+        ).json()
+        second = (
+            await self.async_client.get(
+                url,
+                datatable_params(2, length=2, cursor=first["next_cursor"]),
+                headers={"Accept": "application/json"},
+            )
+        ).json()
+        pks = [str(blog.pk) async for blog in Blog.objects.order_by("pk")]
+        self.assertEqual([row["pk"] for row in first["data"]], pks[:2])
+        self.assertEqual([row["pk"] for row in second["data"]], pks[2:4])
+        self.assertEqual(second["recordsFiltered"], 5)
+
+    async def test_datatable_initialize(self):
+        """Test that the async DataTable answers the column setup request"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("blog:blog_ajax"),
+            {"action": "initialize"},
+            headers={"Accept": "application/json"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["columns"]), len(DATATABLE_COLUMNS))
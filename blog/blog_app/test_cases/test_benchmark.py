@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from ..benchmark import Workload, run_endpoint, seed
+from ..models import Blog
+
+
+class BenchmarkHarnessTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_seed_is_reproducible(self):
+        """Test that seeding creates the requested rows from the same random data"""
+        seed(users=6, blogs=20, seed=3)
+        titles = list(Blog.objects.order_by("pk").values_list("title", flat=True))
+        self.assertEqual(len(titles), 20)
+        self.assertEqual(User.objects.filter(groups__name="Author").count(), 3)
+
+        Blog.objects.all().delete()
+        User.objects.all().delete()
+        seed(users=6, blogs=20, seed=3)
+        self.assertEqual(
+            list(Blog.objects.order_by("pk").values_list("title", flat=True)), titles
+        )
+
+    def test_every_endpoint_succeeds(self):
+        """Test that each benchmarked endpoint is driven without errors and measured"""
+        user = seed(users=6, blogs=30)
+        workload = Workload()
+        for endpoint in Workload.ENDPOINTS:
+            with self.subTest(endpoint=endpoint):
+                result = run_endpoint(
+                    workload, endpoint, user, requests=3, concurrency=1, aliases=["default"]
+                )
+                self.assertEqual(result["requests"], 3)
+                self.assertEqual(result["errors"], 0)
+                self.assertGreater(result["queries_mean"], 0)
+                self.assertLessEqual(result["p50_ms"], result["p99_ms"])
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from ..models import Blog, BlogTombstone
+
+
+@override_settings(BLOG_CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="admin@test.com",
+            email="admin@test.com",
+            password="testpassword",
+            is_staff=True,
+        )
+        self.blogs = [
+            Blog.objects.create(
+                title=f"Blog {i}",
+                content=f"Content {i}",
+                image="uploads/test_image.jpg",
+                category="python",
+                author=self.user,
+                editor=self.user,
+                publisher=self.user,
+                is_published=i % 2 == 0,
+            )
+            for i in range(3)
+        ]
+        self.client = Client()
+        self.client.login(username="admin@test.com", password="testpassword")
+        self.url = reverse("blog:api_blog_changes")
+
+    def read_feed(self, since=None):
+        response = self.client.get(self.url, {"since": since} if since else {})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_full_resync_streams_every_blog(self):
+        """Test that the feed without a cursor streams every blog and ends with the next cursor"""
+        *changes, cursor = self.read_feed()
+        self.assertEqual([change["title"] for change in changes], ["Blog 0", "Blog 1", "Blog 2"])
+        self.assertEqual({change["op"] for change in changes}, {"upsert"})
+        self.assertFalse(changes[1]["is_published"])
+        self.assertEqual(cursor["op"], "cursor")
+
+    def test_cursor_returns_later_changes_and_deletions(self):
+        """Test that the next read only has the blogs saved or deleted after the cursor"""
+        cursor = self.read_feed()[-1]["cursor"]
+        self.blogs[0].title = "Renamed"
+        self.blogs[0].save()
+        deleted_pk = self.blogs[1].pk
+        self.blogs[1].delete()
+
+        *changes, next_cursor = self.read_feed(cursor)
+        self.assertEqual(
+            [(change["op"], change["id"]) for change in changes],
+            [("upsert", self.blogs[0].pk), ("delete", deleted_pk)],
+        )
+        self.assertEqual(changes[0]["title"], "Renamed")
+        self.assertGreater(next_cursor["cursor"], cursor)
+        self.assertEqual(self.read_feed(next_cursor["cursor"])[:-1], [])
+
+    @override_settings(BLOG_CHANGE_FEED_SETTLE_SECONDS=60)
+    def test_recent_changes_wait_for_the_next_read(self):
+        """Test that changes younger than the settle window are left for the next read"""
+        self.assertEqual(len(self.read_feed()), 1)
+
+    def test_staff_only(self):
+        """Test that non-staff users cannot read the feed and bad cursors are rejected"""
+        self.assertEqual(self.client.get(self.url, {"since": "yesterday"}).status_code, 400)
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_management_command(self):
+        """Test that blog_changes writes the same feed to a file"""
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        Blog.objects.filter(pk=self.blogs[0].pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        BlogTombstone.objects.create(blog_id=999)
+        path = os.path.join(tempfile.mkdtemp(), "changes.ndjson")
+        try:
+            call_command("blog_changes", "--since", since, "--output", path)
+            with open(path) as file:
+                changes = [json.loads(line) for line in file]
+        finally:
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
+        self.assertEqual(
+            [(change["op"], change.get("id")) for change in changes[:-1]],
+            [("upsert", self.blogs[1].pk), ("upsert", self.blogs[2].pk), ("delete", 999)],
+        )
@@ -0,0 +1,87 @@
+from django.test import TestCase, Client
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from ..benchmark import datatable_params
+from ..models import Blog
+
+
+class BlogDatatablePaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author@test.com",
+            email="author@test.com",
+            password="testpassword",
+            first_name="Author",
+            last_name="User",
+        )
+        # Duplicate titles make sure ties are broken on id
+        for index in range(8):
+            Blog.objects.create(
+                title=f"Blog {index // 2}",
+                content=f"Content {index}",
+                image="uploads/test_image.jpg",
+                category="python",
+                author=self.user,
+                editor=self.user,
+                publisher=self.user,
+                is_published=True,
+            )
+
+        self.client = Client()
+        self.client.login(username="author@test.com", password="testpassword")
+
+    def fetch(self, start, order_column=0, direction="asc", cursor=None):
+        params = datatable_params(start, order_column, direction, length=3, cursor=cursor)
+        response = self.client.get(
+            reverse("blog:blog_ajax"), params, HTTP_ACCEPT="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def pks(self, data):
+        return [row["pk"] for row in data["data"]]
+
+    def test_cursor_pages_match_offset_pages(self):
+        """Test that seeking with the cursor returns the same rows as OFFSET"""
+        for order_column, direction in [(0, "asc"), (1, "asc"), (1, "desc")]:
+            first = self.fetch(0, order_column, direction)
+            by_offset = self.fetch(3, order_column, direction)
+            with CaptureQueriesContext(connection) as queries:
+                by_cursor = self.fetch(3, order_column, direction, first["next_cursor"])
+            self.assertFalse(any("OFFSET" in q["sql"] for q in queries.captured_queries))
+            self.assertEqual(self.pks(by_cursor), self.pks(by_offset))
+            self.assertEqual(by_cursor["recordsFiltered"], 8)
+
+    def test_cursor_for_other_query_is_ignored(self):
+        """Test that a cursor issued for another ordering falls back to OFFSET"""
+        first = self.fetch(0, 1, "desc")
+        by_offset = self.fetch(3, 0, "asc")
+        by_cursor = self.fetch(3, 0, "asc", first["next_cursor"])
+        self.assertEqual(self.pks(by_cursor), self.pks(by_offset))
+
+    def test_count_is_cached_between_draws(self):
+        """Test that the row count is reused until a blog changes"""
+        self.fetch(0)
+        Blog.objects.filter(pk=Blog.objects.first().pk).update(is_published=False)
+        self.assertEqual(self.fetch(0)["recordsTotal"], 8)
+
+        Blog.objects.first().save()
+        self.assertEqual(self.fetch(0)["recordsTotal"], 7)
+
+    def test_rows_carry_server_side_excerpt(self):
+        """Test that rows send a clipped excerpt instead of the full content"""
+        blog = Blog.objects.get(content="Content 0")
+        blog.content = "x" * 5000
+        blog.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.fetch(0)
+        row = next(row for row in data["data"] if row["pk"] == str(blog.pk))
+        self.assertEqual(row["excerpt"], "x" * 100 + "...")
+        self.assertNotIn("content", row)
+        # The full column is only ever read through SUBSTR()
+        for query in queries.captured_queries:
+            sql = query["sql"].replace('SUBSTR("blog_app_blog"."content"', "")
+            self.assertNotIn('"blog_app_blog"."content"', sql)
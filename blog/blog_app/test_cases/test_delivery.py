@@ -0,0 +1,81 @@
+import time
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from ..delivery import TokenBucket, backoff_delay
+from ..models import FailedEmail, OutboxEmail
+from ..tasks import drain_outbox
+from .. import outbox
+
+
+class DeliveryTest(TestCase):
+    def test_token_bucket_limits_the_rate(self):
+        """Test that the bucket allows its burst at once and then `rate` per second"""
+        bucket = TokenBucket(rate=100, capacity=5)
+        started = time.monotonic()
+        waits = [bucket.acquire() for _ in range(15)]
+        self.assertEqual(waits[:5], [0.0] * 5)
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    @override_settings(BLOG_EMAIL_BACKOFF_BASE=30, BLOG_EMAIL_BACKOFF_MAX=3600)
+    def test_backoff_grows_to_the_cap(self):
+        """Test that the jittered backoff stays under an exponential, capped ceiling"""
+        for attempts, ceiling in [(1, 30), (2, 60), (4, 240), (20, 3600)]:
+            delays = [backoff_delay(attempts) for _ in range(50)]
+            self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+        self.assertGreater(max(backoff_delay(20) for _ in range(50)), 240)
+
+    @override_settings(BLOG_EMAIL_MAX_ATTEMPTS=3)
+    @mock.patch("blog_app.tasks.drain_outbox.apply_async")
+    def test_drain_dead_letters_after_retries(self, apply_async):
+        """Test that the drain retries a failing email and stores it once out of attempts"""
+        with self.captureOnCommitCallbacks(execute=True):
+            outbox.enqueue("Subject", "Body", "from@test.com", ["to@test.com"])
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("SMTP down"),
+        ) as send_messages:
+            for _ in range(3):
+                OutboxEmail.objects.update(next_attempt_at=None)
+                drain_outbox.apply()
+        self.assertEqual(send_messages.call_count, 3)
+        self.assertFalse(OutboxEmail.objects.exists())
+        failed = FailedEmail.objects.get()
+        self.assertEqual(failed.recipients, ["to@test.com"])
+        self.assertEqual(failed.attempts, 3)
+        self.assertIn("SMTP down", failed.error)
+
+    @override_settings(BLOG_EMAIL_MAX_ATTEMPTS=2)
+    def test_outbox_row_is_dead_lettered(self):
+        """Test that an outbox row out of attempts moves to FailedEmail"""
+        outbox.enqueue("Blog Post Updated", "Body", "from@test.com", ["author@test.com"])
+        for _ in range(2):
+            OutboxEmail.objects.update(next_attempt_at=None)
+            retry_at = outbox.release(outbox.claim_pending(10), "SMTP down")
+        self.assertIsNone(retry_at)
+        self.assertFalse(OutboxEmail.objects.exists())
+        failed = FailedEmail.objects.get()
+        self.assertEqual((failed.attempts, failed.error), (2, "SMTP down"))
+
+    def test_replay_requeues_failed_emails(self):
+        """Test that replay_failed_emails writes the emails back to the outbox once"""
+        FailedEmail.objects.create(
+            subject="Blog Post Updated",
+            message="Body",
+            from_email="from@test.com",
+            recipients=["author@test.com", "editor@test.com"],
+            error="SMTP down",
+            attempts=6,
+        )
+        call_command("replay_failed_emails", "--all", "--dry-run", stdout=StringIO())
+        self.assertFalse(OutboxEmail.objects.exists())
+
+        call_command("replay_failed_emails", "--all", stdout=StringIO())
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list("recipient", flat=True)),
+            ["author@test.com", "editor@test.com"],
+        )
+        self.assertIsNotNone(FailedEmail.objects.get().replayed_at)
+        call_command("replay_failed_emails", "--all", stdout=StringIO())
+        self.assertEqual(OutboxEmail.objects.count(), 2)
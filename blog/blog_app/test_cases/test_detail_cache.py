@@ -0,0 +1,67 @@
+from django.test import TestCase, Client
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth.models import User
+from ..models import Blog
+
+
+class BlogDetailCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="author@test.com",
+            email="author@test.com",
+            password="testpassword",
+        )
+        self.blog = Blog.objects.create(
+            title="cached blog",
+            content="Original content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+        )
+        self.url = reverse("blog:detail", args=[self.blog.pk])
+
+        self.client = Client()
+        self.client.login(username="author@test.com", password="testpassword")
+
+    def test_repeat_view_is_served_from_cache(self):
+        """Test that a repeat view is served from the cache without loading the blog"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(3):
+            # session, user and the updated_at lookup
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+        self.assertContains(second, "Cached Blog")
+
+    def test_conditional_get_returns_not_modified(self):
+        """Test that matching ETag and Last-Modified validators get a 304"""
+        response = self.client.get(self.url)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304
+        )
+        self.assertEqual(
+            self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            ).status_code,
+            304,
+        )
+
+    def test_save_invalidates_cached_page(self):
+        """Test that saving a blog changes its ETag and re-renders the page"""
+        etag = self.client.get(self.url)["ETag"]
+        self.blog.content = "Edited content"
+        self.blog.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Edited content")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deleted_blog_returns_not_found(self):
+        """Test that a deleted blog is no longer served from the cache"""
+        self.client.get(self.url)
+        self.blog.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
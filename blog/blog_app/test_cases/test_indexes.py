@@ -0,0 +1,31 @@
+from django.test import TestCase
+from django.utils import timezone
+from ..models import Blog
+
+
+class BlogIndexUsageTest(TestCase):
+    """The hot Blog queries must be served by the indexes from migration 0004"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_scheduled_publish_query(self):
+        """Test that publish_scheduled_blogs uses the partial due index"""
+        queryset = Blog.objects.filter(is_published=False, publish_at__lte=timezone.now())
+        self.assertUsesIndex(queryset, "blog_due_publish_idx")
+
+    def test_daily_digest_query(self):
+        """Test that daily_mail_users reads the latest blogs from the index"""
+        queryset = Blog.objects.filter(is_published=True).order_by("-created_at")[:3]
+        self.assertUsesIndex(queryset, "blog_published_created_idx")
+
+    def test_listing_title_order(self):
+        """Test that the DataTable title ordering is read in index order"""
+        queryset = Blog.objects.filter(is_published=True).order_by("title", "pk")[:10]
+        self.assertUsesIndex(queryset, "blog_published_title_idx")
+
+    def test_listing_category_order(self):
+        """Test that the DataTable category ordering is read in index order"""
+        queryset = Blog.objects.filter(is_published=True).order_by("-category", "-pk")[:10]
+        self.assertUsesIndex(queryset, "blog_published_category_idx")
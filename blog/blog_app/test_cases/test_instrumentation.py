@@ -0,0 +1,85 @@
+import time
+from unittest import mock
+from django.test import TestCase, Client, RequestFactory
+from django.template.response import SimpleTemplateResponse
+from django.http import HttpResponse
+from django.urls import reverse
+from django.contrib.auth.models import User
+from ..instrumentation import InstrumentationMiddleware, registry
+from ..models import Blog
+
+
+class InstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(
+            username="author@test.com",
+            email="author@test.com",
+            password="testpassword",
+        )
+        self.blog = Blog.objects.create(
+            title="Measured blog",
+            content="Content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+            is_published=True,
+        )
+        self.client = Client()
+        self.client.login(username="author@test.com", password="testpassword")
+
+    def test_server_timing_header(self):
+        """Test that responses report their query count, DB, render and total time"""
+        response = self.client.get(reverse("blog:detail", args=[self.blog.pk]))
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("render;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+        metrics = registry.snapshot()["blog:detail"]
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["queries"], 0)
+        self.assertGreater(metrics["render_duration"], 0)
+        self.assertEqual(metrics["response_bytes"], len(response.content))
+
+    def test_render_in_view_is_measured(self):
+        """Test that the detail page, rendered inside the view to be cached, reports its render time"""
+        render = SimpleTemplateResponse.render
+
+        def slow_render(response):
+            time.sleep(0.05)
+            return render(response)
+
+        with mock.patch.object(SimpleTemplateResponse, "render", slow_render):
+            self.client.get(reverse("blog:detail", args=[self.blog.pk]))
+        self.assertGreaterEqual(registry.snapshot()["blog:detail"]["render_duration"], 0.05)
+
+    def test_duplicate_queries_are_reported(self):
+        """Test that a query repeated in one request is flagged as an N+1"""
+
+        def n_plus_one(request):
+            for blog_id in range(4):
+                Blog.objects.filter(pk=blog_id).exists()
+            return HttpResponse("ok")
+
+        response = InstrumentationMiddleware(n_plus_one)(RequestFactory().get("/"))
+        self.assertIn('dup;desc="3 duplicated queries"', response["Server-Timing"])
+        self.assertEqual(registry.snapshot()["unresolved"]["duplicate_queries"], 3)
+
+    def test_metrics_endpoint(self):
+        """Test that the metrics are exported in the Prometheus text format"""
+        self.client.get(reverse("blog:detail", args=[self.blog.pk]))
+        response = self.client.get(reverse("blog:metrics"))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('blog_http_requests_total{view="blog:detail"} 1', body)
+        self.assertIn('blog_http_request_duration_seconds_count{view="blog:detail"} 1', body)
+        self.assertIn("# TYPE blog_db_queries_total counter", body)
+
+        self.client.logout()
+        self.assertEqual(
+            self.client.get(reverse("blog:metrics"), REMOTE_ADDR="10.0.0.9").status_code,
+            403,
+        )
@@ -0,0 +1,118 @@
+from unittest import mock
+from django.core import mail
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from ..models import OutboxEmail
+from ..tasks import drain_outbox
+from .. import outbox
+
+
+class OutboxTest(TestCase):
+    def enqueue(self, subject, recipients):
+        outbox.enqueue(
+            subject=subject,
+            message=f"{subject} body",
+            from_email="noreply@blogapp.com",
+            recipients=recipients,
+        )
+
+    def test_rolled_back_write_sends_nothing(self):
+        """Test that notifications are discarded with a rolled back transaction"""
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.enqueue("Blog Post Updated", ["author@test.com"])
+                raise RuntimeError("blog change failed")
+        self.assertEqual(OutboxEmail.objects.count(), 0)
+
+    @mock.patch("blog_app.tasks.drain_outbox.apply_async")
+    def test_drain_is_scheduled_once_after_commit(self, apply_async):
+        """Test that several notifications schedule a single delayed drain"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enqueue("First", ["author@test.com"])
+            self.enqueue("Second", ["editor@test.com"])
+            apply_async.assert_not_called()
+        apply_async.assert_called_once_with(countdown=outbox.DRAIN_DELAY)
+
+    @mock.patch("blog_app.tasks.drain_outbox.apply_async")
+    def test_pending_drain_is_shared_across_processes(self, apply_async):
+        """Test that the pending drain is kept in the database, not in a local cache"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enqueue("First", ["author@test.com"])
+        # Another process: nothing in its cache
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enqueue("Second", ["editor@test.com"])
+        apply_async.assert_called_once()
+
+        # Once the drain starts, new notifications schedule the next one
+        drain_outbox()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enqueue("Third", ["editor@test.com"])
+        self.assertEqual(apply_async.call_count, 2)
+
+    @mock.patch("blog_app.tasks.drain_outbox.apply_async")
+    def test_drain_reschedules_rows_waiting_on_backoff(self, apply_async):
+        """Test that a drain for new rows still schedules the retry of rows in backoff"""
+        self.enqueue("Failed earlier", ["author@test.com"])
+        OutboxEmail.objects.update(
+            attempts=1, next_attempt_at=timezone.now() + timedelta(seconds=120)
+        )
+        # A new notification took the pending drain before the retry could schedule one
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enqueue("New", ["editor@test.com"])
+        apply_async.assert_called_once_with(countdown=outbox.DRAIN_DELAY)
+
+        self.assertEqual(drain_outbox(), 1)
+        self.assertEqual(apply_async.call_count, 2)
+        self.assertAlmostEqual(apply_async.call_args.kwargs["countdown"], 120, delta=5)
+
+    def test_rows_of_a_dead_drain_are_claimed_again(self):
+        """Test that claimed rows are only marked sent once sent, and reclaimed after the lease"""
+        self.enqueue("Blog Post Updated", ["author@test.com"])
+        claimed = outbox.claim_pending(10)
+        # The drain dies before sending: the row is not sent, and still leased
+        self.assertIsNone(OutboxEmail.objects.get().sent_at)
+        self.assertEqual(outbox.claim_pending(10), [])
+
+        OutboxEmail.objects.update(
+            claimed_at=timezone.now() - timedelta(seconds=outbox.CLAIM_LEASE + 1)
+        )
+        self.assertEqual(outbox.claim_pending(10), claimed)
+        OutboxEmail.objects.update(claimed_at=None)
+        self.assertEqual(drain_outbox(), 1)
+        self.assertIsNotNone(OutboxEmail.objects.get().sent_at)
+
+    def test_drain_coalesces_per_recipient(self):
+        """Test that a recipient gets one email for all their pending notifications"""
+        self.enqueue("Blog Post Updated", ["author@test.com", "publisher@test.com"])
+        self.enqueue("Blog Post Deleted", ["author@test.com", "author@test.com"])
+
+        self.assertEqual(drain_outbox(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        emails = {email.to[0]: email for email in mail.outbox}
+        self.assertEqual(emails["author@test.com"].subject, "2 blog notifications")
+        self.assertIn("Blog Post Deleted body", emails["author@test.com"].body)
+        self.assertEqual(emails["publisher@test.com"].subject, "Blog Post Updated")
+        self.assertFalse(OutboxEmail.objects.filter(sent_at__isnull=True).exists())
+
+        self.assertEqual(drain_outbox(), 0)
+
+    @mock.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=ConnectionError("SMTP down"),
+    )
+    @mock.patch("blog_app.tasks.drain_outbox.apply_async")
+    def test_failed_send_is_kept_for_next_drain(self, apply_async, send_messages):
+        """Test that rows which fail to send stay pending, with a drain scheduled after the backoff"""
+        self.enqueue("Blog Post Updated", ["author@test.com"])
+        self.assertEqual(drain_outbox(), 0)
+        self.assertEqual(OutboxEmail.objects.filter(sent_at__isnull=True).count(), 1)
+        row = OutboxEmail.objects.get()
+        self.assertEqual(row.attempts, 1)
+        self.assertIsNotNone(row.next_attempt_at)
+        apply_async.assert_called_once()
+        # Not claimed again before its backoff expires
+        self.assertEqual(outbox.claim_pending(10), [])
@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from io import BytesIO
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth.models import User
+from django.template import Context, Template
+from PIL import Image
+from ..models import Blog
+from ..tasks import generate_image_renditions
+
+
+def jpeg_upload(name, width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "teal").save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+class ImageRenditionsTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        user = User.objects.create_user(username="author@test.com", password="testpassword")
+        self.blog = Blog.objects.create(
+            title="Renditions",
+            content="Content",
+            image=jpeg_upload("wide.jpg", 2000, 1000),
+            category="python",
+            author=user,
+            editor=user,
+            publisher=user,
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_task_builds_fixed_width_renditions(self):
+        """Test that WebP and JPEG copies are stored at every fixed width"""
+        generate_image_renditions(self.blog.pk, self.blog.image.name)
+        self.blog.refresh_from_db()
+
+        renditions = self.blog.image_renditions
+        self.assertEqual(renditions["source"], self.blog.image.name)
+        for extension in ("webp", "jpg"):
+            self.assertEqual(sorted(renditions[extension], key=int), ["480", "960", "1600"])
+        with self.blog.image.storage.open(renditions["webp"]["960"]) as file:
+            image = Image.open(file)
+            self.assertEqual((image.format, image.size), ("WEBP", (960, 480)))
+
+    def test_task_for_replaced_image_is_noop(self):
+        """Test that a task queued for a replaced image stores nothing"""
+        old_name = self.blog.image.name
+        self.blog.image = jpeg_upload("replacement.jpg", 800, 600)
+        self.blog.save()
+
+        self.assertIsNone(generate_image_renditions(self.blog.pk, old_name))
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.image_renditions, {})
+
+    def test_masthead_style_uses_renditions(self):
+        """Test that the masthead tag falls back to the original, then serves renditions"""
+        template = Template("{% load blog_images %}{% masthead_style blog %}")
+        self.assertIn(self.blog.image.url, template.render(Context({"blog": self.blog})))
+
+        generate_image_renditions(self.blog.pk, self.blog.image.name)
+        self.blog.refresh_from_db()
+        html = template.render(Context({"blog": self.blog}))
+        self.assertIn("image-set(", html)
+        self.assertIn('type("image/webp")', html)
+        self.assertIn("@media (min-width: 961px)", html)
+        self.assertNotIn(self.blog.image.url + '"', html)
@@ -0,0 +1,80 @@
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from ..models import Blog
+from ..routers import PIN_SESSION_KEY, REPLICA_ALIAS, ReadReplicaRouter, replica_reads
+
+
+@override_settings(BLOG_READ_REPLICA=True)
+class ReadReplicaRoutingTest(TransactionTestCase):
+    # The test mirror is a second connection: it only sees committed rows
+    databases = {"default", REPLICA_ALIAS}
+    serialized_rollback = True
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author@test.com", email="author@test.com", password="testpassword"
+        )
+        self.blog = Blog.objects.create(
+            title="Replicated",
+            content="Content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+        )
+        self.client = Client()
+        self.client.login(username="author@test.com", password="testpassword")
+
+    def test_router_only_reads_from_replica_in_block(self):
+        """Test that reads use the replica inside replica_reads() and writes never do"""
+        router = ReadReplicaRouter()
+        self.assertIsNone(router.db_for_read(Blog))
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Blog), REPLICA_ALIAS)
+            self.assertIsNone(router.db_for_write(Blog))
+        with override_settings(BLOG_READ_REPLICA=False), replica_reads():
+            self.assertIsNone(router.db_for_read(Blog))
+
+    def test_detail_view_reads_from_replica(self):
+        """Test that the blog detail query is sent to the replica"""
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as queries:
+            response = self.client.get(reverse("blog:detail", args=[self.blog.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('FROM "blog_app_blog"' in q["sql"] for q in queries))
+
+    def test_user_who_wrote_reads_from_primary(self):
+        """Test that a write pins the user to the primary for their next reads"""
+        self.client.post(reverse("blog:logout"))
+        self.client.post(
+            reverse("blog:login"), {"email": "author@test.com", "password": "testpassword"}
+        )
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as queries:
+            self.client.get(reverse("blog:detail", args=[self.blog.pk]))
+        self.assertEqual(len(queries), 0)
+
+
+class PrimaryPinMiddlewareTest(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username="author@test.com", email="author@test.com", password="testpassword"
+        )
+
+    @override_settings(DEBUG=True)
+    def test_asgi_handler_does_not_adapt_middleware(self):
+        """Test that loading the middleware for ASGI runs none of it in a thread"""
+        # Django only logs the adaptations in DEBUG
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+
+    async def test_async_write_pins_user(self):
+        """Test that a successful write served under ASGI pins the user to the primary"""
+        await self.async_client.post(
+            reverse("blog:login"), {"email": "author@test.com", "password": "testpassword"}
+        )
+        session = await self.async_client.asession()
+        self.assertIsNotNone(await session.aget(PIN_SESSION_KEY))
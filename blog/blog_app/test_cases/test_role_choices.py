@@ -0,0 +1,103 @@
+import time
+from unittest import mock
+from django.core import checks
+from django.test import TestCase, Client, override_settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth.models import User, Group
+from ..form import BlogForm
+from .. import roles
+
+
+class RoleChoicesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author_group = Group.objects.get(name="Author")
+        self.authors = []
+        for index in range(3):
+            user = User.objects.create_user(
+                username=f"author{index}@test.com", password="testpassword"
+            )
+            user.groups.add(self.author_group)
+            self.authors.append(user)
+
+    def test_choices_are_served_from_cache(self):
+        """Test that rendering the role selects runs no query once cached"""
+        str(BlogForm()["author"]) + str(BlogForm()["editor"])
+        with self.assertNumQueries(0):
+            html = str(BlogForm()["author"]) + str(BlogForm()["editor"])
+        self.assertIn("author2@test.com", html)
+
+    def test_membership_change_refreshes_choices(self):
+        """Test that adding or renaming a member updates the cached labels"""
+        str(BlogForm()["author"])
+        newcomer = User.objects.create_user(username="newcomer@test.com", password="x")
+        newcomer.groups.add(self.author_group)
+        self.authors[0].username = "renamed@test.com"
+        self.authors[0].save()
+
+        html = str(BlogForm()["author"])
+        self.assertIn("newcomer@test.com", html)
+        self.assertIn("renamed@test.com", html)
+
+    def test_choices_expire_in_other_processes(self):
+        """Test that a change made by another process shows up once the cached list expires"""
+        str(BlogForm()["author"])
+        # Another process: its invalidation does not reach our cache
+        with mock.patch("blog_app.roles.cache"):
+            self.authors[0].username = "renamed@test.com"
+            self.authors[0].save()
+        self.assertNotIn("renamed@test.com", str(BlogForm()["author"]))
+
+        later = time.time() + roles.CHOICES_TIMEOUT + 1
+        with mock.patch("time.time", return_value=later):
+            self.assertIn("renamed@test.com", str(BlogForm()["author"]))
+
+    def test_submitted_member_is_validated(self):
+        """Test that only members of the role group are accepted"""
+        outsider = User.objects.create_user(username="outsider@test.com", password="x")
+        form = BlogForm(data={"author": outsider.pk})
+        form.is_valid()
+        self.assertIn("author", form.errors)
+        form = BlogForm(data={"author": self.authors[1].pk})
+        form.is_valid()
+        self.assertNotIn("author", form.errors)
+
+    def test_member_added_by_another_process_is_accepted(self):
+        """Test that a new member validates while this process still caches the old list"""
+        str(BlogForm()["author"])
+        # Another process: its invalidation does not reach our cache
+        with mock.patch("blog_app.roles.cache"):
+            newcomer = User.objects.create_user(username="newcomer@test.com", password="x")
+            newcomer.groups.add(self.author_group)
+        self.assertNotIn("newcomer@test.com", str(BlogForm()["author"]))
+        form = BlogForm(data={"author": newcomer.pk})
+        form.is_valid()
+        self.assertNotIn("author", form.errors)
+
+    def test_deploy_check_requires_shared_cache(self):
+        """Test that check --deploy warns about a per-process cache"""
+        ids = [message.id for message in checks.run_checks(include_deployment_checks=True)]
+        self.assertIn("blog_app.W001", ids)
+        redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with override_settings(CACHES=redis):
+            ids = [message.id for message in checks.run_checks(include_deployment_checks=True)]
+        self.assertNotIn("blog_app.W001", ids)
+
+    @override_settings(BLOG_ROLE_CHOICES_LIMIT=2)
+    def test_large_group_uses_autocomplete(self):
+        """Test that a large group renders the selected user and an autocomplete URL"""
+        html = str(BlogForm(initial={"author": self.authors[1].pk})["author"])
+        self.assertIn(reverse("blog:role_autocomplete", args=["Author"]), html)
+        self.assertIn("author1@test.com", html)
+        self.assertNotIn("author2@test.com", html)
+
+        client = Client()
+        client.login(username="author0@test.com", password="testpassword")
+        response = client.get(
+            reverse("blog:role_autocomplete", args=["Author"]), {"q": "author2"}
+        )
+        self.assertEqual(
+            response.json(),
+            {"results": [{"id": self.authors[2].pk, "text": "author2@test.com"}]},
+        )
@@ -0,0 +1,46 @@
+from django.test import TestCase, Client
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User, Group
+
+
+class RoleCacheTest(TestCase):
+    def setUp(self):
+        self.author_group = Group.objects.get(name="Author")
+        self.user = User.objects.create_user(
+            username="author@test.com",
+            email="author@test.com",
+            password="testpassword",
+        )
+        self.user.groups.add(self.author_group)
+
+        self.client = Client()
+        self.client.login(username="author@test.com", password="testpassword")
+        self.url = reverse("blog:blog_create")
+
+    def role_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in queries if 'SELECT "auth_group"."name"' in q["sql"]]
+
+    def test_roles_are_resolved_once_per_request(self):
+        """Test that the permission check and get_form share one group query"""
+        self.assertEqual(len(self.role_queries()), 1)
+        self.assertEqual(len(self.role_queries()), 1)
+
+    def test_membership_change_invalidates_roles(self):
+        """Test that removing a user from their group revokes access"""
+        self.role_queries()
+        self.user.groups.remove(self.author_group)
+        response = self.client.get(self.url, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 403)
+
+    def test_group_rename_invalidates_roles(self):
+        """Test that renaming a group is seen by sessions that cached it"""
+        self.role_queries()
+        self.author_group.name = "Reader"
+        self.author_group.save()
+        response = self.client.get(self.url, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,111 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from ..models import Blog
+from ..benchmark import datatable_params
+from .. import search
+
+
+class BlogSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author@test.com",
+            email="author@test.com",
+            password="testpassword",
+            first_name="Ada",
+            last_name="Lovelace",
+        )
+        self.django_blog = self.create_blog(
+            "Django signals", "Signals decouple senders from receivers.", "django"
+        )
+        self.scrapy_blog = self.create_blog(
+            "Scrapy spiders", "Crawling pages with spiders and pipelines.", "scrapy"
+        )
+        self.draft_blog = self.create_blog(
+            "Django drafts", "Unpublished django content.", "django", is_published=False
+        )
+
+        self.client = Client()
+        self.client.login(username="author@test.com", password="testpassword")
+
+    def create_blog(self, title, content, category, is_published=True):
+        return Blog.objects.create(
+            title=title,
+            content=content,
+            image="uploads/test_image.jpg",
+            category=category,
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+            is_published=is_published,
+        )
+
+    def search_ids(self, value):
+        return list(
+            search.search(Blog.objects.all(), value).values_list("id", flat=True)
+        )
+
+    def test_only_published_blogs_are_indexed(self):
+        """Test that drafts are not searchable"""
+        self.assertEqual(self.search_ids("django"), [self.django_blog.id])
+
+    def test_prefix_and_author_match(self):
+        """Test prefix matching and author name matching"""
+        self.assertEqual(self.search_ids("spid"), [self.scrapy_blog.id])
+        self.assertEqual(len(self.search_ids("lovelace")), 2)
+
+    def test_index_follows_save_and_delete(self):
+        """Test that saves and deletes keep the index current"""
+        self.draft_blog.is_published = True
+        self.draft_blog.save()
+        self.assertIn(self.draft_blog.id, self.search_ids("drafts"))
+
+        self.django_blog.is_published = False
+        self.django_blog.save()
+        self.assertNotIn(self.django_blog.id, self.search_ids("signals"))
+
+        self.scrapy_blog.delete()
+        self.assertEqual(self.search_ids("spiders"), [])
+
+    def test_punctuation_is_ignored(self):
+        """Test that FTS syntax characters in the search box are harmless"""
+        self.assertEqual(self.search_ids('"django* ('), [self.django_blog.id])
+        self.assertEqual(self.search_ids("!!!"), [])
+
+    def test_ajax_search(self):
+        """Test that the DataTable endpoint searches through the index"""
+        response = self.client.get(
+            reverse("blog:blog_ajax"),
+            {"draw": 1, "start": 0, "length": 10, "search[value]": "pipelines"},
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["recordsFiltered"], 1)
+        self.assertEqual(data["data"][0]["title"], "Scrapy spiders")
+
+    def test_match_runs_once(self):
+        """Test that ranking reuses the full-text match instead of running it per row"""
+        self.create_blog("Django forms", "Forms and django validation.", "django")
+        ranked = search.search(Blog.objects.all(), "django").order_by("-search_rank")
+        sql = str(ranked.query).upper()
+        self.assertEqual(sql.count("MATCH") + sql.count("@@"), 1)
+        self.assertEqual(len(ranked), 2)
+        # Title matches weigh more than content matches
+        self.assertEqual(ranked[0].title, "Django forms")
+
+    def test_ajax_search_ordering(self):
+        """Test that search results are ranked until a column is sorted, then follow that column"""
+        self.create_blog("Async views", "Serving django views under ASGI.", "python")
+
+        def titles(**order):
+            response = self.client.get(
+                reverse("blog:blog_ajax"),
+                datatable_params(search_value="django", **order),
+                HTTP_ACCEPT="application/json",
+            )
+            return [row["title"] for row in response.json()["data"]]
+
+        # "Django signals" matches in its title, which weighs more than content
+        self.assertEqual(titles(order_column=None), ["Django signals", "Async views"])
+        self.assertEqual(titles(order_column=1), ["Async views", "Django signals"])
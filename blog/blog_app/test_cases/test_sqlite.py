@@ -0,0 +1,28 @@
+import json
+from io import StringIO
+from unittest import skipUnless
+from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite tuning only")
+class SqliteTuningTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_connection_pragmas_are_applied(self):
+        """Test that new connections get the busy timeout and relaxed fsync"""
+        self.assertEqual(self.pragma("busy_timeout"), 20000)
+        # 1 is NORMAL
+        self.assertEqual(self.pragma("synchronous"), 1)
+
+    def test_benchmark_reports_both_profiles(self):
+        """Test that bench_sqlite compares the baseline and tuned profiles"""
+        out = StringIO()
+        call_command("bench_sqlite", "--seconds", "0.2", "--threads", "2", "--rows", "50", stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(set(results), {"baseline", "tuned"})
+        self.assertGreater(results["tuned"]["reads"], 0)
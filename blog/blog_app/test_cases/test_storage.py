@@ -0,0 +1,95 @@
+import os
+import time
+import shutil
+import tempfile
+from io import StringIO
+from django.test import TestCase, override_settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from ..models import Blog
+
+
+@override_settings(BLOG_MEDIA_RELEASE_GRACE_SECONDS=0)
+class ContentAddressedStorageTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username="author@test.com", password="testpassword")
+        self.storage = Blog._meta.get_field("image").storage
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def create_blog(self, filename, content):
+        return Blog.objects.create(
+            title="Stored",
+            content="Content",
+            image=SimpleUploadedFile(filename, content, content_type="image/jpeg"),
+            category="python",
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+        )
+
+    def uploads(self):
+        return sorted(os.listdir(os.path.join(self.media_root, "uploads")))
+
+    def test_identical_uploads_are_stored_once(self):
+        """Test that the same content under two names maps to one file"""
+        first = self.create_blog("first.JPG", b"same bytes")
+        second = self.create_blog("second.jpg", b"same bytes")
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(first.image.name, r"^uploads/[0-9a-f]{64}\.jpg$")
+        self.assertEqual(len(self.uploads()), 1)
+
+    def test_file_is_released_with_its_last_reference(self):
+        """Test that a shared file is deleted only when the last blog goes"""
+        first = self.create_blog("first.jpg", b"shared")
+        second = self.create_blog("second.jpg", b"shared")
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(self.storage.exists(second.image.name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertEqual(self.uploads(), [])
+
+    @override_settings(BLOG_MEDIA_RELEASE_GRACE_SECONDS=600)
+    def test_reused_file_is_not_released_during_grace(self):
+        """Test that a file just re-used by another upload survives the release of its last blog"""
+        blog = self.create_blog("first.jpg", b"shared")
+        path = self.storage.path(blog.image.name)
+        os.utime(path, (time.time() - 3600, time.time() - 3600))
+        # An upload of the same bytes, whose blog has not committed yet
+        self.assertEqual(
+            self.storage.save("uploads/again.jpg", ContentFile(b"shared")), blog.image.name
+        )
+        self.assertGreater(os.path.getmtime(path), time.time() - 60)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            blog.delete()
+        self.assertTrue(self.storage.exists(blog.image.name))
+
+    def test_replaced_image_is_released(self):
+        """Test that replacing a blog's image deletes the previous file"""
+        blog = Blog.objects.get(pk=self.create_blog("old.jpg", b"old").pk)
+        old_name = blog.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            blog.image = SimpleUploadedFile("new.jpg", b"new", content_type="image/jpeg")
+            blog.save()
+        self.assertFalse(self.storage.exists(old_name))
+        self.assertTrue(self.storage.exists(blog.image.name))
+
+    def test_gc_media_deletes_unreferenced_files(self):
+        """Test that the gc_media command keeps referenced files only"""
+        blog = self.create_blog("kept.jpg", b"kept")
+        orphan = self.storage.save("uploads/orphan.jpg", ContentFile(b"orphan"))
+
+        out = StringIO()
+        call_command("gc_media", "--grace-minutes", "0", stdout=out)
+        self.assertIn("Deleted 1 unreferenced files", out.getvalue())
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertTrue(self.storage.exists(blog.image.name))
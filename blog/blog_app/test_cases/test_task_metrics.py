@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+from celery.app.task import Context
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from ..task_metrics import queue_lag, read_records
+from ..tasks import drain_outbox, send_daily_digest_batch
+
+
+class TaskMetricsTest(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "task_metrics.jsonl")
+        self.settings_override = override_settings(BLOG_TASK_METRICS_FILE=self.path)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+    def fail_digest(self):
+        # One retry, then a failure
+        with mock.patch(
+            "blog_app.tasks.get_connection", side_effect=OSError("SMTP down")
+        ), mock.patch.object(send_daily_digest_batch, "max_retries", 1):
+            send_daily_digest_batch.apply(args=[[], "👉 Latest blog"])
+
+    def test_finished_tasks_are_recorded(self):
+        """Test that each run records its task, outcome, runtime and exception"""
+        drain_outbox.apply()
+        self.fail_digest()
+
+        success, *digest_runs = read_records(self.path)
+        retry, failure = sorted(digest_runs, key=lambda record: record["state"] != "RETRY")
+        self.assertEqual(success["task"], "blog_app.tasks.drain_outbox")
+        self.assertEqual(success["state"], "SUCCESS")
+        self.assertGreaterEqual(success["runtime"], 0)
+        self.assertIsNone(success["exception"])
+        self.assertEqual(failure["state"], "FAILURE")
+        self.assertEqual(failure["exception"], OSError.__name__)
+        self.assertEqual(retry["exception"], OSError.__name__)
+
+    def test_queue_lag_counts_from_enqueue_or_eta(self):
+        """Test that the lag starts at enqueue time, or at the ETA of scheduled tasks"""
+        now = time.time()
+        self.assertEqual(queue_lag(Context(enqueued_at=now - 2, eta=None), now), 2)
+        eta = datetime.fromtimestamp(now - 0.5, dt_timezone.utc).isoformat()
+        self.assertEqual(queue_lag(Context(enqueued_at=now - 60, eta=eta), now), 0.5)
+        self.assertIsNone(queue_lag(Context(eta=None), now))
+
+    def test_report_summarizes_per_task(self):
+        """Test that task_report aggregates runs, failures and percentiles per task"""
+        for _ in range(3):
+            drain_outbox.apply()
+        self.fail_digest()
+
+        out = StringIO()
+        call_command("task_report", stdout=out)
+        report = json.loads(out.getvalue())
+        drain = report["tasks"]["blog_app.tasks.drain_outbox"]
+        self.assertEqual(drain["runs"], 3)
+        self.assertEqual(drain["failure_rate"], 0)
+        self.assertIsNotNone(drain["runtime_p95_ms"])
+        digest = report["tasks"]["blog_app.tasks.send_daily_digest_batch"]
+        self.assertEqual(digest["failed"], 1)
+        self.assertEqual(digest["retried"], 1)
+        self.assertEqual(digest["exceptions"], {"OSError": 2})
+        self.assertIn("peak_minute", report["busy_workers"])
+
+    def test_metrics_are_opt_in(self):
+        """Test that nothing is recorded or reported without BLOG_TASK_METRICS_FILE"""
+        with override_settings(BLOG_TASK_METRICS_FILE=""):
+            drain_outbox.apply()
+            with self.assertRaisesMessage(CommandError, "Task metrics are off"):
+                call_command("task_report", stdout=StringIO())
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,278 @@
+import itertools
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase
+from django.core import mail
+from django.db import transaction
+from django.contrib.auth.models import User
+from django.utils import timezone
+from ..models import Blog, FailedEmail, OutboxEmail
+from ..tasks import (
+    publish_scheduled_blogs,
+    claim_due_blogs,
+    publish_blog,
+    schedule_publish,
+    daily_mail_users,
+    send_daily_digest_batch,
+)
+from .. import search
+
+
+class PublishScheduledBlogsTest(TestCase):
+    def setUp(self):
+        self.author_user = User.objects.create_user(
+            username="author@test.com", email="author@test.com", password="testpassword"
+        )
+        self.editor_user = User.objects.create_user(
+            username="editor@test.com", email="editor@test.com", password="testpassword"
+        )
+        now = timezone.now()
+        self.due_blogs = [self.create_blog(f"Due {i}", now - timedelta(minutes=i)) for i in range(5)]
+        self.future_blog = self.create_blog("Future", now + timedelta(hours=2))
+
+    def create_blog(self, title, publish_at):
+        return Blog.objects.create(
+            title=title,
+            content="Test content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.author_user,
+            editor=self.editor_user,
+            publisher=self.author_user,
+            publish_at=publish_at,
+        )
+
+    def test_publishes_due_blogs_in_batches(self):
+        """Test that due blogs are published in batches with their notifications queued"""
+        published = publish_scheduled_blogs(batch_size=2)
+
+        self.assertEqual(published, 5)
+        self.assertEqual(Blog.objects.filter(is_published=True).count(), 5)
+        self.future_blog.refresh_from_db()
+        self.assertFalse(self.future_blog.is_published)
+        # One outbox row per blog and recipient (author and editor)
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list("recipient", flat=True).distinct()),
+            ["author@test.com", "editor@test.com"],
+        )
+        self.assertEqual(OutboxEmail.objects.count(), 10)
+        # Published blogs become searchable even though update() skips signals
+        self.assertEqual(
+            search.search(Blog.objects.all(), "due").count(), 5
+        )
+
+    def test_query_count_does_not_grow_with_batch(self):
+        """Test that a batch costs the same number of queries whatever its size"""
+        # Batch: select, claim update, joined select, index write, outbox insert; then the
+        # empty claim (each claim in its own savepoint) and the lookup of blogs due before
+        # the next sweep.
+        with self.assertNumQueries(11):
+            publish_scheduled_blogs(batch_size=100)
+
+    def test_updated_at_marks_publication(self):
+        """Test that publishing moves updated_at, so change feeds and ETags see it"""
+        before = {blog.pk: blog.updated_at for blog in self.due_blogs}
+        publish_scheduled_blogs()
+        for blog in Blog.objects.filter(pk__in=before):
+            self.assertGreater(blog.updated_at, before[blog.pk])
+
+    def test_each_batch_is_stamped_when_claimed(self):
+        """Test that later batches of a sweep get the time of their own claim, not of the sweep"""
+        started = timezone.now()
+        clock = (started + timedelta(seconds=10 * tick) for tick in itertools.count())
+        with mock.patch("django.utils.timezone.now", side_effect=lambda: next(clock)):
+            publish_scheduled_blogs(batch_size=2)
+        stamps = sorted(
+            set(Blog.objects.filter(is_published=True).values_list("updated_at", flat=True))
+        )
+        self.assertEqual(len(stamps), 3)
+        self.assertGreater(stamps[0], started)
+        self.assertGreaterEqual(stamps[-1] - stamps[0], timedelta(seconds=20))
+
+    def test_claims_are_disjoint(self):
+        """Test that two workers claiming at the same time never share a blog"""
+        now = timezone.now()
+        with transaction.atomic():
+            first = claim_due_blogs(now, 3)
+        with transaction.atomic():
+            second = claim_due_blogs(now, 3)
+        with transaction.atomic():
+            third = claim_due_blogs(now, 3)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(third, [])
+        self.assertFalse(set(first) & set(second))
+
+    def test_overlapping_runs_do_not_notify_twice(self):
+        """Test that a second run finds nothing left to publish or notify"""
+        self.assertEqual(publish_scheduled_blogs(), 5)
+        self.assertEqual(publish_scheduled_blogs(), 0)
+        self.assertEqual(OutboxEmail.objects.count(), 10)
+
+    def test_claim_skips_rows_taken_by_another_worker(self):
+        """Test that rows published between selection and claim are not claimed again"""
+        from .. import tasks
+
+        original = tasks._claim_candidates
+
+        def race(candidates, now):
+            # Another worker publishes the first candidate just before our UPDATE
+            Blog.objects.filter(id=candidates[0]).update(is_published=True)
+            return original(candidates, now)
+
+        with mock.patch("blog_app.tasks._claim_candidates", side_effect=race):
+            with transaction.atomic():
+                claimed = claim_due_blogs(timezone.now(), 5)
+        self.assertEqual(len(claimed), 4)
+
+
+class PublishBlogEtaTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author@test.com", email="author@test.com", password="testpassword"
+        )
+        self.blog = Blog.objects.create(
+            title="Scheduled",
+            content="Test content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+            publish_at=timezone.now() - timedelta(seconds=1),
+        )
+
+    def test_publishes_blog(self):
+        """Test that the ETA task publishes its blog and notifies once"""
+        self.assertEqual(publish_blog(self.blog.pk, self.blog.publish_at.isoformat()), 1)
+        self.assertEqual(publish_blog(self.blog.pk, self.blog.publish_at.isoformat()), 0)
+        self.blog.refresh_from_db()
+        self.assertTrue(self.blog.is_published)
+        # author, editor and publisher are the same user: one notification
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_stale_task_is_ignored(self):
+        """Test that a task scheduled for an old publish time does nothing"""
+        stale_publish_at = self.blog.publish_at - timedelta(minutes=10)
+        self.assertEqual(publish_blog(self.blog.pk, stale_publish_at.isoformat()), 0)
+        self.blog.refresh_from_db()
+        self.assertFalse(self.blog.is_published)
+
+    @mock.patch("blog_app.tasks.publish_blog.apply_async")
+    def test_schedule_publish_uses_eta(self, apply_async):
+        """Test that scheduling enqueues the task with an ETA after commit"""
+        self.blog.publish_at = timezone.now() + timedelta(minutes=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_publish(self.blog)
+        apply_async.assert_called_once_with(
+            (self.blog.pk, self.blog.publish_at.isoformat()), eta=self.blog.publish_at
+        )
+
+        # Beyond the horizon the sweep schedules it later
+        apply_async.reset_mock()
+        self.blog.publish_at = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_publish(self.blog)
+        apply_async.assert_not_called()
+
+    @mock.patch("blog_app.tasks.publish_blog.apply_async")
+    def test_sweep_schedules_upcoming_blogs(self, apply_async):
+        """Test that the sweep gives blogs due before the next sweep an ETA task"""
+        publish_at = timezone.now() + timedelta(minutes=30)
+        Blog.objects.filter(pk=self.blog.pk).update(publish_at=publish_at)
+        publish_scheduled_blogs()
+        apply_async.assert_called_once_with(
+            (self.blog.pk, publish_at.isoformat()), eta=publish_at
+        )
+
+
+class DailyMailUsersTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}@test.com",
+                email=f"user{i}@test.com",
+                password="testpassword",
+                first_name=f"User{i}",
+            )
+            for i in range(5)
+        ]
+        User.objects.create_user(username="no-email", password="testpassword")
+        Blog.objects.create(
+            title="Latest blog",
+            content="Test content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.users[0],
+            editor=self.users[0],
+            publisher=self.users[0],
+            is_published=True,
+        )
+
+    @mock.patch("blog_app.tasks.send_daily_digest_batch.delay")
+    def test_users_are_fanned_out_in_batches(self, delay):
+        """Test that users with an email are split into batches of subtasks"""
+        self.assertEqual(daily_mail_users(batch_size=2), 3)
+        batches = [call.args[0] for call in delay.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(sorted(sum(batches, [])), sorted(user.id for user in self.users))
+        self.assertIn("Latest blog", delay.call_args.args[1])
+
+    def test_batch_sends_one_message_per_user(self):
+        """Test that every user gets their own message and no other address"""
+        sent = send_daily_digest_batch([user.id for user in self.users], "👉 Latest blog")
+        self.assertEqual(sent, 5)
+        self.assertEqual(len(mail.outbox), 5)
+        for message in mail.outbox:
+            self.assertEqual(len(message.to), 1)
+        self.assertIn("Hi User0", mail.outbox[0].body)
+
+    def test_retry_only_sends_to_remaining_users(self):
+        """Test that a batch retried after a failure does not send the digest twice"""
+        backend = mail.get_connection().__class__
+        send_messages = backend.send_messages
+        delivered = itertools.count()
+
+        def flaky_send(connection, messages):
+            # The connection drops once, before the third message
+            for message in messages:
+                if next(delivered) == 2:
+                    raise ConnectionError("Connection lost")
+                send_messages(connection, [message])
+            return len(messages)
+
+        with mock.patch.object(backend, "send_messages", flaky_send):
+            send_daily_digest_batch.apply(
+                args=[[user.id for user in self.users], "👉 Latest blog"]
+            ).get()
+        recipients = [message.to[0] for message in mail.outbox]
+        self.assertEqual(sorted(recipients), sorted(user.email for user in self.users))
+
+    def test_unsent_digests_are_dead_lettered(self):
+        """Test that a throttled batch backs off and dead-letters the digests still unsent"""
+        backend = mail.get_connection().__class__
+        send_messages = backend.send_messages
+
+        def failing_send(connection, messages):
+            # The mail server rejects everything after the second message
+            if len(mail.outbox) >= 2:
+                raise ConnectionError("Connection lost")
+            return send_messages(connection, messages)
+
+        with mock.patch.object(backend, "send_messages", failing_send), mock.patch.object(
+            send_daily_digest_batch, "max_retries", 1
+        ), mock.patch("blog_app.tasks.throttle_smtp") as throttle_smtp, mock.patch(
+            "blog_app.tasks.backoff_delay", return_value=0
+        ) as backoff_delay:
+            result = send_daily_digest_batch.apply(
+                args=[[user.id for user in self.users], "👉 Latest blog"]
+            )
+        self.assertIsInstance(result.result, ConnectionError)
+        self.assertEqual(throttle_smtp.call_count, 4)
+        backoff_delay.assert_called_once_with(1)
+        failed = FailedEmail.objects.order_by("id")
+        self.assertEqual(
+            [row.recipients for row in failed], [[user.email] for user in self.users[2:]]
+        )
+        self.assertEqual({(row.attempts, row.error) for row in failed}, {(2, "Connection lost")})
@@ -0,0 +1,63 @@
+from django.test import TestCase, Client
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User, Group
+from ..models import Blog, OutboxEmail
+
+
+class BlogUpdateViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="editor@test.com",
+            email="editor@test.com",
+            password="testpassword",
+        )
+        for name in ("Author", "Editor", "Publisher"):
+            self.user.groups.add(Group.objects.get(name=name))
+        self.blog = Blog.objects.create(
+            title="Original title",
+            content="Original content",
+            image="uploads/test_image.jpg",
+            category="python",
+            author=self.user,
+            editor=self.user,
+            publisher=self.user,
+        )
+        self.url = reverse("blog:blog_update", args=[self.blog.pk])
+
+        self.client = Client()
+        self.client.login(username="editor@test.com", password="testpassword")
+
+    def post(self, **changes):
+        data = {
+            "title": self.blog.title,
+            "content": self.blog.content,
+            "category": self.blog.category,
+            "author": self.user.pk,
+            "editor": self.user.pk,
+            "publisher": self.user.pk,
+            **changes,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertTrue(response.json()["success"])
+        return [q["sql"] for q in queries if q["sql"].startswith('UPDATE "blog_app_blog"')]
+
+    def test_unchanged_form_writes_nothing(self):
+        """Test that re-submitting an unchanged form skips the write and the mail"""
+        self.assertEqual(self.post(), [])
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_only_changed_fields_are_written(self):
+        """Test that an edit updates just the edited columns and keeps the image"""
+        updates = self.post(title="Edited title")
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"updated_at" = ', updates[0])
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"content"', updates[0])
+
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.title, "Edited title")
+        self.assertEqual(self.blog.image.name, "uploads/test_image.jpg")
+        self.assertTrue(OutboxEmail.objects.filter(subject__icontains="updated").exists())
@@ -0,0 +1,70 @@
+import os
+from io import BytesIO
+from unittest import mock
+from django.test import TestCase, RequestFactory, override_settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from PIL import Image, ImageFile
+from ..uploads import BoundedImageField, RejectedUpload
+
+
+def image_upload(name, width, height, image_format="JPEG", noise=False, **options):
+    if noise:
+        image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    else:
+        image = Image.new("RGB", (width, height), "teal")
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+class BoundedUploadTest(TestCase):
+    def test_oversized_upload_is_rejected_while_streaming(self):
+        """Test that a file over the cap is dropped by the upload handler"""
+        with override_settings(BLOG_IMAGE_MAX_UPLOAD_SIZE=1024):
+            request = RequestFactory().post(
+                "/create/", {"image": image_upload("big.jpg", 100, 100, noise=True)}
+            )
+            upload = request.FILES["image"]
+            self.assertIsInstance(upload, RejectedUpload)
+            with self.assertRaisesMessage(ValidationError, "The image is larger than"):
+                BoundedImageField().clean(upload)
+
+    def test_accepted_upload_is_streamed_to_disk(self):
+        """Test that an upload within the cap goes to a temporary file"""
+        request = RequestFactory().post(
+            "/create/", {"image": image_upload("small.jpg", 100, 100)}
+        )
+        self.assertIsInstance(request.FILES["image"], TemporaryUploadedFile)
+
+    @override_settings(BLOG_IMAGE_MAX_PIXELS=100)
+    def test_pixel_limit_is_checked_from_header(self):
+        """Test that too many pixels are rejected without decoding the image"""
+        with mock.patch.object(ImageFile.ImageFile, "load") as load:
+            with self.assertRaisesMessage(ValidationError, "20 × 20 pixels"):
+                BoundedImageField().clean(image_upload("tile.jpg", 20, 20))
+        load.assert_not_called()
+
+    @override_settings(BLOG_IMAGE_MAX_DIMENSION=100)
+    def test_image_is_rotated_downscaled_and_stripped(self):
+        """Test that EXIF orientation is applied and metadata dropped in one pass"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotated 90 degrees clockwise
+        exif[0x010F] = "Camera maker"
+        cleaned = BoundedImageField().clean(
+            image_upload("photo.jpg", 400, 200, exif=exif.tobytes())
+        )
+        image = Image.open(cleaned)
+        self.assertEqual(image.size, (50, 100))
+        self.assertEqual(dict(image.getexif()), {})
+        self.assertEqual(cleaned.content_type, "image/jpeg")
+
+    def test_plain_image_is_left_untouched(self):
+        """Test that a small image without metadata is not re-encoded"""
+        upload = image_upload("plain.png", 100, 100, image_format="PNG")
+        self.assertIs(BoundedImageField().clean(upload), upload)
+
+    def test_unsupported_format_is_rejected(self):
+        """Test that image formats outside the allowed list are refused"""
+        with self.assertRaisesMessage(ValidationError, "Upload a JPEG, PNG, WebP or GIF"):
+            BoundedImageField().clean(image_upload("bitmap.bmp", 10, 10, image_format="BMP"))
@@ -0,0 +1,174 @@
+from io import BytesIO
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, ImageOps
+
+
+# Image formats accepted for Blog.image, with the options used to re-encode them
+IMAGE_SAVE_OPTIONS: dict[str, dict] = {
+    "JPEG": {"quality": 90},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 90},
+    "GIF": {},
+}
+
+EXIF_ORIENTATION_TAG: int = 0x0112
+
+
+def upload_too_large_message():
+    return f"The image is larger than {filesizeformat(settings.BLOG_IMAGE_MAX_UPLOAD_SIZE)}."
+
+
+class RejectedUpload(UploadedFile):
+    """
+    Stands in for a file that `BoundedUploadHandler` refused to store.
+
+    It holds no data; `BoundedImageField` turns `rejection` into a form error.
+    """
+
+    def __init__(self, name, content_type, rejection):
+        super().__init__(BytesIO(), name, content_type, 0)
+        self.rejection = rejection
+
+
+class BoundedUploadHandler(FileUploadHandler):
+    """
+    Caps the size of uploaded files while they stream in.
+
+    Put it before `TemporaryFileUploadHandler` in FILE_UPLOAD_HANDLERS: chunks are
+    passed on (straight to a temporary file) until a file exceeds
+    BLOG_IMAGE_MAX_UPLOAD_SIZE. After that they are dropped and the file is
+    replaced by a `RejectedUpload`. A request whose Content-Length already
+    exceeds the cap has its files rejected without storing a byte.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = settings.BLOG_IMAGE_MAX_UPLOAD_SIZE
+        self.request_too_large = False
+        self.received = 0
+        self.rejection = None
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        # Non-file fields are capped by DATA_UPLOAD_MAX_MEMORY_SIZE on their own
+        limit = self.max_size + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        self.request_too_large = content_length > limit
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.rejection = upload_too_large_message() if self.request_too_large else None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rejection is None:
+            self.received += len(raw_data)
+            if self.received > self.max_size:
+                self.rejection = upload_too_large_message()
+        if self.rejection is not None:
+            return None
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.rejection is None:
+            return None
+        return RejectedUpload(self.file_name, self.content_type, self.rejection)
+
+
+def normalize_image(upload, image):
+    """
+    Rotates an image upright, downscales it and strips its metadata in one pass.
+
+    Images that are already within BLOG_IMAGE_MAX_DIMENSION and carry no EXIF
+    data are returned untouched, without decoding their raster.
+
+    Args:
+        upload (UploadedFile): The uploaded file.
+        image (PIL.Image.Image): The image opened from `upload` (header only).
+
+    Returns:
+        UploadedFile: `upload` itself, or a re-encoded temporary file.
+    """
+    max_dimension = settings.BLOG_IMAGE_MAX_DIMENSION
+    has_exif = bool(image.getexif())
+    too_big = max(image.size) > max_dimension
+    if not (has_exif or too_big) or getattr(image, "n_frames", 1) > 1:
+        return upload
+
+    image_format = image.format
+    icc_profile = image.info.get("icc_profile")
+    # thumbnail() lets the JPEG decoder downscale while decoding (draft mode)
+    image.thumbnail((max_dimension, max_dimension))
+    image = ImageOps.exif_transpose(image)
+    image.info.pop("exif", None)
+    if image_format == "JPEG" and image.mode not in ("RGB", "L", "CMYK"):
+        image = image.convert("RGB")
+
+    normalized = TemporaryUploadedFile(
+        upload.name, upload.content_type, 0, upload.charset
+    )
+    image.save(
+        normalized,
+        image_format,
+        icc_profile=icc_profile,
+        **IMAGE_SAVE_OPTIONS[image_format],
+    )
+    normalized.size = normalized.tell()
+    normalized.seek(0)
+    return normalized
+
+
+class BoundedImageField(forms.ImageField):
+    """
+    An ImageField that validates uploads from the image header alone.
+
+    Format, dimensions and pixel count are checked without decoding the raster.
+    Accepted images then go through `normalize_image`.
+    """
+
+    default_error_messages = {
+        "invalid_image": forms.ImageField.default_error_messages["invalid_image"],
+        "invalid_format": "Upload a JPEG, PNG, WebP or GIF image.",
+        "too_many_pixels": "The image is too large (%(width)s × %(height)s pixels).",
+    }
+
+    def to_python(self, data):
+        rejection = getattr(data, "rejection", None)
+        if rejection:
+            raise ValidationError(rejection, code="file_too_large")
+        # FileField checks name and emptiness; ImageField would verify() the whole file
+        f = forms.FileField.to_python(self, data)
+        if f is None:
+            return None
+        if f.size > settings.BLOG_IMAGE_MAX_UPLOAD_SIZE:
+            raise ValidationError(upload_too_large_message(), code="file_too_large")
+
+        try:
+            f.seek(0)
+            image = Image.open(f)
+            width, height = image.size
+        except Exception as exc:
+            raise ValidationError(
+                self.error_messages["invalid_image"], code="invalid_image"
+            ) from exc
+        if image.format not in IMAGE_SAVE_OPTIONS:
+            raise ValidationError(
+                self.error_messages["invalid_format"], code="invalid_format"
+            )
+        if width * height > settings.BLOG_IMAGE_MAX_PIXELS:
+            raise ValidationError(
+                self.error_messages["too_many_pixels"],
+                code="too_many_pixels",
+                params={"width": width, "height": height},
+            )
+
+        content_type = Image.MIME.get(image.format)
+        f = normalize_image(f, image)
+        f.seek(0)
+        f.content_type = content_type
+        return f
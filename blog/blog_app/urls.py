@@ -6,12 +6,17 @@ from .views import (
     BlogCreateView,
     BlogUpdateView,
     BlogDeleteView,
+    RoleAutocompleteView,
+    MetricsView,
     RegisterView,
     LoginView,
     LogoutView,
     initialize_groups,
 )
+from .api_views import BlogChangesApiView, BlogDetailApiView, BlogListApiView
 from django.apps import apps
+from django.conf import settings
+from django.urls import URLPattern
 
 app_name: str = "blog"
 urlpatterns: list = [
@@ -22,13 +27,57 @@ urlpatterns: list = [
     path("create/", BlogCreateView.as_view(), name="blog_create"),
     path("edit/<int:pk>/", BlogUpdateView.as_view(), name="blog_update"),
     path("delete/<int:pk>/", BlogDeleteView.as_view(), name="blog_delete"),
+    path(
+        "roles/<str:role>/users/",
+        RoleAutocompleteView.as_view(),
+        name="role_autocomplete",
+    ),
 
     # Authentication URLs
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
     path("logout/", LogoutView.as_view(), name="logout"),
+
+    # Read-only JSON API
+    path("api/v1/blogs/", BlogListApiView.as_view(), name="api_blog_list"),
+    path("api/v1/blogs/<int:pk>/", BlogDetailApiView.as_view(), name="api_blog_detail"),
+    path("api/v1/changes/", BlogChangesApiView.as_view(), name="api_blog_changes"),
+
+    # Prometheus scrape endpoint
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
 
+
+def use_async_read_views(patterns):
+    """
+    Swaps the read-only blog views for their native async versions (blog_app.async_views).
+
+    Args:
+        patterns (list[URLPattern]): The app's url patterns.
+
+    Returns:
+        list[URLPattern]: The same patterns, with the listing, DataTable and detail
+        views served by coroutines.
+    """
+    from . import async_views
+
+    async_read_views = {
+        "blog_list": async_views.blog_table,
+        "blog_ajax": async_views.AsyncBlogAjaxDatatableView.as_view(),
+        "detail": async_views.blog_detail,
+    }
+    return [
+        path(str(pattern.pattern), async_read_views[pattern.name], name=pattern.name)
+        if isinstance(pattern, URLPattern) and pattern.name in async_read_views
+        else pattern
+        for pattern in patterns
+    ]
+
+
+# Under ASGI (blog.asgi), serve the read-only views without holding a thread per request
+if settings.BLOG_ASYNC_VIEWS:
+    urlpatterns = use_async_read_views(urlpatterns)
+
 # initialize groups when the app is loaded this will ensure that the required groups exist
 if not apps.is_installed("blog_app.apps.BlogAppConfig"):
     initialize_groups()
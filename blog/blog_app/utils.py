@@ -1,10 +1,10 @@
 from django.conf import settings
-from blog_app.tasks import send_email
+from blog_app import outbox
 
 
 def review_mail(object):
     """
-    Sends a review notification email to the blog's publisher and editor.
+    Queues a review notification email to the blog's publisher and editor.
 
     Notifies the responsible parties that a new blog post has been created
     and is pending review, including key blog details in the message.
@@ -28,12 +28,12 @@ def review_mail(object):
                 
                 Please review the content at your earliest convenience.
                 """
-    # sending email from celery to editor and publisher
-    send_email.delay(subject=subject, message=message, from_email=settings.DEFAULT_FROM_EMAIL,publisher_email=[publisher.email,editor.email])
+    # queue email to editor and publisher, sent by the outbox drain after commit
+    outbox.enqueue(subject=subject, message=message, from_email=settings.DEFAULT_FROM_EMAIL,recipients=[publisher.email,editor.email])
 
 def delete_mail(object):
     """
-    Sends a deletion notification email to the blog's editor and author.
+    Queues a deletion notification email to the blog's editor and author.
 
     Notifies the relevant parties that a blog post has been deleted,
     including details about the blog and the user who performed the deletion.
@@ -56,17 +56,17 @@ def delete_mail(object):
                 Editor: {object.editor.get_full_name() or object.editor.username}
                 
                 """
-    # sending email from celery to editor and publisher
-    send_email.delay(
+    # queue email to editor and author, sent by the outbox drain after commit
+    outbox.enqueue(
         subject=subject,
         message=message,
         from_email=settings.DEFAULT_FROM_EMAIL,
-        publisher_email=[editor.email, author.email],
+        recipients=[editor.email, author.email],
     )
 
 def update_mail(object):
     """
-    Sends an update notification email to the blog's publisher and author.
+    Queues an update notification email to the blog's publisher and author.
 
     Alerts relevant users that a blog post has been updated, including blog details
     and a prompt to review the changes.
@@ -90,10 +90,10 @@ def update_mail(object):
                 
                 Please review the content at your earliest convenience.
                 """
-    # sending email from celery to editor and publisher
-    send_email.delay(
+    # queue email to publisher and author, sent by the outbox drain after commit
+    outbox.enqueue(
         subject=subject,
         message=message,
         from_email=settings.DEFAULT_FROM_EMAIL,
-        publisher_email=[publisher.email, author.email],
+        recipients=[publisher.email, author.email],
     )
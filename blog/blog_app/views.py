@@ -1,5 +1,5 @@
-from django.shortcuts import render,  get_object_or_404, redirect
-from django.http import JsonResponse
+from django.shortcuts import render, redirect
+from django.http import Http404, HttpResponse, JsonResponse
 from django.views.generic import (
     TemplateView,
     DetailView,
@@ -16,10 +16,41 @@ from django.urls import reverse_lazy
 from django.template.loader import render_to_string
 from .form import BlogForm, RegistrationForm, LoginForm
 from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, User
 from django.contrib import messages
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.auth.mixins import LoginRequiredMixin
 from .utils import review_mail, update_mail, delete_mail
+from .instrumentation import timed_render
+from .routers import ReplicaReadMixin
+from .roles import (
+    AUTHOR,
+    EDITOR,
+    PUBLISHER,
+    ROLE_NAMES,
+    RoleRequiredMixin,
+    has_role,
+)
+from .tasks import schedule_publish, schedule_renditions
+from . import instrumentation, search
+from .caching import (
+    listing_generation,
+    detail_etag,
+    get_detail_html,
+    set_detail_html,
+)
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+import base64
+import hashlib
+import json
 
 class RegisterView(CreateView):
     template_name = "blog_app/register.html"
@@ -78,7 +109,7 @@ class BlogTableView(LoginRequiredMixin, TemplateView):
         print(f"Exception occured:{e}")
 
 
-class BlogAjaxDatatableView(LoginRequiredMixin, AjaxDatatableView):
+class BlogAjaxDatatableView(ReplicaReadMixin, LoginRequiredMixin, AjaxDatatableView):
     """
     A view for handling AJAX-based DataTable rendering for Blog entries.
     Requires user to be logged in.
@@ -97,7 +128,12 @@ class BlogAjaxDatatableView(LoginRequiredMixin, AjaxDatatableView):
         column_defs: list[object] = [
             {"name": "id", "title": "id", "visible": True, "orderable": True},
             {"name": "title", "title": "Title", "orderable": True},
-            {"name": "content", "title": "Content", "orderable": False},
+            {
+                "name": "excerpt",
+                "title": "Content",
+                "orderable": False,
+                "searchable": False,
+            },
             {"name": "category", "title": "Category", "orderable": True},
             {
                 "name": "author",
@@ -110,17 +146,227 @@ class BlogAjaxDatatableView(LoginRequiredMixin, AjaxDatatableView):
             },
         ]
         login_url = reverse_lazy("blog:login")
+        # Seek on (ordering column, id) when the client sends a page cursor
+        keyset_pagination: bool = True
+        # Seconds a filtered row count is reused between draws
+        count_cache_timeout: int = 60
+        # Characters of content sent per row (the table shows a preview only)
+        excerpt_length: int = 100
     except Exception as e:
         print(f"Exception occured:{e}")
 
+    # Request parameters that do not change which rows match
+    PAGING_PARAMS: tuple[str, ...] = ("draw", "start", "length", "cursor", "_")
+
     def get_initial_queryset(self, request=None):
-        return Blog.objects.filter(is_published=True)
+        # Cut the content in SQL: one extra character tells whether it was clipped
+        return Blog.objects.filter(is_published=True).annotate(
+            excerpt=Substr("content", 1, self.excerpt_length + 1)
+        )
+
+    def customize_row(self, row, obj):
+        if len(obj.excerpt) > self.excerpt_length:
+            row["excerpt"] = obj.excerpt[: self.excerpt_length] + "..."
+
+    def filter_queryset_all_columns(self, search_value, qs):
+        """
+        Applies the global search box through the full-text index.
+
+        Matches are annotated with ``search_rank``; backends without a
+        full-text index fall back to ``icontains`` over ``search_fields``.
+        """
+        if search.is_supported(qs.db):
+            return search.search(qs, search_value)
+        search_filters = Q()
+        for field in self.search_fields:
+            search_filters |= Q(**{f"{field}__icontains": search_value})
+        return qs.filter(search_filters)
+
+    def sort_queryset(self, params, qs):
+        qs = super().sort_queryset(params, qs)
+        ordering = list(qs.query.order_by)
+        if not ordering or ordering[0].lstrip("-") != "pk":
+            # Break ties on id (in the direction of the first column) so that
+            # the order is total and keyset pagination can seek on (column, id)
+            ordering = [field for field in ordering if field.lstrip("-") != "pk"]
+            ordering.append("-pk" if ordering and ordering[0].startswith("-") else "pk")
+        else:
+            ordering = ordering[:1]
+        # Search results come best match first until a column header is clicked;
+        # then the column ordering alone applies, as the table's sort arrow shows
+        if "search_rank" in qs.query.annotations and not params["orders"]:
+            ordering.insert(0, "-search_rank")
+        return qs.order_by(*ordering)
+
+    def get_query_signature(self, request, include_order=True):
+        """
+        Hashes the DataTable parameters that decide which rows match and in
+        which order, leaving out the paging parameters.
+        """
+        items = sorted(
+            (key, value)
+            for key, value in request.REQUEST.items()
+            if key not in self.PAGING_PARAMS
+            and (include_order or not key.startswith("order["))
+        )
+        return hashlib.sha1(json.dumps(items).encode()).hexdigest()
+
+    def get_count_cache_key(self, request, generation):
+        return "blog:datatable:count:%s:%s" % (
+            generation,
+            self.get_query_signature(request, include_order=False),
+        )
+
+    def get_cached_count(self, request, qs):
+        """
+        Returns the number of filtered rows, counting at most once per
+        ``count_cache_timeout`` for a given filter and listing generation.
+        """
+        key = self.get_count_cache_key(request, listing_generation())
+        count = cache.get(key)
+        if count is None:
+            count = qs.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_keyset_field(self, qs):
+        """
+        Returns the (field, descending) pair to seek on, or None when the
+        ordering cannot be paginated by keyset (e.g. ranked search results).
+        """
+        ordering = qs.query.order_by
+        if len(ordering) == 1 and ordering[0].lstrip("-") == "pk":
+            field = ordering[0]
+        elif len(ordering) == 2 and ordering[1].lstrip("-") == "pk":
+            field = ordering[0]
+        else:
+            return None
+        if field.lstrip("-") == "search_rank":
+            return None
+        return field.lstrip("-"), field.startswith("-")
+
+    def encode_cursor(self, request, start_pos, field, obj):
+        value = obj
+        for attr in field.split("__"):
+            value = getattr(value, attr)
+        payload = {
+            "start": start_pos,
+            "signature": self.get_query_signature(request),
+            "value": value,
+            "pk": obj.pk,
+        }
+        data = json.dumps(payload, cls=DjangoJSONEncoder).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, request, start_pos):
+        """
+        Returns the cursor payload sent with the request if it is valid for
+        this page of this query, otherwise None (the page is then read by offset).
+        """
+        cursor = request.REQUEST.get("cursor")
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except ValueError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        if payload.get("start") != start_pos:
+            return None
+        if payload.get("signature") != self.get_query_signature(request):
+            return None
+        return payload
+
+    def get_page_queryset(self, request, qs, length, start_pos):
+        """
+        Returns the queryset of one page and the keyset it is ordered on.
+
+        When the client sends the cursor returned with the previous page, the
+        page is read with a keyset seek so deep pages cost the same as the
+        first one; otherwise it is an offset slice.
+        """
+        keyset = self.get_keyset_field(qs) if self.keyset_pagination else None
+        cursor = self.decode_cursor(request, start_pos) if keyset else None
+
+        if cursor is not None:
+            field, descending = keyset
+            lookup = "lt" if descending else "gt"
+            qs = qs.filter(
+                Q(**{f"{field}__{lookup}": cursor["value"]})
+                | Q(**{field: cursor["value"], f"pk__{lookup}": cursor["pk"]})
+            )
+            return qs[:length], keyset
+        return qs[max(start_pos, 0):max(start_pos, 0) + length], keyset
+
+    def build_response_dict(self, request, draw_idx, start_pos, length, page, count, keyset):
+        next_cursor = None
+        if keyset and len(page) == length:
+            next_cursor = self.encode_cursor(
+                request, start_pos + length, keyset[0], page[-1]
+            )
+
+        return {
+            "draw": draw_idx,
+            "recordsTotal": count,
+            "recordsFiltered": count,
+            "data": self.prepare_results(request, page),
+            "next_cursor": next_cursor,
+        }
+
+    def get_response_dict(self, request, paginator, draw_idx, start_pos):
+        """
+        Builds the DataTable response without OFFSET scans or per-draw counts.
+
+        Pages are read by `get_page_queryset`; the filtered count comes from
+        ``get_cached_count``.
+        """
+        page_qs, keyset = self.get_page_queryset(
+            request, paginator.object_list, paginator.per_page, start_pos
+        )
+        page = list(page_qs)
+        count = self.get_cached_count(request, paginator.object_list)
+        return self.build_response_dict(
+            request, draw_idx, start_pos, paginator.per_page, page, count, keyset
+        )
+
+
+def blog_updated_at(request, pk):
+    """
+    Returns the modification time of a blog, looked up once per request.
 
+    Args:
+        request (HttpRequest): The current request.
+        pk (int): Primary key of the blog.
 
-class BlogDetailView(LoginRequiredMixin, DetailView):
+    Returns:
+        datetime | None: The blog's `updated_at`, or None if it does not exist.
+    """
+    # condition() asks for the ETag and Last-Modified separately, and the view
+    # needs the value again to validate its cached page
+    if not hasattr(request, "_blog_updated_at"):
+        request._blog_updated_at = (
+            Blog.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+        )
+    return request._blog_updated_at
+
+
+def blog_detail_etag(request, pk):
+    updated_at = blog_updated_at(request, pk)
+    return None if updated_at is None else detail_etag(pk, updated_at)
+
+
+@method_decorator(
+    condition(etag_func=blog_detail_etag, last_modified_func=blog_updated_at),
+    name="get",
+)
+class BlogDetailView(ReplicaReadMixin, LoginRequiredMixin, DetailView):
     """
     A view for displaying the details of a specific blog post.
     Requires user to be logged in.
+
+    The rendered page is cached per blog and reused until the blog is saved again,
+    and conditional GETs (If-None-Match / If-Modified-Since) are answered with 304.
     """
 
     try:
@@ -132,8 +378,25 @@ class BlogDetailView(LoginRequiredMixin, DetailView):
     except Exception as e:
         print(f"Exception occured:{e}")
 
+    def get(self, request, *args, **kwargs):
+        updated_at = blog_updated_at(request, kwargs["pk"])
+        html = None if updated_at is None else get_detail_html(kwargs["pk"], updated_at)
+        if html is not None:
+            response = HttpResponse(html)
+        else:
+            response = super().get(request, *args, **kwargs)
+            with timed_render(request):
+                response.render()
+            set_detail_html(
+                self.object.pk, self.object.updated_at, response.content.decode()
+            )
+        # The page sits behind a login: keep it out of shared caches, and have
+        # browsers revalidate so that edits show up straight away
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
 
-class BlogCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
+class BlogCreateView(LoginRequiredMixin, RoleRequiredMixin, CreateView):
     """
     A view for creating a new blog post with support for AJAX requests.
     Requires user to be logged in and have proper permissions.
@@ -148,16 +411,13 @@ class BlogCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
     except Exception as e:
         print(f"Exception occured:{e}")
 
-    def test_func(self):
-        """Check if user belongs to Author, Editor, or Publisher group"""
-        return self.request.user.groups.filter(
-            name__in=["Author", "Editor", "Publisher"]
-        ).exists()
+    # Users in the Author, Editor or Publisher group may create blogs
+    allowed_roles = (AUTHOR, EDITOR, PUBLISHER)
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
         # Set current user as default author if they are in the Author group
-        if self.request.user.groups.filter(name="Author").exists():
+        if has_role(self.request, AUTHOR):
             form.fields["author"].initial = self.request.user
         return form
 
@@ -175,10 +435,15 @@ class BlogCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         # Handle AJAX form submission
         try:
             if self.request.headers.get("X-Requested-With") == "XMLHttpRequest":
-                self.object = form.save()
+                with transaction.atomic():
+                    self.object = form.save()
+                    # Publish at `publish_at` through a per-blog ETA task
+                    schedule_publish(self.object)
+                    # Resize the image off the request path
+                    schedule_renditions(self.object)
 
-                # Send email to publisher and editor
-                review_mail(self.object)
+                    # Send email to publisher and editor (outbox, committed with the blog)
+                    review_mail(self.object)
 
                 return JsonResponse(
                     {
@@ -187,7 +452,10 @@ class BlogCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
                         "id": self.object.pk,
                     }
                 )
-            return super().form_valid(form)
+            response = super().form_valid(form)
+            schedule_publish(self.object)
+            schedule_renditions(self.object)
+            return response
         except Exception as e:
             print(f"Exception occured:{e}")
 
@@ -208,7 +476,7 @@ class BlogCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
             print(f"Exception occured:{e}")
 
 
-class BlogUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class BlogUpdateView(LoginRequiredMixin, RoleRequiredMixin, UpdateView):
     """
     A view for updating an existing blog post with support for AJAX requests.
     Requires user to be logged in and have proper permissions.
@@ -223,11 +491,8 @@ class BlogUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     except Exception as e:
         print(f"Exception occured:{e}")
 
-    def test_func(self):
-        """Check if user belongs to Editor or Publisher group"""
-        return self.request.user.groups.filter(
-            name__in=["Editor", "Publisher"]
-        ).exists()
+    # Users in the Editor or Publisher group may edit blogs
+    allowed_roles = (EDITOR, PUBLISHER)
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
@@ -256,35 +521,35 @@ class BlogUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
             print(f"Exception occured:{e}")
 
     def form_valid(self, form):
-        # Handle AJAX form submission
         try:
-            if self.request.headers.get("X-Requested-With") == "XMLHttpRequest":
-                # Check if image field is empty in the POST but the object already has an image
-                if (
-                    not self.request.FILES.get("image")
-                    and "image-clear" not in self.request.POST
-                ):
-                    # Keep the existing image
+            self.object = form.instance
+            # Re-submitting an unchanged form writes nothing and sends no mail
+            if form.has_changed():
+                with transaction.atomic():
                     self.object = form.save(commit=False)
-                    # Get the existing Blog object and its image
-                    existing_blog = get_object_or_404(Blog, pk=self.object.pk)
-                    self.object.image = existing_blog.image
-
-                    self.object.save()
-                    form.save_m2m()  # Save many-to-many relationships if any
-                    # Send mail to author,publisher
+                    # Write only the edited columns (the image is kept unless a new one
+                    # was uploaded); updated_at is auto_now
+                    self.object.save(update_fields=[*form.changed_data, "updated_at"])
+                    form.save_m2m()
+                    # Send mail to author,publisher (outbox, committed with the blog)
                     update_mail(self.object)
-                else:
-                    self.object = form.save()
+                if "image" in form.changed_data:
+                    schedule_renditions(self.object)
 
+            # Handle AJAX form submission
+            if self.request.headers.get("X-Requested-With") == "XMLHttpRequest":
                 return JsonResponse(
                     {
                         "success": True,
-                        "message": "Blog updated successfully!",
+                        "message": (
+                            "Blog updated successfully!"
+                            if form.has_changed()
+                            else "No changes to save."
+                        ),
                         "id": self.object.pk,
                     }
                 )
-            return super().form_valid(form)
+            return redirect(self.get_success_url())
         except Exception as e:
             print(f"Exception occured:{e}")
 
@@ -316,19 +581,44 @@ class BlogUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
             print(f"Exception occured:{e}")
 
 
-class BlogDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
-    model = Blog
+class RoleAutocompleteView(LoginRequiredMixin, RoleRequiredMixin, View):
+    """
+    Returns the members of a role group matching `?q=`, for the blog form's
+    author/editor/publisher selects when a group is too large to render in full.
+    """
+
     login_url = reverse_lazy("blog:login")
+    allowed_roles = ROLE_NAMES
+    # Maximum number of members returned per search
+    max_results: int = 20
+
+    def get(self, request, role):
+        if role not in ROLE_NAMES:
+            raise Http404("Unknown role")
+        members = (
+            User.objects.filter(
+                groups__name=role, username__icontains=request.GET.get("q", "")
+            )
+            .order_by("username")
+            .values_list("id", "username")[: self.max_results]
+        )
+        return JsonResponse(
+            {"results": [{"id": pk, "text": username} for pk, username in members]}
+        )
+
 
-    def test_func(self):
-        return self.request.user.groups.filter(name="Publisher").exists()
+class BlogDeleteView(LoginRequiredMixin, RoleRequiredMixin, DeleteView):
+    model = Blog
+    login_url = reverse_lazy("blog:login")
+    allowed_roles = (PUBLISHER,)
 
     def post(self, request, *args, **kwargs):
         try:
             blog = Blog.objects.get(pk=kwargs["pk"])
-            # send mail to author and editor
-            delete_mail(blog)
-            blog.delete()
+            with transaction.atomic():
+                # send mail to author and editor (outbox, committed with the delete)
+                delete_mail(blog)
+                blog.delete()
 
             return JsonResponse(
                 {"success": True, "message": "Blog deleted successfully!"}
@@ -343,3 +633,21 @@ class BlogDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
                     "message": "An error occurred while deleting the blog.",
                 }
             )
+
+
+class MetricsView(View):
+    """
+    Exports the request metrics of this process (InstrumentationMiddleware) in the
+    Prometheus text format, to the addresses in BLOG_METRICS_ALLOWED_IPS and to staff.
+    """
+
+    def get(self, request):
+        if (
+            request.META.get("REMOTE_ADDR") not in settings.BLOG_METRICS_ALLOWED_IPS
+            and not request.user.is_staff
+        ):
+            raise PermissionDenied
+        return HttpResponse(
+            instrumentation.registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )